@@ -6,8 +6,11 @@ from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
 
+from app.core.code_store import authorization_code_store
 from app.core.db import get_session
-from app.core.store import authorization_code_store
+from app.core.security.login_throttle import login_throttle
+from app.core.unit_of_work import UnitOfWork
+from app.exceptions.bussiness_exceptions import LoginThrottledException
 from app.repositories.app_settings_repository import AppSettingRepository
 from app.repositories.client_application_repository import ClientApplicationRepository
 from app.services.user_service import UserService
@@ -66,39 +69,63 @@ def authorize_post(
     code_challenge_method: str = Form(...),
     session: Session = Depends(get_session),
 ):
+    login_form = {
+        "request": request,
+        "client_id": client_id,
+        "redirect_uri": redirect_uri,
+        "state": state,
+        "scope": scope,
+        "code_challenge": code_challenge,
+        "code_challenge_method": code_challenge_method,
+    }
+    client_ip = request.client.host if request.client else None
+
+    # Se rechaza antes de verificar la contraseña (sin gastar CPU en el hash)
+    try:
+        attempt = login_throttle.check(username, client_ip)
+    except LoginThrottledException as e:
+        return templates.TemplateResponse(
+            "login.html",
+            {
+                **login_form,
+                "error": f"Demasiados intentos, intenta de nuevo en {e.retry_after} segundos",
+            },
+            status_code=e.http_status,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
     # repo = UserRepository(session)
     service = UserService(session=session)
-    user = service.authenticate_user(username, password)
+    try:
+        with UnitOfWork(session):
+            user = service.authenticate_user(username, password)
+    except Exception:
+        # Sin verificar (p. ej. pool de hashing ocupado): no cuenta como fallo
+        login_throttle.release(attempt)
+        raise
     app_settings_repository = AppSettingRepository(session)
 
     ttl_expiration_code = int(app_settings_repository.get("ttl_access_token"))
 
+    # Un fallo ya quedó contado al reservar el intento
     if not user:
         return templates.TemplateResponse(
             "login.html",
-            {
-                "request": request,
-                "client_id": client_id,
-                "redirect_uri": redirect_uri,
-                "state": state,
-                "scope": scope,
-                "code_challenge": code_challenge,
-                "code_challenge_method": code_challenge_method,
-                "error": "Usuario o contraseña incorrectos",
-            },
+            {**login_form, "error": "Usuario o contraseña incorrectos"},
         )
+    login_throttle.succeeded(attempt)
 
-    # Generar authorization code (asociado al user_id)
-    auth_code = str(uuid4())
-    authorization_code_store.save(
+    # Generar authorization code (asociado al user_id); el backend "sealed"
+    # devuelve su propio código cifrado
+    auth_code = authorization_code_store.save(
         client_id=client_id,
         redirect_uri=redirect_uri,
         code_challenge=code_challenge,
-        code=auth_code,
+        code=str(uuid4()),
         user_id=user.id,
         scope=scope.split(" "),
         expires_at=datetime.utcnow() + timedelta(seconds=ttl_expiration_code),
-    )
+    ).code
 
     # Redirigir con code + state
     redirect_url = f"{redirect_uri}?code={auth_code}&state={state}"
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
 
 from app.core.db import get_session
+from app.core.unit_of_work import UnitOfWork
 from app.repositories.client_application_repository import ClientApplicationRepository
 from app.schemas.client_applications import (
     ClientApplicationCreate,
@@ -47,7 +48,8 @@ def register_client(
     repository = ClientApplicationRepository(session)
     service = ClientService(repository)
     try:
-        client = service.register_client(client_data)
+        with UnitOfWork(session):
+            client = service.register_client(client_data)
         return client
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
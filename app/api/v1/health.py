@@ -2,6 +2,14 @@ from datetime import datetime
 
 from fastapi import APIRouter
 
+from app.core.async_db import get_async_engine
+from app.core.code_store import authorization_code_store
+from app.core.config import settings
+from app.core.db import engine
+from app.core.db_profiles import pool_metrics
+from app.core.security.hashing_pool import password_hashing_pool
+from app.services.token_cleanup_service import token_cleanup_service
+
 router = APIRouter()
 
 
@@ -21,4 +29,39 @@ def health_check() -> dict:
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@router.get("/health/token-cleanup")
+def token_cleanup_health() -> dict:
+    """
+    Metrics of the expired token cleanup (rows deleted and duration).
+    """
+    return token_cleanup_service.metrics.to_dict()
+
+
+@router.get("/health/authorization-codes")
+def authorization_codes_health() -> dict:
+    """
+    Size, hits, misses and evictions of the authorization code store.
+    """
+    return authorization_code_store.stats().to_dict()
+
+
+@router.get("/health/db-pool")
+def db_pool_health() -> dict:
+    """
+    Checkout latency, waiting checkouts and saturation of the database pools.
+    """
+    pools = {"sync": pool_metrics(engine)}
+    if settings.DATABASE_ASYNC:
+        pools["async"] = pool_metrics(get_async_engine())
+    return {"profile": settings.DATABASE_PROFILE, "pools": pools}
+
+
+@router.get("/health/password-hashing")
+def password_hashing_health() -> dict:
+    """
+    Pending, completed, rejected and timed out calls of the password hashing pool.
+    """
+    return password_hashing_pool.stats().to_dict()
+
+
 # Add more health-related endpoints as needed like conection to Rabbitmq, Redis, etc.
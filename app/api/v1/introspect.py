@@ -1,21 +1,92 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-# from app.core.config import settings
+from app.core.async_db import get_async_session
+from app.core.config import settings
 from app.core.db import get_session
+from app.core.security.introspection_jwt import introspection_response_signer
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
 from app.domain.tokens.token_response import InstrospectResponse
-from app.repositories.access_token_repository import AccessTokenRepository
+from app.schemas.introspection import IntrospectBatchRequest
+from app.services.async_token_service import AsyncTokenService
+from app.services.token_service import TokenService
 
 # from app.repositories.refresh_token_repository import RefreshTokenRepository
 
 router = APIRouter(prefix="/v1/introspect")
 
 
-@router.post("/")
+def render_introspection(
+    introspect_response: InstrospectResponse, accept: str | None, audience: str | None
+):
+    """With `Accept: application/token-introspection+jwt` the response is a signed
+    JWT (RFC 9701) that resource servers can verify with the JWKS and cache."""
+    if accept and introspection_response_signer.MEDIA_TYPE in accept:
+        signed = introspection_response_signer.encode(introspect_response, audience)
+        max_age = introspection_response_signer.max_age(introspect_response)
+        return Response(
+            content=signed,
+            media_type=introspection_response_signer.MEDIA_TYPE,
+            headers={"Cache-Control": f"private, max-age={max_age}"},
+        )
+    return introspect_response
+
+
 def introspect(
-    token: str, session: Session = Depends(get_session)
+    token: str,
+    audience: str | None = None,
+    accept: str | None = Header(None),
+    session: Session = Depends(get_session),
 ) -> InstrospectResponse:
     """Introspect access token validity"""
-    at_repo = AccessTokenRepository(session)
-    introspect_response = at_repo.introspect(token)
-    return introspect_response
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        introspect_response = token_service.introspect(token)
+    return render_introspection(introspect_response, accept, audience)
+
+
+async def introspect_async(
+    token: str,
+    audience: str | None = None,
+    accept: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+) -> InstrospectResponse:
+    """Introspect access token validity"""
+    token_service = AsyncTokenService(session)
+    async with AsyncUnitOfWork(session):
+        introspect_response = await token_service.introspect(token)
+    return render_introspection(introspect_response, accept, audience)
+
+
+def introspect_batch(
+    request: IntrospectBatchRequest, session: Session = Depends(get_session)
+) -> list[InstrospectResponse]:
+    """Introspect several access tokens in one call; results keep the input order"""
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        introspect_responses = token_service.introspect_many(request.tokens)
+    return introspect_responses
+
+
+async def introspect_batch_async(
+    request: IntrospectBatchRequest,
+    session: AsyncSession = Depends(get_async_session),
+) -> list[InstrospectResponse]:
+    """Introspect several access tokens in one call; results keep the input order"""
+    token_service = AsyncTokenService(session)
+    async with AsyncUnitOfWork(session):
+        introspect_responses = await token_service.introspect_many(request.tokens)
+    return introspect_responses
+
+
+router.add_api_route(
+    "/",
+    introspect_async if settings.DATABASE_ASYNC else introspect,
+    methods=["POST"],
+)
+router.add_api_route(
+    "/batch",
+    introspect_batch_async if settings.DATABASE_ASYNC else introspect_batch,
+    methods=["POST"],
+)
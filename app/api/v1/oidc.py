@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 from app.core.config import settings
-from app.core.jwk import get_jwk
+from app.core.key_ring import key_ring
 
 router = APIRouter(prefix="/v1/oidc")
 
@@ -17,7 +17,7 @@ def openid_configuration():
         "revocation_endpoint": f"{settings.BASE_URL}/revocation",
         "response_types_supported": ["code", "id_token", "token id_token"],
         "subject_types_supported": ["public"],
-        "id_token_signing_alg_values_supported": [settings.JWT_ALG],
+        "id_token_signing_alg_values_supported": key_ring.algorithms(),
         "scopes_supported": ["openid", "profile", "email"],
         "token_endpoint_auth_methods_supported": ["client_secret_basic", "none"],
     }
@@ -25,4 +25,4 @@ def openid_configuration():
 
 @router.get("/jwks.json")
 def jwks():
-    return {"keys": [get_jwk()]}
+    return {"keys": key_ring.jwks()}
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session
 
 from app.core.db import get_session
+from app.core.unit_of_work import UnitOfWork
 from app.repositories.permission_repository import PermissionRepository
 from app.schemas.permission import PermissionCreate, PermissionRead, PermissionUpdate
 from app.services.permission_service import PermissionService
@@ -23,7 +24,8 @@ def create_permission(
     permission: PermissionCreate, session: Session = Depends(get_session)
 ):
     permission_service = PermissionService(PermissionRepository(session))
-    db_permission = permission_service.create_permission(permission)
+    with UnitOfWork(session):
+        db_permission = permission_service.create_permission(permission)
     return PermissionRead.model_validate(db_permission)
 
 
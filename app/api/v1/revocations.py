@@ -0,0 +1,35 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import get_session
+from app.services.token_service import TokenService
+
+router = APIRouter(prefix="/v1/revocations")
+
+
+def require_jwt_access_tokens():
+    # Con tokens opacos el valor guardado es el propio token: no se publica
+    if settings.ACCESS_TOKEN_FORMAT != "jwt":
+        raise HTTPException(
+            status_code=404, detail="Revocation feed requires JWT access tokens"
+        )
+
+
+@router.get("/snapshot", dependencies=[Depends(require_jwt_access_tokens)])
+def revocation_snapshot(
+    format: Literal["list", "bloom"] = "list",
+    session: Session = Depends(get_session),
+):
+    """Revoked, unexpired JWT access token ids (jti) and the feed version"""
+    return TokenService(session).revocation_snapshot(format).to_dict()
+
+
+@router.get("/deltas", dependencies=[Depends(require_jwt_access_tokens)])
+def revocation_deltas(
+    after: int = Query(..., ge=0), session: Session = Depends(get_session)
+):
+    """JWT access token ids revoked after a version of the feed"""
+    return TokenService(session).revocation_deltas(after).to_dict()
@@ -1,23 +1,66 @@
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, Form
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.async_db import get_async_session
+from app.core.auth.dependencies import require_role
+from app.core.config import settings
 from app.core.db import get_session
-from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from app.services.async_token_service import AsyncTokenService
+from app.services.token_service import TokenService
 
 router = APIRouter(prefix="/v1/revoke")
 
-# Aquí deberías tener un "store" que permita invalidar tokens (lista negra o estado en BD)
-revoked_tokens = set()
-
 
-@router.post("/")
 def revoke(
     token: str = Form(...),
     token_type_hint: str = Form(None),
     session: Session = Depends(get_session),
 ):
-    repo = RefreshTokenRepository(session)
-    db_token = repo.get(token)
-    if db_token:
-        repo.revoke(token)
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        token_service.revoke_token(token)
+    return {"revoked": True}
+
+
+async def revoke_async(
+    token: str = Form(...),
+    token_type_hint: str = Form(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    token_service = AsyncTokenService(session)
+    async with AsyncUnitOfWork(session):
+        await token_service.revoke_token(token)
     return {"revoked": True}
+
+
+router.add_api_route(
+    "/", revoke_async if settings.DATABASE_ASYNC else revoke, methods=["POST"]
+)
+
+
+@router.post("/users/{user_id}", dependencies=[Depends(require_role("admin"))])
+def revoke_user_tokens(user_id: UUID, session: Session = Depends(get_session)):
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        result = token_service.revoke_by_user(user_id)
+    return result.to_dict()
+
+
+@router.post("/clients/{client_id}", dependencies=[Depends(require_role("admin"))])
+def revoke_client_tokens(client_id: str, session: Session = Depends(get_session)):
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        result = token_service.revoke_by_client(client_id)
+    return result.to_dict()
+
+
+@router.post("/tenants/{tenant_id}", dependencies=[Depends(require_role("admin"))])
+def revoke_tenant_tokens(tenant_id: UUID, session: Session = Depends(get_session)):
+    token_service = TokenService(session)
+    with UnitOfWork(session):
+        result = token_service.revoke_by_tenant(tenant_id)
+    return result.to_dict()
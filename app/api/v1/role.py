@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session
 
 from app.core.db import get_session
+from app.core.unit_of_work import UnitOfWork
 from app.repositories.role_repository import RoleRepository
 from app.schemas.role import RoleCreate, RoleRead, RoleSetPermission, RoleUpdate
 from app.services.role_service import RoleService
@@ -21,7 +22,8 @@ def list_roles(session: Session = Depends(get_session)) -> list[RoleRead]:
 @router.post("/")
 def create_role(role: RoleCreate, session: Session = Depends(get_session)):
     role_service = RoleService(RoleRepository(session))
-    db_role = role_service.create_role(role)
+    with UnitOfWork(session):
+        db_role = role_service.create_role(role)
     return RoleRead.model_validate(db_role)
 
 
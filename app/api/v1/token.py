@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends, Form, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.async_db import get_async_session
 from app.core.config import settings
 from app.core.db import Session, get_session
+from app.core.unit_of_work import AsyncUnitOfWork, UnitOfWork
 from app.domain.grants.grant_types import GrantType
 from app.domain.tokens.authorization_code_grant_request import (
     AuthorizationCodeGrantRequest,
 )
 from app.domain.tokens.token_response import FormTokenRequest
 from app.services.grants.authorization_code_grant_handler import (
+    AsyncAuthorizationCodeGrantHandler,
     AuthorizationCodeGrantHandler,
 )
-from app.services.grants.refresh_token_grant_handler import RefreshTokenGrantHandler
-from app.services.grants.token_grant_handler import TokenGrantHandler
+from app.services.grants.refresh_token_grant_handler import (
+    AsyncRefreshTokenGrantHandler,
+    RefreshTokenGrantHandler,
+)
+from app.services.grants.token_grant_handler import (
+    AsyncTokenGrantHandler,
+    TokenGrantHandler,
+)
 
 router = APIRouter()
 
@@ -21,8 +31,12 @@ grant_handlers = {
     GrantType.REFRESH_TOKEN: RefreshTokenGrantHandler,
 }
 
+async_grant_handlers = {
+    GrantType.AUTHORIZATION_CODE: AsyncAuthorizationCodeGrantHandler,
+    GrantType.REFRESH_TOKEN: AsyncRefreshTokenGrantHandler,
+}
+
 
-@router.post("/token")
 def token(
     grant_type: str = Form(...),
     code: str = Form(None),
@@ -47,6 +61,45 @@ def token(
         refresh_token=refresh_token,
     )
 
-    response = handler.handle(AuthorizationCodeGrantRequest(**form_data.to_dict()))
-    session.commit()
+    # Una sola transacción para todos los tokens emitidos/rotados
+    with UnitOfWork(session):
+        response = handler.handle(AuthorizationCodeGrantRequest(**form_data.to_dict()))
+    return response.to_dict()
+
+
+async def token_async(
+    grant_type: str = Form(...),
+    code: str = Form(None),
+    redirect_uri: str = Form(None),
+    client_id: str = Form(...),
+    code_verifier: str = Form(None),
+    refresh_token: str = Form(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    handler_cls = async_grant_handlers.get(grant_type)
+    if not handler_cls:
+        raise HTTPException(status_code=400, detail="unsupported_grant_type")
+
+    handler: AsyncTokenGrantHandler = handler_cls(settings, session)
+
+    form_data = FormTokenRequest(
+        grant_type=grant_type,
+        code=code,
+        redirect_uri=redirect_uri,
+        client_id=client_id,
+        code_verifier=code_verifier,
+        refresh_token=refresh_token,
+    )
+
+    async with AsyncUnitOfWork(session):
+        response = await handler.handle(
+            AuthorizationCodeGrantRequest(**form_data.to_dict())
+        )
     return response.to_dict()
+
+
+# Con DATABASE_ASYNC el endpoint no ocupa un hilo del threadpool mientras
+# espera a la BD; la versión sync sigue disponible durante la migración
+router.add_api_route(
+    "/token", token_async if settings.DATABASE_ASYNC else token, methods=["POST"]
+)
@@ -4,7 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from app.core.auth.dependencies import require_role
+from app.core.auth.permission_cache import permission_cache
 from app.core.db import get_session
+from app.core.unit_of_work import UnitOfWork
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import (
     UserCreate,
@@ -13,6 +15,7 @@ from app.schemas.user import (
     UserUpdate,
     UserWithRoles,
 )
+from app.services.token_service import TokenService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/v1/user")
@@ -24,9 +27,10 @@ router = APIRouter(prefix="/v1/user")
 )
 def create_user(user: UserCreate, db: Session = Depends(get_session)):
     user_service = UserService(db)
-    created_user = user_service.create_user(
-        email=user.email, password=user.password, username=user.username
-    )
+    with UnitOfWork(db):
+        created_user = user_service.create_user(
+            email=user.email, password=user.password, username=user.username
+        )
 
     new_user = UserRead(
         email=created_user.email, id=created_user.id, username=created_user.username
@@ -75,7 +79,12 @@ def set_user_role(
     user_set_roles: UserSetRole, db: Session = Depends(get_session)
 ) -> UserWithRoles:
     user_service = UserService(db)
-    updated_user = user_service.set_user_role(user_set_roles)
+    with UnitOfWork(db):
+        updated_user = user_service.set_user_role(user_set_roles)
+        # Los tokens ya emitidos no conservan los roles anteriores
+        TokenService(db).drop_authz_claims(updated_user.id)
+    # Tras el commit: una lectura anterior volvería a cachear los roles viejos
+    permission_cache.invalidate(updated_user.id)
     return UserWithRoles.model_validate(updated_user)
 
 
@@ -84,5 +93,10 @@ def remove_user_role(
     user_set_roles: UserSetRole, db: Session = Depends(get_session)
 ) -> UserWithRoles:
     user_service = UserService(db)
-    updated_user = user_service.remove_user_role(user_set_roles)
+    with UnitOfWork(db):
+        updated_user = user_service.remove_user_role(user_set_roles)
+        # Los tokens ya emitidos no conservan los roles anteriores
+        TokenService(db).drop_authz_claims(updated_user.id)
+    # Tras el commit: una lectura anterior volvería a cachear los roles viejos
+    permission_cache.invalidate(updated_user.id)
     return UserWithRoles.model_validate(updated_user)
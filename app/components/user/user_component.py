@@ -1,5 +1,5 @@
 from app.components.user.rules import UserNameValidator, UserPasswordValidator
-from app.core.security.password_hasher import PasswordHasher
+from app.core.security.hashing_pool import password_hashing_pool
 from app.exceptions.bussiness_exceptions import (
     EmailAlreadyExistsException,
     UserNameAlreadyExistsException,
@@ -28,8 +28,7 @@ class UserComponent:
         if not self.password_validator.validate(password):
             raise ValueError("Password does not meet the required criteria.")
 
-        password_hash = PasswordHasher()
-        hashed_password = password_hash.hash(password)
+        hashed_password = password_hashing_pool.hash(password)
 
         return User(
             username=username,
@@ -0,0 +1,36 @@
+from functools import lru_cache
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db_profiles import engine_options
+
+# Driver async equivalente a cada driver sync
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Async URL for a sync DATABASE_URL (psycopg2 -> asyncpg, sqlite -> aiosqlite)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Async engine, created on first use so the async driver is only needed
+    when DATABASE_ASYNC is enabled."""
+    url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    return create_async_engine(url, **engine_options(settings, url, is_async=True))
+
+
+async def get_async_session():
+    # Igual que get_session: sin SELECT de refresh tras el commit
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -1,67 +1,101 @@
+from typing import Callable
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlmodel import Session
 
+from app.core.auth.permission_catalog import EffectivePermissions
 from app.core.db import get_session
+from app.domain.tokens.access_token_claims import AccessTokenClaims
 from app.exceptions.bussiness_exceptions import (
     RequiredPermissionException,
     RequiredRoleException,
 )
 from app.exceptions.http_exceptions import UnauthorizedException
 from app.models.user import User
-from app.repositories.access_token_repository import AccessTokenRepository
+from app.repositories.user_repository import UserRepository
+from app.services.token_service import TokenService
 from app.services.user_service import UserService
 
 oauth2_scheme = HTTPBearer()
 
 
-def get_current_user(
+def get_current_claims(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     session: Session = Depends(get_session),
+) -> AccessTokenClaims:
+    """Claims of the active access token of the request."""
+    access_token = TokenService(session).get_active_access_token(token.credentials)
+    if not access_token:
+        raise UnauthorizedException("Invalid authentication credentials")
+    return access_token
+
+
+def get_current_user(
+    access_token: AccessTokenClaims = Depends(get_current_claims),
+    session: Session = Depends(get_session),
 ) -> User:
     """Retrieve the current authenticated user based on the provided token."""
-    access_token_repo = AccessTokenRepository(session)
-    user_service = UserService(session)
-    access_token = access_token_repo.get(token.credentials)
-    if not access_token or access_token.revoked:
-        raise UnauthorizedException("Invalid authentication credentials")
-    user = user_service.get_user_by_id(access_token.user_id)
+    # Sin cargar roles: require_role / require_permission usan las máscaras
+    user = UserRepository(session).get_by_id(access_token.user_id)
     if not user:
         raise UnauthorizedException("Invalid user")
     return user
 
 
-def require_role(required_role: str) -> User:
+def get_effective_permissions(
+    access_token: AccessTokenClaims = Depends(get_current_claims),
+    session: Session = Depends(get_session),
+) -> EffectivePermissions:
+    """Role and permission masks from the token claim (TOKEN_AUTHZ_CLAIMS), or
+    from the DB when the token has none or it was built with another catalog."""
+    user_service = UserService(session)
+    if access_token.authz:
+        effective = EffectivePermissions.from_claim(
+            user_service.get_permission_catalog(), access_token.authz
+        )
+        if effective is not None:
+            return effective
+    return user_service.get_effective_permissions(access_token.user_id)
+
+
+def require_role(required_role: str) -> Callable[..., AccessTokenClaims]:
     """Required specific role."""
 
-    def wrapper(user: User = Depends(get_current_user)):
-        roles = [role.name for role in user.roles]
-        if required_role not in roles:
+    def wrapper(
+        access_token: AccessTokenClaims = Depends(get_current_claims),
+        effective: EffectivePermissions = Depends(get_effective_permissions),
+    ) -> AccessTokenClaims:
+        if not effective.has_any_role([required_role]):
             raise RequiredRoleException(required_role)
-        return user
+        return access_token
 
     return wrapper
 
 
-def require_roles(required_roles: list[str]) -> User:
+def require_roles(required_roles: list[str]) -> Callable[..., AccessTokenClaims]:
     """Required any of the roles in the list."""
 
-    def wrapper(user: User = Depends(get_current_user)):
-        roles = [role.name for role in user.roles]
-        if not any(role in roles for role in required_roles):
+    def wrapper(
+        access_token: AccessTokenClaims = Depends(get_current_claims),
+        effective: EffectivePermissions = Depends(get_effective_permissions),
+    ) -> AccessTokenClaims:
+        if not effective.has_any_role(required_roles):
             raise RequiredRoleException(required_roles)
-        return user
+        return access_token
 
     return wrapper
 
 
-def require_permission(required_permission: str) -> User:
+def require_permission(required_permission: str) -> Callable[..., AccessTokenClaims]:
     """Required specific permission."""
 
-    def wrapper(user: User = Depends(get_current_user)):
-        permissions = [perm.name for role in user.roles for perm in role.permissions]
-        if required_permission not in permissions:
+    def wrapper(
+        access_token: AccessTokenClaims = Depends(get_current_claims),
+        effective: EffectivePermissions = Depends(get_effective_permissions),
+    ) -> AccessTokenClaims:
+        if not effective.has_permission(required_permission):
             raise RequiredPermissionException(required_permission)
-        return user
+        return access_token
 
     return wrapper
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app.core.auth.permission_catalog import EffectivePermissions, PermissionCatalog
+from app.core.config import settings
+
+
+class PermissionCache:
+    """
+    Caché en memoria (LRU acotado con TTL) del catálogo de permisos compilado
+    y de las máscaras de roles y permisos efectivos de cada usuario. Los
+    cambios de roles o permisos hechos en este proceso invalidan las entradas
+    afectadas; los de otros workers se ven cuando la entrada expira.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # user_id -> (monotonic deadline, permisos efectivos)
+        self._entries: "OrderedDict[UUID, Tuple[float, EffectivePermissions]]" = (
+            OrderedDict()
+        )
+        # Sube con cada invalidación: un resultado leído de la DB antes de una
+        # invalidación no se guarda
+        self._generation = 0
+        self._catalog: Optional[Tuple[float, PermissionCatalog]] = None
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID, version: str) -> Optional[EffectivePermissions]:
+        """Cached masks of a user, if compiled with catalog `version`."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            deadline, effective = entry
+            if deadline <= time.monotonic() or effective.catalog.version != version:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return effective
+
+    def get_catalog(self) -> Optional[PermissionCatalog]:
+        with self._lock:
+            if self._catalog is None or self._catalog[0] <= time.monotonic():
+                return None
+            return self._catalog[1]
+
+    def put_catalog(self, catalog: PermissionCatalog, generation: int) -> None:
+        """Cache the catalog compiled when `generation()` was `generation`."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._catalog = (time.monotonic() + self.ttl_seconds, catalog)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def put(
+        self, user_id: UUID, effective: EffectivePermissions, generation: int
+    ) -> None:
+        """Cache the permissions loaded when `generation()` was `generation`."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, effective)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's entry (e.g. after assigning or removing a role)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def invalidate_catalog(self) -> None:
+        """Drop the catalog after a role or permission change. Users' masks
+        compiled with another catalog version are recomputed on next use."""
+        with self._lock:
+            self._generation += 1
+            self._catalog = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._catalog = None
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Instancia global (en memoria, por proceso)
+permission_cache = PermissionCache(
+    max_entries=settings.PERMISSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
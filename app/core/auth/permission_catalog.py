@@ -0,0 +1,139 @@
+import base64
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class PermissionCatalog:
+    """
+    Catálogo compilado de permisos y roles: cada nombre tiene una posición de
+    bit densa (orden de creación), y cada rol la máscara de sus permisos. Los
+    permisos efectivos de un usuario son el OR de las máscaras de sus roles, y
+    una verificación es un AND de enteros.
+    `version` cambia con cualquier cambio de nombres, orden o asignaciones, así
+    una máscara compilada con otra versión se vuelve a calcular.
+    """
+
+    version: str
+    permission_bits: Dict[str, int]
+    role_bits: Dict[str, int]
+    # role_id -> (bit del rol, máscara de sus permisos)
+    roles: Dict[UUID, Tuple[int, int]]
+
+    @classmethod
+    def compile(
+        cls,
+        permission_names: List[str],
+        role_rows: List[Tuple[UUID, str, Optional[str]]],
+    ) -> "PermissionCatalog":
+        """
+        permission_names: every permission, in creation order
+        role_rows: (role_id, role name, permission name or None), roles in
+            creation order
+        """
+        permission_bits: Dict[str, int] = {}
+        for name in permission_names:
+            permission_bits.setdefault(name, len(permission_bits))
+
+        role_bits: Dict[str, int] = {}
+        roles: Dict[UUID, Tuple[int, int]] = {}
+        for role_id, role_name, permission_name in role_rows:
+            bit = role_bits.setdefault(role_name, len(role_bits))
+            _, mask = roles.get(role_id, (bit, 0))
+            if permission_name is not None:
+                # Permiso creado entre las dos consultas: va al final
+                position = permission_bits.setdefault(
+                    permission_name, len(permission_bits)
+                )
+                mask |= 1 << position
+            roles[role_id] = (bit, mask)
+
+        digest = hashlib.sha256()
+        digest.update("\n".join(permission_names).encode())
+        for role_id, (bit, mask) in roles.items():
+            digest.update(f"|{role_id}:{bit}:{mask:x}".encode())
+        for role_name in role_bits:
+            digest.update(f"|{role_name}".encode())
+        return cls(digest.hexdigest()[:16], permission_bits, role_bits, roles)
+
+    def permission_mask(self, names: Iterable[str]) -> Optional[int]:
+        """Mask of the given permissions; None if one is not in the catalog."""
+        mask = 0
+        for name in names:
+            bit = self.permission_bits.get(name)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def role_mask(self, names: Iterable[str]) -> int:
+        """Mask of the given roles; unknown roles are left out."""
+        mask = 0
+        for name in names:
+            bit = self.role_bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def user_masks(self, role_ids: Iterable[UUID]) -> Tuple[int, int]:
+        """(role mask, permission mask) of a user holding `role_ids`."""
+        role_mask = permission_mask = 0
+        for role_id in role_ids:
+            if role_id in self.roles:
+                bit, mask = self.roles[role_id]
+                role_mask |= 1 << bit
+                permission_mask |= mask
+        return role_mask, permission_mask
+
+
+@dataclass(frozen=True)
+class EffectivePermissions:
+    """Roles and permissions of a user as masks of `catalog`."""
+
+    catalog: PermissionCatalog
+    role_mask: int
+    permission_mask: int
+
+    def has_any_role(self, names: Iterable[str]) -> bool:
+        return bool(self.role_mask & self.catalog.role_mask(names))
+
+    def has_permission(self, name: str) -> bool:
+        # Un permiso que no está en el catálogo no lo tiene ningún rol
+        required = self.catalog.permission_mask([name])
+        return required is not None and self.permission_mask & required == required
+
+    def to_claim(self) -> str:
+        """Compact token claim: `<catalog version>.<role mask>.<permission mask>`,
+        masks as base64url big-endian integers."""
+        return ".".join(
+            [
+                self.catalog.version,
+                _encode_mask(self.role_mask),
+                _encode_mask(self.permission_mask),
+            ]
+        )
+
+    @classmethod
+    def from_claim(
+        cls, catalog: PermissionCatalog, claim: str
+    ) -> Optional["EffectivePermissions"]:
+        """Masks of a token claim; None if it was built with another catalog."""
+        try:
+            version, role_mask, permission_mask = claim.split(".")
+        except ValueError:
+            return None
+        if version != catalog.version:
+            return None
+        return cls(catalog, _decode_mask(role_mask), _decode_mask(permission_mask))
+
+
+def _encode_mask(mask: int) -> str:
+    data = mask.to_bytes(max((mask.bit_length() + 7) // 8, 1), "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode_mask(value: str) -> int:
+    data = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    return int.from_bytes(data, "big")
@@ -0,0 +1,29 @@
+from app.core.config import settings
+from app.core.store import AuthorizationCodeStore, BaseAuthorizationCodeStore
+
+
+def build_authorization_code_store() -> BaseAuthorizationCodeStore:
+    """Authorization code store selected by AUTHORIZATION_CODE_STORE_BACKEND."""
+    backend = settings.AUTHORIZATION_CODE_STORE_BACKEND
+    if backend == "sql":
+        from app.core.code_store.sql_store import SqlAuthorizationCodeStore
+
+        return SqlAuthorizationCodeStore()
+    if backend == "sqlite":
+        from app.core.code_store.sqlite_store import SqliteAuthorizationCodeStore
+
+        return SqliteAuthorizationCodeStore(settings.AUTHORIZATION_CODE_SQLITE_PATH)
+    if backend == "redis":
+        from app.core.code_store.redis_store import RedisAuthorizationCodeStore
+
+        return RedisAuthorizationCodeStore.from_url(settings.REDIS_URL)
+    if backend == "sealed":
+        from app.core.code_store.sealed_store import SealedAuthorizationCodeStore
+
+        return SealedAuthorizationCodeStore.from_settings()
+    return AuthorizationCodeStore(max_entries=settings.AUTHORIZATION_CODE_MAX_ENTRIES)
+
+
+# Instancia global, compartida entre workers salvo con el backend "memory"
+# ("sealed" no guarda los códigos, solo los jti canjeados)
+authorization_code_store = build_authorization_code_store()
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from typing import Optional
+
+from app.core.store import AuthorizationCode, BaseAuthorizationCodeStore
+
+
+class RedisAuthorizationCodeStore(BaseAuthorizationCodeStore):
+    """
+    Códigos en Redis (o un servidor con el mismo protocolo) con expiración
+    nativa; `GETDEL` (Redis >= 6.2) hace el canje atómico. El cliente se inyecta.
+    """
+
+    def __init__(self, client, prefix: str = "idp:code:", default_ttl_seconds=600):
+        super().__init__(default_ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisAuthorizationCodeStore":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "AUTHORIZATION_CODE_STORE_BACKEND=redis requires the `redis` package"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        ttl_ms = int((auth_code.expires_at - datetime.utcnow()).total_seconds() * 1000)
+        if ttl_ms <= 0:
+            return
+        self.client.set(
+            self.prefix + auth_code.code, json.dumps(auth_code.to_dict()), px=ttl_ms
+        )
+
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        data = self.client.getdel(self.prefix + code)
+        return AuthorizationCode.from_dict(json.loads(data)) if data else None
+
+    def _size(self) -> None:
+        # Las claves expiran solas; contarlas requiere recorrer el keyspace
+        return None
@@ -0,0 +1,148 @@
+import base64
+import json
+import os
+from dataclasses import replace
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.core.config import settings
+from app.core.security.replay_cache import RedisReplayCache, ReplayCache
+from app.core.store import AuthorizationCode, BaseAuthorizationCodeStore
+
+# Versión del formato: version (1) | nonce (12) | AES-GCM(payload) + tag (16)
+SEAL_VERSION = b"\x01"
+AAD = b"authorization_code"
+
+
+class SealedAuthorizationCodeStore(BaseAuthorizationCodeStore):
+    """
+    Códigos autocontenidos: el código es el payload (client_id, redirect_uri,
+    code_challenge, user_id, scope, expiración y un jti de 16 bytes) cifrado y
+    autenticado con AES-256-GCM. No se guarda nada al emitirlo; al canjearlo
+    solo se registra el jti en el replay cache hasta que expira.
+    Todos los workers deben compartir la llave y, para uso único entre
+    workers, también el replay cache.
+    """
+
+    def __init__(self, key: bytes, replay_cache, default_ttl_seconds: int = 600):
+        super().__init__(default_ttl_seconds)
+        self._aead = AESGCM(key)
+        self.replay_cache = replay_cache
+
+    def save(
+        self,
+        code: str,
+        client_id: str,
+        redirect_uri: str,
+        code_challenge: str,
+        user_id: UUID,
+        scope: Optional[List[str]] = None,
+        expires_at: Optional[datetime] = None,
+    ) -> AuthorizationCode:
+        """Emite un código sellado; `code` se ignora y se devuelve el sellado."""
+        auth_code = super().save(
+            code, client_id, redirect_uri, code_challenge, user_id, scope, expires_at
+        )
+        return replace(auth_code, code=self.seal(auth_code))
+
+    def seal(self, auth_code: AuthorizationCode) -> str:
+        payload = {
+            "j": base64.urlsafe_b64encode(os.urandom(16)).decode(),
+            "c": auth_code.client_id,
+            "r": auth_code.redirect_uri,
+            "p": auth_code.code_challenge,
+            "u": str(auth_code.user_id),
+            "s": auth_code.scope,
+            "e": auth_code.expires_at.isoformat(),
+        }
+        nonce = os.urandom(12)
+        sealed = self._aead.encrypt(
+            nonce, json.dumps(payload, separators=(",", ":")).encode(), AAD
+        )
+        # Sin padding: el código viaja en la query string del redirect
+        return (
+            base64.urlsafe_b64encode(SEAL_VERSION + nonce + sealed)
+            .rstrip(b"=")
+            .decode()
+        )
+
+    def unseal(self, code: str) -> Optional[tuple[bytes, AuthorizationCode]]:
+        """Decrypt and authenticate a code; None if it was not issued by us."""
+        try:
+            raw = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+            if raw[:1] != SEAL_VERSION:
+                return None
+            payload = json.loads(self._aead.decrypt(raw[1:13], raw[13:], AAD))
+        except (ValueError, InvalidTag):
+            return None
+        return base64.urlsafe_b64decode(payload["j"]), AuthorizationCode(
+            code=code,
+            client_id=payload["c"],
+            redirect_uri=payload["r"],
+            code_challenge=payload["p"],
+            user_id=UUID(payload["u"]),
+            expires_at=datetime.fromisoformat(payload["e"]),
+            scope=payload["s"],
+        )
+
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        # Nada que guardar: el estado viaja en el propio código
+        return None
+
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        unsealed = self.unseal(code)
+        if not unsealed:
+            return None
+        jti, auth_code = unsealed
+        if auth_code.is_expired:
+            return None
+        # Uso único: solo el primer canje registra el jti
+        if not self.replay_cache.add(jti, auth_code.expires_at):
+            return None
+        return auth_code
+
+    def _size(self) -> Optional[int]:
+        # Solo hay estado para los códigos ya canjeados (jti en el replay cache)
+        if isinstance(self.replay_cache, ReplayCache):
+            return len(self.replay_cache)
+        return None
+
+    @classmethod
+    def from_settings(cls) -> "SealedAuthorizationCodeStore":
+        key = settings.AUTHORIZATION_CODE_SEALING_KEY
+        if key:
+            key_bytes = base64.urlsafe_b64decode(key.encode())
+        elif settings.AUTHORIZATION_CODE_SEALING_DEV_KEY:
+            # Llave efímera: los códigos solo valen en este proceso
+            print(
+                "[SealedAuthorizationCodeStore] AUTHORIZATION_CODE_SEALING_KEY "
+                "no configurada, usando una llave aleatoria por proceso (dev)."
+            )
+            key_bytes = AESGCM.generate_key(bit_length=256)
+        else:
+            raise RuntimeError(
+                "AUTHORIZATION_CODE_STORE_BACKEND=sealed requires "
+                "AUTHORIZATION_CODE_SEALING_KEY (or AUTHORIZATION_CODE_SEALING_DEV_KEY=true "
+                "for a random key per process)"
+            )
+        if settings.AUTHORIZATION_CODE_REPLAY_CACHE == "redis":
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "AUTHORIZATION_CODE_REPLAY_CACHE=redis requires the `redis` package"
+                ) from e
+            replay_cache = RedisReplayCache(redis.Redis.from_url(settings.REDIS_URL))
+        elif settings.WEB_CONCURRENCY > 1:
+            # Un jti canjeado en un worker no se vería en los demás
+            raise RuntimeError(
+                "AUTHORIZATION_CODE_REPLAY_CACHE=memory only blocks reuse within one "
+                f"worker, use redis with WEB_CONCURRENCY={settings.WEB_CONCURRENCY}"
+            )
+        else:
+            replay_cache = ReplayCache()
+        return cls(key_bytes, replay_cache)
@@ -0,0 +1,54 @@
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.core.store import AuthorizationCode, BaseAuthorizationCodeStore
+from app.models.authorization_code import AuthorizationCodeRecord
+from app.repositories.authorization_code_repository import (
+    AuthorizationCodeRepository,
+)
+
+
+class SqlAuthorizationCodeStore(BaseAuthorizationCodeStore):
+    """
+    Códigos en la tabla `authorization_codes`, compartida por todos los workers.
+    Cada operación usa su propia transacción: el código es visible para los
+    demás workers apenas se guarda. Cada `save` elimina también un lote de
+    códigos expirados, así la tabla no crece sin un job de limpieza.
+    """
+
+    def __init__(self, default_ttl_seconds: int = 600, purge_batch_size: int = 100):
+        super().__init__(default_ttl_seconds)
+        self.purge_batch_size = purge_batch_size
+
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        with Session(engine) as session:
+            repo = AuthorizationCodeRepository(session)
+            self._stats.expired += repo.delete_expired(
+                datetime.utcnow(), self.purge_batch_size
+            )
+            repo.create(AuthorizationCodeRecord(**asdict(auth_code)))
+            session.commit()
+
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        with Session(engine) as session:
+            record = AuthorizationCodeRepository(session).take(code)
+            # Copiar antes del commit: la fila ya no existe para refrescarla
+            auth_code = record and AuthorizationCode(
+                code=record.code,
+                client_id=record.client_id,
+                redirect_uri=record.redirect_uri,
+                code_challenge=record.code_challenge,
+                user_id=record.user_id,
+                expires_at=record.expires_at,
+                scope=record.scope,
+            )
+            session.commit()
+        return auth_code
+
+    def _size(self) -> int:
+        with Session(engine) as session:
+            return AuthorizationCodeRepository(session).count_active(datetime.utcnow())
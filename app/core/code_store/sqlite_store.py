@@ -0,0 +1,69 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Optional
+
+from app.core.store import AuthorizationCode, BaseAuthorizationCodeStore
+
+
+class SqliteAuthorizationCodeStore(BaseAuthorizationCodeStore):
+    """
+    Códigos en un archivo SQLite compartido por los workers de un mismo host
+    (en /dev/shm queda en memoria). `DELETE ... RETURNING` hace el canje atómico
+    y cada `save` elimina un lote de códigos expirados.
+    """
+
+    def __init__(
+        self, path: str, default_ttl_seconds: int = 600, purge_batch_size: int = 100
+    ):
+        super().__init__(default_ttl_seconds)
+        self.path = path
+        self.purge_batch_size = purge_batch_size
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS authorization_codes ("
+                "code TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_authorization_codes_expires_at "
+                "ON authorization_codes (expires_at)"
+            )
+
+    def _connect(self):
+        # Autocommit: cada sentencia es su propia transacción
+        return closing(sqlite3.connect(self.path, timeout=5, isolation_level=None))
+
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        with self._connect() as conn:
+            purged = conn.execute(
+                "DELETE FROM authorization_codes WHERE code IN (SELECT code "
+                "FROM authorization_codes WHERE expires_at < ? "
+                "ORDER BY expires_at LIMIT ?)",
+                (datetime.utcnow().timestamp(), self.purge_batch_size),
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO authorization_codes VALUES (?, ?, ?)",
+                (
+                    auth_code.code,
+                    json.dumps(auth_code.to_dict()),
+                    auth_code.expires_at.timestamp(),
+                ),
+            )
+        self._stats.expired += purged
+
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "DELETE FROM authorization_codes WHERE code = ? RETURNING data",
+                (code,),
+            ).fetchone()
+        return AuthorizationCode.from_dict(json.loads(row[0])) if row else None
+
+    def _size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM authorization_codes WHERE expires_at >= ?",
+                (datetime.utcnow().timestamp(),),
+            ).fetchone()[0]
@@ -1,5 +1,6 @@
 # Application settings from environment variables or .env file
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -16,9 +17,133 @@ class Settings(BaseSettings):
     JWT_ALG: str = "RS256"
     PRIVATE_KEY_PATH: str = "keys/private.pem"
     PUBLIC_KEY_PATH: str = "keys/public.pem"
+    # Key ring: active keys in the dir, retiring keys in `<dir>/retiring`
+    SIGNING_KEYS_DIR: str = "keys"
+    KEY_RING_RELOAD_SECONDS: int = 10
+
+    # Reuse of a rotated refresh token revokes the whole token family. Opt-in:
+    # within this many seconds of the rotation, reuse revokes only the tokens
+    # issued by that rotation and the ones after it (0 = off)
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: float = 0
+
+    # Access tokens: "opaque" (random string stored in DB) or "jwt" (self-contained)
+    ACCESS_TOKEN_FORMAT: str = "opaque"
+    # Interval to refresh the in-memory list of revoked JWT access tokens
+    REVOCATION_LIST_SYNC_SECONDS: int = 30
+    # Revocation feed (/v1/revocations): deltas only list events older than
+    # the settle delay (SQL store), max events per delta and Bloom filter
+    # false positive rate of the snapshot
+    REVOCATION_FEED_SETTLE_SECONDS: float = 2
+    REVOCATION_FEED_MAX_EVENTS: int = 1000
+    REVOCATION_FEED_BLOOM_FP_RATE: float = 0.001
+
+    # Authorization codes: "memory" (one process), "sql" (DB table), "sqlite"
+    # (file shared by the workers of one host), "redis" (REDIS_URL) or
+    # "sealed" (self-contained codes encrypted with AES-256-GCM)
+    AUTHORIZATION_CODE_STORE_BACKEND: str = "memory"
+    AUTHORIZATION_CODE_SQLITE_PATH: str = "authorization_codes.sqlite"
+    # Sealed codes: base64url 32-byte key (same on every worker, required) and
+    # where the jti of redeemed codes are kept until expiry: "memory" (a single
+    # worker) or "redis"
+    AUTHORIZATION_CODE_SEALING_KEY: str = ""
+    AUTHORIZATION_CODE_REPLAY_CACHE: str = "memory"
+    # Dev only: without a sealing key, use a random key per process
+    AUTHORIZATION_CODE_SEALING_DEV_KEY: bool = False
+    # Worker processes of the server (uvicorn and gunicorn read it too); the
+    # per-process sealed replay cache is refused with more than one
+    WEB_CONCURRENCY: int = 1
+    # Max authorization codes kept in memory (at least 1); the closest to expiry
+    # are dropped
+    AUTHORIZATION_CODE_MAX_ENTRIES: int = 100_000
+
+    # Introspection cache of opaque access tokens (per process, 0 disables it).
+    # Revocations in other workers are seen when the entry expires.
+    INTROSPECTION_CACHE_MAX_ENTRIES: int = 10_000
+    INTROSPECTION_CACHE_TTL_SECONDS: float = 30
+    INTROSPECTION_CACHE_NEGATIVE_TTL_SECONDS: float = 5
+    # Max seconds a signed (JWT) introspection response may be cached
+    INTROSPECTION_JWT_TTL_SECONDS: int = 300
+    # Max tokens per call to POST /v1/introspect/batch
+    INTROSPECTION_BATCH_MAX_TOKENS: int = 100
+
+    # Password hashes: "argon2" (argon2id) or "pbkdf2_sha256". Hashes of the
+    # other scheme or with other argon2 costs are rehashed on login. Pick the
+    # costs for the host with `typer cli.py run calibrate-password-hashing`.
+    PASSWORD_HASH_SCHEME: str = "argon2"
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST_KIB: int = 19456
+    ARGON2_PARALLELISM: int = 1
+
+    # Login throttling, checked before verifying the password: failed logins
+    # per username and per client IP in a sliding window give growing delays
+    # (base doubled per failure, up to max) and then a lockout. The global cap
+    # limits login attempts per second (0 disables it). Backend: "memory"
+    # (per process, bounded) or "redis" (shared by the workers).
+    LOGIN_THROTTLE_BACKEND: str = "memory"
+    LOGIN_THROTTLE_MAX_ENTRIES: int = 100_000
+    LOGIN_THROTTLE_WINDOW_SECONDS: float = 900
+    LOGIN_THROTTLE_USERNAME_FREE_FAILURES: int = 5
+    LOGIN_THROTTLE_USERNAME_LOCKOUT_FAILURES: int = 20
+    LOGIN_THROTTLE_IP_FREE_FAILURES: int = 20
+    LOGIN_THROTTLE_IP_LOCKOUT_FAILURES: int = 100
+    LOGIN_THROTTLE_BASE_DELAY_SECONDS: float = 1
+    LOGIN_THROTTLE_MAX_DELAY_SECONDS: float = 60
+    LOGIN_THROTTLE_GLOBAL_MAX_PER_SECOND: int = 50
+
+    # Password hashing process pool (0 workers: hash in the request thread).
+    # Calls beyond MAX_PENDING (running + queued) are rejected with a 503 and
+    # a queued call gives up after QUEUE_TIMEOUT (twice that at most once it
+    # was handed to a worker process).
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_MAX_PENDING: int = 32
+    PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # Effective roles and permissions per user cached by require_role /
+    # require_permission (per process, 0 disables it). Changes made in other
+    # workers are seen when the entry expires.
+    PERMISSION_CACHE_MAX_ENTRIES: int = 10_000
+    PERMISSION_CACHE_TTL_SECONDS: float = 60
+
+    # Stamp the user's role and permission masks in new access tokens (JWT
+    # claim `authz`, or the stored record of opaque tokens), so require_role /
+    # require_permission skip the DB. Role changes of a user apply to tokens
+    # issued afterwards. Claims longer than MAX_BYTES are left out.
+    TOKEN_AUTHZ_CLAIMS: bool = False
+    TOKEN_AUTHZ_CLAIMS_MAX_BYTES: int = 1024
+
+    # Token store: "sql" (DB), "memory" (single node, TTL) or "redis"
+    TOKEN_STORE_BACKEND: str = "sql"
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Expired token cleanup: rows per DELETE and max seconds per run
+    TOKEN_CLEANUP_INTERVAL_SECONDS: int = 300
+    TOKEN_CLEANUP_BATCH_SIZE: int = 1000
+    TOKEN_CLEANUP_TIME_BUDGET_SECONDS: float = 5.0
+
+    # Daily partitions of the token tables by expires_at (PostgreSQL only).
+    # Convert the tables with `partition-token-tables` first; replaces the
+    # row-by-row cleanup once the tables are partitioned.
+    TOKEN_PARTITIONING_ENABLED: bool = False
+    TOKEN_PARTITION_PREMAKE_DAYS: int = 14
+    TOKEN_PARTITION_RETENTION_DAYS: int = 1
+    TOKEN_PARTITION_MAINTENANCE_SECONDS: int = 3600
 
     # Database
     DATABASE_URL: str = f"postgresql+psycopg2://{os.getenv('DATA_BASE_USER')}:{os.getenv('DATA_BASE_PASSWORD')}@{os.getenv('DATA_BASE_HOST')}:{os.getenv('DATA_BASE_PORT')}/{os.getenv('DATA_BASE_NAME')}"
+    # Engine profile: "dev" (SQL echo), "test" or "prod" (bigger pool,
+    # pre-ping, recycle, no echo). DATABASE_* below override the profile.
+    DATABASE_PROFILE: str = "dev"
+    DATABASE_ECHO: Optional[bool] = None
+    DATABASE_POOL_SIZE: Optional[int] = None
+    DATABASE_MAX_OVERFLOW: Optional[int] = None
+    DATABASE_POOL_TIMEOUT: Optional[float] = None
+    DATABASE_POOL_PRE_PING: Optional[bool] = None
+    DATABASE_POOL_RECYCLE: Optional[int] = None
+    # Async data access for the token, introspection and revoke endpoints
+    # (asyncpg / aiosqlite). ASYNC_DATABASE_URL defaults to DATABASE_URL with
+    # the async driver.
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str = ""
 
 
 settings = Settings()
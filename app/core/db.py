@@ -1,12 +1,13 @@
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import Settings
+from app.core.db_profiles import engine_options
 
 settings = Settings()
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, **engine_options(settings, DATABASE_URL))
 
 
 def init_db():
@@ -14,5 +15,6 @@ def init_db():
 
 
 def get_session():
-    with Session(engine) as session:
+    # Los objetos siguen usables tras el commit sin un SELECT extra de refresh
+    with Session(engine, expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    echo: bool
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_pre_ping: bool
+    # Segundos antes de reemplazar una conexión (-1: nunca)
+    pool_recycle: int
+
+
+# Perfiles por entorno, elegidos con DATABASE_PROFILE
+ENGINE_PROFILES = {
+    "dev": EngineProfile(
+        echo=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_pre_ping=False,
+        pool_recycle=-1,
+    ),
+    "test": EngineProfile(
+        echo=False,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=5,
+        pool_pre_ping=False,
+        pool_recycle=-1,
+    ),
+    "prod": EngineProfile(
+        echo=False,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    ),
+}
+
+
+def get_engine_profile(settings: Settings) -> EngineProfile:
+    """Profile named by DATABASE_PROFILE with the DATABASE_* overrides applied."""
+    if settings.DATABASE_PROFILE not in ENGINE_PROFILES:
+        raise ValueError(
+            f"Unknown DATABASE_PROFILE {settings.DATABASE_PROFILE!r}, "
+            f"expected one of {sorted(ENGINE_PROFILES)}"
+        )
+    overrides = {
+        "echo": settings.DATABASE_ECHO,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+    return replace(
+        ENGINE_PROFILES[settings.DATABASE_PROFILE],
+        **{name: value for name, value in overrides.items() if value is not None},
+    )
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    # Checkouts que fallaron al agotarse pool_timeout
+    checkout_timeouts: int = 0
+    # Checkouts en curso (esperando una conexión libre o abriendo una nueva)
+    waiting: int = 0
+    max_waiting: int = 0
+    checkout_seconds_total: float = 0.0
+    checkout_seconds_max: float = 0.0
+    # Últimas latencias, para el p95
+    recent: deque = field(default_factory=lambda: deque(maxlen=1024))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start(self) -> None:
+        with self.lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def finish(self, seconds: float, timed_out: bool) -> None:
+        with self.lock:
+            self.waiting -= 1
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            self.recent.append(seconds)
+
+    def to_dict(self, pool: QueuePool) -> dict:
+        with self.lock:
+            recent = sorted(self.recent)
+            data = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkout_ms_avg": round(
+                    1000 * self.checkout_seconds_total / max(self.checkouts, 1), 3
+                ),
+                "checkout_ms_p95": (
+                    round(1000 * recent[int(0.95 * (len(recent) - 1))], 3)
+                    if recent
+                    else 0.0
+                ),
+                "checkout_ms_max": round(1000 * self.checkout_seconds_max, 3),
+            }
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        data.update(
+            pool_size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            # Fracción de las conexiones posibles que están en uso
+            saturation=round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+        )
+        return data
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout and counts the ones still waiting."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        self.metrics.start()
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.finish(time.perf_counter() - started, timed_out)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(settings: Settings, url: str, is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine / create_async_engine."""
+    profile = get_engine_profile(settings)
+    options = {"echo": profile.echo, "pool_pre_ping": profile.pool_pre_ping}
+    # SQLite en memoria usa un pool propio (una conexión por hilo)
+    if make_url(url).database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+    )
+    return options
+
+
+def pool_metrics(engine) -> dict | None:
+    """Pool metrics of an engine, None if its pool is not instrumented."""
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return None
+    return metrics.to_dict(engine.pool)
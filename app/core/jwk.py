@@ -1,30 +1,69 @@
+import hashlib
+import json
+
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from jose.utils import base64url_encode
 
-from app.core.config import Settings
+# Miembros requeridos por tipo de llave para el thumbprint (RFC 7638)
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+# Curvas EC soportadas: nombre JWK, algoritmo JWS y tamaño de coordenada
+EC_CURVES = {"secp256r1": ("P-256", "ES256", 32)}
+
+
+def _b64(data: bytes) -> str:
+    return base64url_encode(data).decode("utf-8")
+
+
+def _int_to_b64(value: int, length: int | None = None) -> str:
+    length = length or (value.bit_length() + 7) // 8
+    return _b64(value.to_bytes(length, "big"))
 
-path = Settings().PRIVATE_KEY_PATH
 
-# Cargar tu llave privada desde el archivo .pem
-with open(str(path), "rb") as key_file:
-    private_key = serialization.load_pem_private_key(
-        key_file.read(),
-        password=None,
-    )
+def algorithm_for(key) -> str:
+    """Get the JWS algorithm matching a private or public key."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if key.curve.name in EC_CURVES:
+            return EC_CURVES[key.curve.name][1]
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
 
-public_key = private_key.public_key()
 
+def public_jwk(public_key) -> dict:
+    """Export a public key as a JWK (without kid/alg/use)."""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        numbers = public_key.public_numbers()
+        return {"kty": "RSA", "n": _int_to_b64(numbers.n), "e": _int_to_b64(numbers.e)}
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        if public_key.curve.name not in EC_CURVES:
+            raise ValueError(f"Unsupported curve: {public_key.curve.name}")
+        crv, _, size = EC_CURVES[public_key.curve.name]
+        numbers = public_key.public_numbers()
+        return {
+            "kty": "EC",
+            "crv": crv,
+            "x": _int_to_b64(numbers.x, size),
+            "y": _int_to_b64(numbers.y, size),
+        }
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(
+            encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw
+        )
+        return {"kty": "OKP", "crv": "Ed25519", "x": _b64(raw)}
+    raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
 
-def get_jwk():
-    numbers = public_key.public_numbers()
-    e = base64url_encode(numbers.e.to_bytes((numbers.e.bit_length() + 7) // 8, "big"))
-    n = base64url_encode(numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, "big"))
 
-    return {
-        "kty": "RSA",
-        "use": "sig",
-        "alg": "RS256",
-        "kid": "102f6d18-6089-43e7-b01e-cbb74c6bb68d",
-        "n": n.decode("utf-8"),
-        "e": e.decode("utf-8"),
-    }
+def jwk_thumbprint(jwk: dict) -> str:
+    """Compute the RFC 7638 thumbprint of a JWK, used as derived `kid`."""
+    members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode("utf-8")).digest()
+    return _b64(digest)
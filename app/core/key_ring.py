@@ -0,0 +1,165 @@
+import asyncio
+import signal
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import Settings, settings
+from app.core.jwk import algorithm_for, jwk_thumbprint, public_jwk
+from app.core.security import eddsa  # noqa: F401  (registra EdDSA en python-jose)
+
+RETIRING_DIR = "retiring"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Llave ya parseada y lista para firmar/verificar."""
+
+    kid: str
+    alg: str
+    private_key: Key
+    public_key: Key
+    jwk: dict
+    path: str
+    retiring: bool = False
+
+
+class KeyRing:
+    """
+    Conjunto de llaves de firma cargadas una sola vez en memoria.
+
+    - `SIGNING_KEYS_DIR/*.pem`: llaves activas (RSA, EC P-256 o Ed25519); firma
+      la más reciente cuyo algoritmo sea `JWT_ALG`, o la más reciente si no hay.
+    - `SIGNING_KEYS_DIR/retiring/*.pem`: llaves en retiro; solo verifican y se
+      publican en el JWKS hasta que expiren los tokens que firmaron.
+
+    `PRIVATE_KEY_PATH` siempre se incluye como llave activa si existe.
+    El `kid` se deriva del thumbprint (RFC 7638) de la llave pública.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._keys: Dict[str, SigningKey] = {}
+        self._signing_key: Optional[SigningKey] = None
+        self._mtimes: Dict[str, float] = {}
+
+    def _candidate_files(self) -> List[Path]:
+        base = Path(self.settings.SIGNING_KEYS_DIR)
+        files = set(base.glob("*.pem")) | set((base / RETIRING_DIR).glob("*.pem"))
+        legacy = Path(self.settings.PRIVATE_KEY_PATH)
+        if legacy.exists() and legacy.resolve() not in {f.resolve() for f in files}:
+            files.add(legacy)
+        return sorted(files)
+
+    def _scan(self) -> Dict[str, float]:
+        return {str(path): path.stat().st_mtime for path in self._candidate_files()}
+
+    def _parse(self, path: str) -> Optional[SigningKey]:
+        with open(path, "rb") as key_file:
+            data = key_file.read()
+        try:
+            private_key = serialization.load_pem_private_key(data, password=None)
+        except ValueError:
+            # Llaves públicas u otros PEM en el directorio no firman
+            return None
+
+        alg = algorithm_for(private_key)
+        public = public_jwk(private_key.public_key())
+        kid = jwk_thumbprint(public)
+        prepared = jwk.construct(private_key, alg)
+        return SigningKey(
+            kid=kid,
+            alg=alg,
+            private_key=prepared,
+            public_key=prepared.public_key(),
+            jwk={**public, "use": "sig", "alg": alg, "kid": kid},
+            path=path,
+            retiring=Path(path).parent.name == RETIRING_DIR,
+        )
+
+    def load(self) -> None:
+        """Parse every key from disk and swap the ring atomically."""
+        mtimes = self._scan()
+        keys: Dict[str, SigningKey] = {}
+        for path in mtimes:
+            key = self._parse(path)
+            if key:
+                keys[key.kid] = key
+
+        active = [k for k in keys.values() if not k.retiring]
+        if not active:
+            raise ValueError("No active signing key found")
+
+        # La llave activa más reciente (con el algoritmo preferido) es la que firma
+        preferred = [k for k in active if k.alg == self.settings.JWT_ALG] or active
+        signing_key = max(preferred, key=lambda k: (mtimes[k.path], k.kid))
+        self._keys, self._signing_key, self._mtimes = keys, signing_key, mtimes
+
+    def reload(self) -> bool:
+        """Reload keys from disk, keeping the current ring if loading fails."""
+        try:
+            self.load()
+        except (OSError, ValueError) as e:
+            print(f"[KeyRing] No se pudieron recargar las llaves: {e}")
+            return False
+        print(f"[KeyRing] Llaves cargadas: {list(self._keys)} (firma {self.kid})")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Reload only when a key file was added, removed or modified."""
+        try:
+            changed = self._scan() != self._mtimes
+        except OSError:
+            changed = True
+        return self.reload() if changed else False
+
+    @property
+    def signing_key(self) -> SigningKey:
+        if self._signing_key is None:
+            self.load()
+        return self._signing_key
+
+    @property
+    def kid(self) -> str:
+        return self.signing_key.kid
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        """Get a key by kid (active or retiring)."""
+        if self._signing_key is None:
+            self.load()
+        return self._keys.get(kid)
+
+    def algorithms(self) -> List[str]:
+        """Signing algorithms of the active keys."""
+        if self._signing_key is None:
+            self.load()
+        return sorted({key.alg for key in self._keys.values() if not key.retiring})
+
+    def jwks(self) -> List[dict]:
+        """Public keys to publish in /jwks.json."""
+        if self._signing_key is None:
+            self.load()
+        return [key.jwk for key in self._keys.values()]
+
+    async def watch(self, interval_seconds: int):
+        """Poll key files and reload them when they change."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def install_signal_handler(self) -> None:
+        """Reload keys on SIGHUP (not available on Windows)."""
+        if not hasattr(signal, "SIGHUP"):
+            return
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.reload)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+
+# Instancia global: las llaves se parsean una vez y se recargan en caliente
+key_ring = KeyRing(settings)
@@ -0,0 +1,55 @@
+import base64
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom para publicar conjuntos de identificadores en poco espacio.
+    Posiciones por doble hash sobre el SHA-256 del valor (UTF-8):
+    h1 = bytes 0-7, h2 = bytes 8-15 (big endian, h2 impar) y la posición i es
+    (h1 + i * h2) mod m. El bit n es el bit (n % 8) del byte n // 8.
+    """
+
+    HASH = "sha256-double"
+
+    def __init__(self, size_bits: int, hash_count: int):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float) -> "BloomFilter":
+        """Smallest filter holding `capacity` items at the false positive rate."""
+        capacity = max(capacity, 1)
+        # Mínimo 1024 bits: con pocos elementos el doble hash en un filtro
+        # diminuto supera por mucho la tasa de falsos positivos pedida
+        size_bits = max(
+            1024, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        )
+        hash_count = max(1, round(-math.log2(fp_rate)))
+        return cls(size_bits, hash_count)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(item)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "hash": self.HASH,
+            "m": self.size_bits,
+            "k": self.hash_count,
+            "bits": base64.urlsafe_b64encode(bytes(self._bits)).decode(),
+        }
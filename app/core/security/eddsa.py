@@ -0,0 +1,116 @@
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+from jose.utils import base64url_decode, base64url_encode
+
+ALGORITHM = "EdDSA"
+
+
+class Ed25519Key(Key):
+    """
+    Llave Ed25519 (RFC 8037) para python-jose, que no soporta EdDSA de forma nativa.
+    Se registra con `jwk.register_key` para que `jwt.encode/decode` la acepten.
+    """
+
+    def __init__(self, key, algorithm):
+        if algorithm != ALGORITHM:
+            raise JWKError(f"{algorithm} is not a valid EdDSA algorithm")
+        self._algorithm = algorithm
+
+        if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            self.prepared_key = key
+            return
+
+        if isinstance(key, dict):
+            self.prepared_key = self._process_jwk(key)
+            return
+
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+
+        if isinstance(key, bytes):
+            try:
+                try:
+                    self.prepared_key = serialization.load_pem_public_key(key)
+                except ValueError:
+                    self.prepared_key = serialization.load_pem_private_key(
+                        key, password=None
+                    )
+            except Exception as e:
+                raise JWKError(e)
+            if not isinstance(
+                self.prepared_key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)
+            ):
+                raise JWKError("Key is not an Ed25519 key")
+            return
+
+        raise JWKError(f"Unable to parse an Ed25519 key from {type(key).__name__}")
+
+    @staticmethod
+    def _process_jwk(jwk_dict):
+        if jwk_dict.get("kty") != "OKP" or jwk_dict.get("crv") != "Ed25519":
+            raise JWKError("Incorrect key type. Expected OKP/Ed25519")
+        if "d" in jwk_dict:
+            return ed25519.Ed25519PrivateKey.from_private_bytes(
+                base64url_decode(jwk_dict["d"].encode("utf-8"))
+            )
+        return ed25519.Ed25519PublicKey.from_public_bytes(
+            base64url_decode(jwk_dict["x"].encode("utf-8"))
+        )
+
+    def is_public(self):
+        return isinstance(self.prepared_key, ed25519.Ed25519PublicKey)
+
+    def sign(self, msg):
+        return self.prepared_key.sign(msg)
+
+    def verify(self, msg, sig):
+        key = self.prepared_key if self.is_public() else self.prepared_key.public_key()
+        try:
+            key.verify(sig, msg)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_key(self):
+        if self.is_public():
+            return self
+        return type(self)(self.prepared_key.public_key(), self._algorithm)
+
+    def to_pem(self):
+        if self.is_public():
+            return self.prepared_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        return self.prepared_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+    def to_dict(self):
+        public = self.public_key().prepared_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw,
+        )
+        data = {
+            "alg": self._algorithm,
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "x": base64url_encode(public).decode("ASCII"),
+        }
+        if not self.is_public():
+            private = self.prepared_key.private_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PrivateFormat.Raw,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+            data["d"] = base64url_encode(private).decode("ASCII")
+        return data
+
+
+jwk.register_key(ALGORITHM, Ed25519Key)
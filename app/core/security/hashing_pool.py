@@ -0,0 +1,159 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+
+from app.core.config import settings
+from app.core.security.password_hasher import PasswordHasher
+from app.exceptions.bussiness_exceptions import PasswordHashingBusyException
+
+
+@dataclass
+class HashingPoolStats:
+    workers: int
+    pending: int
+    completed: int = 0
+    # Rechazadas al estar la cola llena / canceladas tras esperar demasiado
+    rejected: int = 0
+    timed_out: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _process_context():
+    """
+    Start method of the worker processes. `fork` from a multi-threaded server
+    can deadlock the child on locks held by other threads: with `forkserver`
+    the workers are forked from a single-threaded server process that already
+    imported the hasher. `spawn` where forkserver is not available (Windows).
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["app.core.security.password_hasher"])
+    return context
+
+
+class PasswordHashingPool:
+    """
+    Runs PasswordHasher in a pool of worker processes, so hashing a password
+    does not hold the GIL of the worker serving the other requests.
+
+    workers: processes of the pool (0 hashes in the calling thread)
+    max_pending: max calls running or queued; more are rejected right away
+    queue_timeout: max seconds a call waits in the queue before giving up; a
+        call already handed to a worker gets up to another queue_timeout
+    """
+
+    def __init__(
+        self, workers: int = 2, max_pending: int = 32, queue_timeout: float = 5.0
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._stats = HashingPoolStats(workers=workers, pending=0)
+
+    def hash(self, password: str) -> str:
+        return self._run(PasswordHasher.hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._run(PasswordHasher.verify, password, hashed)
+
+    def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        return self._run(PasswordHasher.verify_and_update, password, hashed)
+
+    def start(self) -> None:
+        """Create the process pool (app startup); calls made before start it lazily."""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+
+    def stats(self) -> HashingPoolStats:
+        with self._lock:
+            return HashingPoolStats(**asdict(self._stats))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        with self._lock:
+            if self._stats.pending >= self.max_pending:
+                self._stats.rejected += 1
+                raise PasswordHashingBusyException()
+            if self._executor is None:
+                # Sin start() o tras perder un worker
+                self._executor = self._create_executor()
+            executor = self._executor
+            self._stats.pending += 1
+
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            with self._lock:
+                self._stats.pending -= 1
+            self._discard(executor)
+            raise
+        future.add_done_callback(self._done)
+
+        try:
+            return self._result(future)
+        except BrokenProcessPool:
+            # Un worker murió: el próximo llamado crea un pool nuevo
+            self._discard(executor)
+            raise
+
+    def _result(self, future: Future):
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeoutError:
+            cancelled = future.cancel()
+        if not cancelled:
+            # Ya pasó a la cola de llamadas del pool o está corriendo: no se
+            # puede cancelar, se espera otro queue_timeout como máximo
+            try:
+                return future.result(timeout=self.queue_timeout)
+            except FutureTimeoutError:
+                pass
+        with self._lock:
+            self._stats.timed_out += 1
+        raise PasswordHashingBusyException(
+            "Timed out waiting for a password hashing worker"
+        )
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=_process_context()
+        )
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._stats.pending -= 1
+            if not future.cancelled():
+                self._stats.completed += 1
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Instancia global
+password_hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASHING_WORKERS,
+    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS,
+)
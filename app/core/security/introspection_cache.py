@@ -0,0 +1,94 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.domain.tokens.access_token_claims import AccessTokenClaims
+from app.utils.dates import to_naive_utc
+
+# Valor devuelto por `get` cuando el token no está en caché
+MISS = object()
+
+
+class IntrospectionCache:
+    """
+    Caché en memoria (LRU acotado con TTL) del resultado de introspección de
+    los access tokens opacos, indexado por el SHA-256 del token.
+    Un token activo se guarda como máximo `ttl_seconds` y nunca más allá de su
+    expiración; un token desconocido, revocado o expirado se guarda como
+    inactivo (None) durante `negative_ttl_seconds`.
+    Las revocaciones de este proceso invalidan la entrada al momento; las de
+    otros workers se ven cuando la entrada expira.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 30,
+        negative_ttl_seconds: float = 5,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        # digest -> (monotonic deadline, claims o None)
+        self._entries: "OrderedDict[bytes, Tuple[float, Optional[AccessTokenClaims]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        """Return the cached claims (None = inactive), or MISS."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            deadline, claims = entry
+            if deadline <= time.monotonic():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: Optional[AccessTokenClaims]) -> None:
+        """Cache an introspection result, capped at the token's own expiry."""
+        if claims is None:
+            ttl = self.negative_ttl_seconds
+        else:
+            remaining = (
+                to_naive_utc(claims.expires_at) - datetime.utcnow()
+            ).total_seconds()
+            ttl = min(self.ttl_seconds, remaining)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Drop the cached result of a token (e.g. right after revoking it)."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Instancia global (en memoria, por proceso)
+introspection_cache = IntrospectionCache(
+    max_entries=settings.INTROSPECTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.INTROSPECTION_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.INTROSPECTION_CACHE_NEGATIVE_TTL_SECONDS,
+)
@@ -0,0 +1,55 @@
+import time
+from typing import Optional
+
+from jose import jwt
+
+from app.core.config import Settings, settings
+from app.core.key_ring import KeyRing, key_ring
+from app.domain.tokens.token_response import InstrospectResponse
+
+
+class IntrospectionResponseSigner:
+    """
+    Firma respuestas de introspección como JWT (RFC 9701) con las llaves del
+    key ring, para que los resource servers las verifiquen con `/jwks.json` y
+    las reutilicen hasta `exp`, que nunca pasa de la expiración del token.
+    """
+
+    MEDIA_TYPE = "application/token-introspection+jwt"
+    TOKEN_TYPE = "token-introspection+jwt"
+
+    def __init__(self, settings: Settings, key_ring: KeyRing):
+        self.settings = settings
+        self.key_ring = key_ring
+
+    def max_age(self, response: InstrospectResponse) -> int:
+        """Seconds a resource server may cache the response."""
+        if not response.active:
+            return int(self.settings.INTROSPECTION_CACHE_NEGATIVE_TTL_SECONDS)
+        remaining = (response.exp or 0) - int(time.time())
+        return max(0, min(self.settings.INTROSPECTION_JWT_TTL_SECONDS, remaining))
+
+    def encode(
+        self, response: InstrospectResponse, audience: Optional[str] = None
+    ) -> str:
+        """Sign the introspection response with the current signing key."""
+        signing_key = self.key_ring.signing_key
+        now = int(time.time())
+        payload = {
+            "iss": self.settings.BASE_URL,
+            "iat": now,
+            "exp": now + self.max_age(response),
+            "token_introspection": response.to_dict(),
+        }
+        if audience:
+            payload["aud"] = audience
+        return jwt.encode(
+            payload,
+            signing_key.private_key,
+            algorithm=signing_key.alg,
+            headers={"typ": self.TOKEN_TYPE, "kid": signing_key.kid},
+        )
+
+
+# Instancia global
+introspection_response_signer = IntrospectionResponseSigner(settings, key_ring)
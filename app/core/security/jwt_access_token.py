@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from jose import JWTError, jwt
+
+from app.core.config import Settings, settings
+from app.core.key_ring import KeyRing, key_ring
+from app.domain.tokens.access_token_claims import AccessTokenClaims
+
+
+def is_jwt(token: str) -> bool:
+    """Check if a token has the compact JWS shape (header.payload.signature)."""
+    return token.count(".") == 2
+
+
+class JWTAccessTokenCodec:
+    """
+    Emite y verifica access tokens autocontenidos (JWT firmados, RFC 9068)
+    con las llaves del key ring.
+    """
+
+    TOKEN_TYPE = "at+jwt"
+
+    def __init__(self, settings: Settings, key_ring: KeyRing):
+        self.settings = settings
+        self.key_ring = key_ring
+
+    def encode(self, claims: AccessTokenClaims) -> str:
+        """Sign the access token claims with the current signing key."""
+        signing_key = self.key_ring.signing_key
+        payload = claims.to_dict()
+        payload["iss"] = self.settings.BASE_URL
+        payload["iat"] = int(datetime.now(timezone.utc).timestamp())
+        return jwt.encode(
+            payload,
+            signing_key.private_key,
+            algorithm=signing_key.alg,
+            headers={"typ": self.TOKEN_TYPE, "kid": signing_key.kid},
+        )
+
+    def decode(self, token: str) -> Optional[AccessTokenClaims]:
+        """Verify signature, issuer and expiration locally. Returns None if invalid."""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = self.key_ring.get(kid)
+            if not key:
+                return None
+            payload = jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.alg],
+                issuer=self.settings.BASE_URL,
+                options={"verify_aud": False},
+            )
+            return AccessTokenClaims(
+                jti=payload["jti"],
+                user_id=UUID(payload["sub"]),
+                client_id=payload["client_id"],
+                scope=payload.get("scope", "").split(),
+                expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                issued_at=(
+                    datetime.fromtimestamp(payload["iat"], tz=timezone.utc)
+                    if "iat" in payload
+                    else None
+                ),
+                authz=payload.get("authz"),
+            )
+        except (JWTError, KeyError, ValueError):
+            return None
+
+
+# Instancia global
+jwt_access_token_codec = JWTAccessTokenCodec(settings, key_ring)
@@ -0,0 +1,293 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.exceptions.bussiness_exceptions import LoginThrottledException
+
+
+class SlidingWindowStore:
+    """
+    Contadores de ventana deslizante en memoria, acotados a `max_entries`
+    claves (se descarta la usada hace más tiempo). Cada clave guarda la cuenta
+    de la ventana fija actual y la anterior; la cuenta deslizante pondera la
+    anterior por la fracción de ella que aún cae dentro de la ventana.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        # key -> [bucket, current, previous, last hit]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window: float, now: float) -> Tuple[float, Optional[float]]:
+        """Count a hit; return the new sliding count and the previous last hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [int(now // window), 0, 0, None]
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                self._roll(entry, window, now)
+            previous_last = entry[3]
+            entry[1] += 1
+            entry[3] = now
+            return _weighted(entry[1], entry[2], window, now), previous_last
+
+    def release(
+        self, key: str, window: float, at: float, previous_last: Optional[float]
+    ) -> None:
+        """Undo the hit made at `at` (the last hit is restored if still `at`)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            bucket = int(at // window)
+            if entry[0] == bucket and entry[1] > 0:
+                entry[1] -= 1
+            elif entry[0] == bucket + 1 and entry[2] > 0:
+                entry[2] -= 1
+            if entry[3] == at:
+                entry[3] = previous_last
+
+    def reset(self, key: str, window: float, now: float) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _roll(entry: list, window: float, now: float) -> None:
+        bucket = int(now // window)
+        if bucket == entry[0]:
+            return
+        entry[2] = entry[1] if bucket == entry[0] + 1 else 0
+        entry[0], entry[1] = bucket, 0
+
+
+class RedisSlidingWindowStore:
+    """Mismos contadores compartidos entre workers: una clave por ventana fija
+    (INCR + EXPIRE) y otra con el último intento."""
+
+    def __init__(self, client, prefix: str = "idp:login:"):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key: str, window: float, now: float) -> Tuple[float, Optional[float]]:
+        bucket = int(now // window)
+        ttl = int(2 * window) + 1
+        # MULTI/EXEC: la cuenta y el último intento anterior son de este hit
+        pipe = self.client.pipeline()
+        pipe.incr(self._bucket(key, bucket))
+        pipe.expire(self._bucket(key, bucket), ttl)
+        pipe.get(self._bucket(key, bucket - 1))
+        pipe.set(self._last(key), repr(now), ex=ttl, get=True)
+        current, _, previous, last = pipe.execute()
+        count = _weighted(int(current), max(int(previous or 0), 0), window, now)
+        return count, float(last) if last is not None else None
+
+    def release(
+        self, key: str, window: float, at: float, previous_last: Optional[float]
+    ) -> None:
+        from redis.exceptions import WatchError
+
+        bucket_key = self._bucket(key, int(at // window))
+        if self.client.decr(bucket_key) < 0:
+            # La clave ya no existía (reset o expirada): no dejar cuentas negativas
+            self.client.delete(bucket_key)
+        last_key = self._last(key)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(last_key)
+                last = pipe.get(last_key)
+                if last is None or float(last) != at:
+                    return
+                pipe.multi()
+                if previous_last is None:
+                    pipe.delete(last_key)
+                else:
+                    pipe.set(last_key, repr(previous_last), keepttl=True)
+                pipe.execute()
+            except WatchError:
+                # Otro intento escribió después: su último intento se conserva
+                pass
+
+    def reset(self, key: str, window: float, now: float) -> None:
+        bucket = int(now // window)
+        self.client.delete(
+            self._bucket(key, bucket), self._bucket(key, bucket - 1), self._last(key)
+        )
+
+    def _bucket(self, key: str, bucket: int) -> str:
+        return f"{self.prefix}{key}:{bucket}"
+
+    def _last(self, key: str) -> str:
+        return f"{self.prefix}{key}:last"
+
+
+def _weighted(current: int, previous: int, window: float, now: float) -> float:
+    elapsed = (now % window) / window
+    return current + previous * (1 - elapsed)
+
+
+@dataclass(frozen=True)
+class ThrottleRule:
+    """
+    Failed logins counted over `window` seconds. Up to `free_failures` no
+    delay; then each new attempt must wait `base_delay` seconds after the last
+    failure, doubling per failure up to `max_delay`. From `lockout_failures`
+    every attempt is rejected until the failures leave the window.
+    """
+
+    window: float
+    free_failures: int
+    lockout_failures: int
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def retry_after(self, failures: float, last: Optional[float], now: float) -> float:
+        if last is None or failures <= self.free_failures:
+            return 0.0
+        if self.lockout_failures and failures >= self.lockout_failures:
+            return max(last + self.window - now, 1.0)
+        exponent = int(failures) - self.free_failures - 1
+        delay = min(self.base_delay * 2**exponent, self.max_delay)
+        return max(last + delay - now, 0.0)
+
+
+@dataclass(frozen=True)
+class LoginAttempt:
+    """Intento reservado por LoginThrottle.check en los contadores de fallos."""
+
+    username_key: str
+    ip_key: Optional[str]
+    at: float
+    # Último intento de cada clave antes de la reserva, para deshacerla
+    username_last: Optional[float]
+    ip_last: Optional[float]
+
+
+class LoginThrottle:
+    """
+    Decide si un intento de login se atiende antes de verificar la contraseña,
+    con fallos recientes por username y por IP y un tope global de intentos
+    por segundo (0 lo desactiva).
+    Cada intento atendido se cuenta como fallo antes de verificar la
+    contraseña: los intentos en paralelo ven los anteriores aunque aún no
+    terminen, y el retraso aplica también dentro de una ráfaga.
+    """
+
+    def __init__(
+        self,
+        store,
+        username_rule: ThrottleRule,
+        ip_rule: ThrottleRule,
+        global_max_per_second: int = 0,
+    ):
+        self.store = store
+        self.username_rule = username_rule
+        self.ip_rule = ip_rule
+        self.global_max_per_second = global_max_per_second
+
+    def check(self, username: str, ip: Optional[str]) -> LoginAttempt:
+        """
+        Reserve the attempt as a failure of its username and IP, or raise
+        LoginThrottledException (without counting it) if it must not be
+        verified. Report the outcome with `succeeded` or `release`.
+        """
+        now = time.time()
+        username_key = f"user:{username.lower()}"
+        ip_key = f"ip:{ip}" if ip else None
+        retry_after, username_last = self._reserve(
+            username_key, self.username_rule, now
+        )
+        ip_last = None
+        if ip_key:
+            ip_retry_after, ip_last = self._reserve(ip_key, self.ip_rule, now)
+            retry_after = max(retry_after, ip_retry_after)
+
+        attempt = LoginAttempt(username_key, ip_key, now, username_last, ip_last)
+        if retry_after > 0:
+            self.release(attempt)
+            raise LoginThrottledException(retry_after)
+
+        # El tope global solo cuenta los intentos que llegan a verificarse
+        if self.global_max_per_second:
+            count, last = self.store.hit("global", 1, now)
+            if count > self.global_max_per_second:
+                self.store.release("global", 1, now, last)
+                self.release(attempt)
+                raise LoginThrottledException(1)
+        return attempt
+
+    def succeeded(self, attempt: LoginAttempt) -> None:
+        # Se limpian los fallos del username, pero no los de la IP: un atacante
+        # con una contraseña válida no los borra. Solo se quita esta reserva.
+        self.store.reset(attempt.username_key, self.username_rule.window, attempt.at)
+        if attempt.ip_key:
+            self.store.release(
+                attempt.ip_key, self.ip_rule.window, attempt.at, attempt.ip_last
+            )
+
+    def release(self, attempt: LoginAttempt) -> None:
+        """Undo the reservation of an attempt that was not verified."""
+        self.store.release(
+            attempt.username_key,
+            self.username_rule.window,
+            attempt.at,
+            attempt.username_last,
+        )
+        if attempt.ip_key:
+            self.store.release(
+                attempt.ip_key, self.ip_rule.window, attempt.at, attempt.ip_last
+            )
+
+    def _reserve(
+        self, key: str, rule: ThrottleRule, now: float
+    ) -> Tuple[float, Optional[float]]:
+        """Count the attempt; return its retry-after (judged on the failures
+        before it) and the previous last failure."""
+        count, last = self.store.hit(key, rule.window, now)
+        return rule.retry_after(count - 1, last, now), last
+
+    @classmethod
+    def from_settings(cls) -> "LoginThrottle":
+        if settings.LOGIN_THROTTLE_BACKEND == "redis":
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "LOGIN_THROTTLE_BACKEND=redis requires the `redis` package"
+                ) from e
+            store = RedisSlidingWindowStore(redis.Redis.from_url(settings.REDIS_URL))
+        else:
+            store = SlidingWindowStore(settings.LOGIN_THROTTLE_MAX_ENTRIES)
+        delays = {
+            "base_delay": settings.LOGIN_THROTTLE_BASE_DELAY_SECONDS,
+            "max_delay": settings.LOGIN_THROTTLE_MAX_DELAY_SECONDS,
+        }
+        return cls(
+            store,
+            username_rule=ThrottleRule(
+                window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+                free_failures=settings.LOGIN_THROTTLE_USERNAME_FREE_FAILURES,
+                lockout_failures=settings.LOGIN_THROTTLE_USERNAME_LOCKOUT_FAILURES,
+                **delays,
+            ),
+            ip_rule=ThrottleRule(
+                window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+                free_failures=settings.LOGIN_THROTTLE_IP_FREE_FAILURES,
+                lockout_failures=settings.LOGIN_THROTTLE_IP_LOCKOUT_FAILURES,
+                **delays,
+            ),
+            global_max_per_second=settings.LOGIN_THROTTLE_GLOBAL_MAX_PER_SECOND,
+        )
+
+
+# Instancia global
+login_throttle = LoginThrottle.from_settings()
@@ -1,11 +1,45 @@
-from passlib.hash import pbkdf2_sha256
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# Esquemas que se pueden verificar; solo `default` se usa para hashes nuevos
+PASSWORD_SCHEMES = ["argon2", "pbkdf2_sha256"]
+
+
+def build_password_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    time_cost: int = settings.ARGON2_TIME_COST,
+    memory_cost: int = settings.ARGON2_MEMORY_COST_KIB,
+    parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    Hashes with `scheme` (argon2id by default). Hashes of other schemes or with
+    other argon2 parameters still verify and are reported as needing a rehash.
+    """
+    return CryptContext(
+        schemes=PASSWORD_SCHEMES,
+        default=scheme,
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
 
 
 class PasswordHasher:
+    context = build_password_context()
+
     @staticmethod
     def hash(password: str) -> str:
-        return pbkdf2_sha256.hash(password)
+        return PasswordHasher.context.hash(password)
 
     @staticmethod
     def verify(password: str, hashed: str) -> bool:
-        return pbkdf2_sha256.verify(password, hashed)
+        return PasswordHasher.context.verify(password, hashed)
+
+    @staticmethod
+    def verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+        """Verify the password; the new hash is returned when `hashed` uses an
+        outdated scheme or parameters, None otherwise."""
+        return PasswordHasher.context.verify_and_update(password, hashed)
@@ -0,0 +1,48 @@
+import heapq
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+class ReplayCache:
+    """
+    Conjunto en memoria de identificadores (jti) ya usados, cada uno guardado
+    solo hasta que expira el valor que identifica. Sirve para que un valor
+    autocontenido (p. ej. un authorization code sellado) se acepte una sola vez.
+    """
+
+    def __init__(self):
+        self._seen: Dict[bytes, datetime] = {}
+        self._expiry: List[Tuple[datetime, bytes]] = []
+        self._lock = threading.Lock()
+
+    def add(self, jti: bytes, expires_at: datetime) -> bool:
+        """Mark an identifier as used; False if it was already used."""
+        with self._lock:
+            now = datetime.utcnow()
+            while self._expiry and self._expiry[0][0] <= now:
+                _, expired = heapq.heappop(self._expiry)
+                self._seen.pop(expired, None)
+            if jti in self._seen:
+                return False
+            self._seen[jti] = expires_at
+            heapq.heappush(self._expiry, (expires_at, jti))
+            return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class RedisReplayCache:
+    """Replay cache compartido entre workers: SET NX con expiración (Redis)."""
+
+    def __init__(self, client, prefix: str = "idp:jti:"):
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, jti: bytes, expires_at: datetime) -> bool:
+        """Mark an identifier as used; False if it was already used."""
+        ttl_ms = int((expires_at - datetime.utcnow()).total_seconds() * 1000)
+        if ttl_ms <= 0:
+            return False
+        return bool(self.client.set(self.prefix + jti.hex(), 1, px=ttl_ms, nx=True))
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+
+class RevocationList:
+    """
+    Lista en memoria de identificadores (jti) de access tokens revocados.
+    Solo guarda tokens aún vigentes, así que su tamaño está acotado por la
+    ventana de expiración de los access tokens.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, datetime] = {}
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # La BD guarda fechas sin zona horaria (UTC)
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Mark a token identifier as revoked until it expires."""
+        self._revoked[jti] = self._as_utc(expires_at)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check if a token identifier has been revoked."""
+        return jti in self._revoked
+
+    def replace(self, entries: Iterable[Tuple[str, datetime]]) -> None:
+        """Replace the whole list with a fresh snapshot (e.g. from the DB)."""
+        self._revoked = {jti: self._as_utc(exp) for jti, exp in entries}
+
+    def prune(self) -> None:
+        """Remove identifiers whose token has already expired."""
+        now = datetime.now(timezone.utc)
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# Instancia global (en memoria)
+revocation_list = RevocationList()
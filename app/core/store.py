@@ -1,6 +1,9 @@
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Optional
+import heapq
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 
@@ -19,15 +22,55 @@ class AuthorizationCode:
         """Verifica si el código ha expirado."""
         return datetime.utcnow() > self.expires_at
 
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "client_id": self.client_id,
+            "redirect_uri": self.redirect_uri,
+            "code_challenge": self.code_challenge,
+            "user_id": str(self.user_id),
+            "expires_at": self.expires_at.isoformat(),
+            "scope": self.scope,
+        }
 
-class AuthorizationCodeStore:
+    @classmethod
+    def from_dict(cls, data: dict) -> "AuthorizationCode":
+        return cls(
+            code=data["code"],
+            client_id=data["client_id"],
+            redirect_uri=data["redirect_uri"],
+            code_challenge=data["code_challenge"],
+            user_id=UUID(data["user_id"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            scope=data["scope"],
+        )
+
+
+@dataclass
+class AuthorizationCodeStoreStats:
+    # None si el backend no puede contar sus entradas sin recorrerlas
+    size: Optional[int] = 0
+    hits: int = 0
+    misses: int = 0
+    # códigos eliminados por expirar sin canjearse
+    expired: int = 0
+    # códigos descartados por alcanzar el límite de entradas
+    evicted: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class BaseAuthorizationCodeStore(ABC):
     """
-    Almacén en memoria para los códigos de autorización.
-    Puede reemplazarse fácilmente por una implementación persistente (Redis, DB, etc.)
+    API común de los almacenes de códigos de autorización. `validate` obtiene y
+    elimina el código de forma atómica: un código solo se canjea una vez,
+    aunque dos workers lo reciban al mismo tiempo.
     """
 
-    def __init__(self):
-        self._store: Dict[str, AuthorizationCode] = {}
+    def __init__(self, default_ttl_seconds: int = 600):
+        self.default_ttl_seconds = default_ttl_seconds
+        self._stats = AuthorizationCodeStoreStats()
 
     def save(
         self,
@@ -47,25 +90,104 @@ class AuthorizationCodeStore:
             code_challenge=code_challenge,
             user_id=user_id,
             scope=scope or ["openid"],
-            expires_at=expires_at,
+            expires_at=expires_at
+            or datetime.utcnow() + timedelta(seconds=self.default_ttl_seconds),
         )
-        self._store[code] = auth_code
+        self._put(auth_code)
         return auth_code
 
     def validate(self, code: str) -> Optional[AuthorizationCode]:
         """Valida un código y lo elimina si es válido o expiró."""
-        auth_code = self._store.get(code)
-        if not auth_code:
+        # Código válido, eliminar tras el uso (como exige OAuth2)
+        auth_code = self._take(code)
+        if not auth_code or auth_code.is_expired:
+            self._stats.misses += 1
             return None
+        self._stats.hits += 1
+        return auth_code
 
-        if auth_code.is_expired:
-            del self._store[code]
-            return None
+    def stats(self) -> AuthorizationCodeStoreStats:
+        """Get the current size and the hit, miss and eviction counters."""
+        return replace(self._stats, size=self._size())
 
-        # Código válido, eliminar tras el uso (como exige OAuth2)
-        del self._store[code]
-        return auth_code
+    @abstractmethod
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        """Store a code until it expires."""
+
+    @abstractmethod
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        """Atomically get and delete a code."""
+
+    @abstractmethod
+    def _size(self) -> Optional[int]:
+        """Number of codes not yet expired, if the backend can count them."""
+
+
+class AuthorizationCodeStore(BaseAuthorizationCodeStore):
+    """
+    Almacén en memoria para los códigos de autorización (un solo proceso).
+    Los códigos expirados se eliminan en cada operación (heap por expires_at),
+    aunque nunca se canjeen, y el número de entradas está acotado: al llegar a
+    `max_entries` se descarta el código más próximo a expirar.
+    Con varios workers usar un backend compartido (app.core.code_store).
+    """
+
+    def __init__(self, max_entries: int = 100_000, default_ttl_seconds: int = 600):
+        super().__init__(default_ttl_seconds)
+        # Sin espacio para ningún código, _put no podría hacer lugar nunca
+        if max_entries < 1:
+            raise ValueError(
+                f"AUTHORIZATION_CODE_MAX_ENTRIES must be at least 1, got {max_entries}"
+            )
+        self.max_entries = max_entries
+        self._store: Dict[str, AuthorizationCode] = {}
+        # (expires_at, code); las entradas de códigos ya canjeados se ignoran
+        self._expiry: List[Tuple[datetime, str]] = []
+        self._lock = threading.Lock()
+
+    def _put(self, auth_code: AuthorizationCode) -> None:
+        with self._lock:
+            self._evict_expired()
+            while len(self._store) >= self.max_entries:
+                self._evict_next()
+            self._store[auth_code.code] = auth_code
+            heapq.heappush(self._expiry, (auth_code.expires_at, auth_code.code))
+            self._compact()
+
+    def _take(self, code: str) -> Optional[AuthorizationCode]:
+        with self._lock:
+            self._evict_expired()
+            return self._store.pop(code, None)
+
+    def _size(self) -> int:
+        with self._lock:
+            self._evict_expired()
+            return len(self._store)
+
+    def _is_current(self, expires_at: datetime, code: str) -> bool:
+        auth_code = self._store.get(code)
+        return auth_code is not None and auth_code.expires_at == expires_at
+
+    def _evict_expired(self) -> None:
+        now = datetime.utcnow()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, code = heapq.heappop(self._expiry)
+            if self._is_current(expires_at, code):
+                del self._store[code]
+                self._stats.expired += 1
 
+    def _evict_next(self) -> None:
+        """Drop the code closest to expiry to make room for a new one."""
+        while self._expiry:
+            expires_at, code = heapq.heappop(self._expiry)
+            if self._is_current(expires_at, code):
+                del self._store[code]
+                self._stats.evicted += 1
+                return
 
-# Instancia global (en memoria)
-authorization_code_store = AuthorizationCodeStore()
+    def _compact(self) -> None:
+        # Los códigos canjeados dejan su entrada en el heap hasta que expira;
+        # se reconstruye si las entradas obsoletas superan a las vigentes
+        if len(self._expiry) > 2 * max(len(self._store), 1024):
+            self._expiry = [(c.expires_at, c.code) for c in self._store.values()]
+            heapq.heapify(self._expiry)
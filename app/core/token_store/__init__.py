@@ -0,0 +1,27 @@
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.token_store.async_store import AsyncTokenStore, get_async_token_store
+from app.core.token_store.base import TokenStore
+from app.core.token_store.memory_store import MemoryTokenStore, memory_token_store
+from app.core.token_store.redis_store import RedisTokenStore, redis_token_store
+from app.core.token_store.sql_store import SqlTokenStore
+
+__all__ = [
+    "AsyncTokenStore",
+    "MemoryTokenStore",
+    "RedisTokenStore",
+    "SqlTokenStore",
+    "TokenStore",
+    "get_async_token_store",
+    "get_token_store",
+]
+
+
+def get_token_store(session: Session) -> TokenStore:
+    """Token store selected by TOKEN_STORE_BACKEND ("sql", "memory" or "redis")."""
+    if settings.TOKEN_STORE_BACKEND == "memory":
+        return memory_token_store
+    if settings.TOKEN_STORE_BACKEND == "redis":
+        return redis_token_store()
+    return SqlTokenStore(session)
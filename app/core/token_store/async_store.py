@@ -0,0 +1,194 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.token_store.base import RevokedAccessTokens, TokenStore
+from app.core.token_store.memory_store import memory_token_store
+from app.core.token_store.redis_store import redis_token_store
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.repositories.async_access_token_repository import (
+    AsyncAccessTokenRepository,
+)
+from app.repositories.async_refresh_token_repository import (
+    AsyncRefreshTokenRepository,
+)
+from app.repositories.async_revocation_event_repository import (
+    AsyncRevocationEventRepository,
+)
+
+
+class AsyncTokenStore(ABC):
+    """
+    Subconjunto async de TokenStore usado por AsyncTokenService: emisión,
+    rotación, introspección y revocación de un token. Las revocaciones en
+    bloque y el feed siguen en la ruta sync.
+    """
+
+    @abstractmethod
+    async def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        """Store a new refresh token."""
+
+    @abstractmethod
+    async def add_access_token(self, at: AccessToken) -> AccessToken:
+        """Store a new access token."""
+
+    @abstractmethod
+    async def get_access_token(self, token: str) -> AccessToken | None:
+        """Get an access token (active or not) by its value."""
+
+    @abstractmethod
+    async def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        """Get several access tokens (active or not) in one round trip, by value."""
+
+    @abstractmethod
+    async def get_refresh_token(self, token: str) -> RefreshToken | None:
+        """Get a refresh token (active or not) by its value."""
+
+    @abstractmethod
+    async def claim_refresh_token(
+        self, token: str, client_id: str
+    ) -> RefreshToken | None:
+        """Atomically revoke an active refresh token for rotation (compare-and-swap)."""
+
+    @abstractmethod
+    async def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        """Link a rotated refresh token to the one that replaced it."""
+
+    @abstractmethod
+    async def revoke_access_token(self, at: AccessToken) -> None:
+        """Revoke a single access token."""
+
+    @abstractmethod
+    async def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        """Revoke the active access tokens issued with a refresh token."""
+
+    @abstractmethod
+    async def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        """Revoke a refresh token lineage (or the part issued after
+        `issued_after`) and its access tokens."""
+
+    @abstractmethod
+    async def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        """Append revoked JWT access tokens to the revocation feed."""
+
+
+class AsyncSqlTokenStore(AsyncTokenStore):
+    """Tokens en la base de datos a través de los repositorios async."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.at_repo = AsyncAccessTokenRepository(session)
+        self.rt_repo = AsyncRefreshTokenRepository(session)
+        self.event_repo = AsyncRevocationEventRepository(session)
+
+    async def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        return self.rt_repo.create(rt)
+
+    async def add_access_token(self, at: AccessToken) -> AccessToken:
+        return self.at_repo.create(at)
+
+    async def get_access_token(self, token: str) -> AccessToken | None:
+        return await self.at_repo.get(token)
+
+    async def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        return {at.token: at for at in await self.at_repo.get_many(tokens)}
+
+    async def get_refresh_token(self, token: str) -> RefreshToken | None:
+        return await self.rt_repo.get(token)
+
+    async def claim_refresh_token(
+        self, token: str, client_id: str
+    ) -> RefreshToken | None:
+        return await self.rt_repo.claim(token, client_id)
+
+    async def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        await self.rt_repo.set_replaced_by(old_id, new_id)
+
+    async def revoke_access_token(self, at: AccessToken) -> None:
+        self.at_repo.revoke(at)
+
+    async def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        return await self.at_repo.revoke_by_refresh(refresh_id)
+
+    async def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        refresh_count = await self.rt_repo.revoke_family(family_id, issued_after)
+        return (
+            await self.at_repo.revoke_by_family(family_id, issued_after),
+            refresh_count,
+        )
+
+    async def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        self.event_repo.add_many(access_tokens)
+
+
+class SyncTokenStoreAdapter(AsyncTokenStore):
+    """
+    Expone un TokenStore sync (memoria o Redis) a AsyncTokenService. Con
+    `offload` cada llamada corre en un hilo del pool para no bloquear el event
+    loop mientras espera la red; el store en memoria se llama directamente.
+    """
+
+    def __init__(self, store: TokenStore, offload: bool):
+        self.store = store
+        self.offload = offload
+
+    async def _call(self, method: str, *args):
+        fn = getattr(self.store, method)
+        if self.offload:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        return await self._call("add_refresh_token", rt)
+
+    async def add_access_token(self, at: AccessToken) -> AccessToken:
+        return await self._call("add_access_token", at)
+
+    async def get_access_token(self, token: str) -> AccessToken | None:
+        return await self._call("get_access_token", token)
+
+    async def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        return await self._call("get_access_tokens", tokens)
+
+    async def get_refresh_token(self, token: str) -> RefreshToken | None:
+        return await self._call("get_refresh_token", token)
+
+    async def claim_refresh_token(
+        self, token: str, client_id: str
+    ) -> RefreshToken | None:
+        return await self._call("claim_refresh_token", token, client_id)
+
+    async def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        await self._call("set_replaced_by", old_id, new_id)
+
+    async def revoke_access_token(self, at: AccessToken) -> None:
+        await self._call("revoke_access_token", at)
+
+    async def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        return await self._call("revoke_by_refresh", refresh_id)
+
+    async def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        return await self._call("revoke_family", family_id, issued_after)
+
+    async def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        await self._call("record_revocations", access_tokens)
+
+
+def get_async_token_store(session: AsyncSession) -> AsyncTokenStore:
+    """Async token store selected by TOKEN_STORE_BACKEND."""
+    if settings.TOKEN_STORE_BACKEND == "memory":
+        return SyncTokenStoreAdapter(memory_token_store, offload=False)
+    if settings.TOKEN_STORE_BACKEND == "redis":
+        return SyncTokenStoreAdapter(redis_token_store(), offload=True)
+    return AsyncSqlTokenStore(session)
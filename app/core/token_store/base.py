@@ -0,0 +1,123 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.models.access_token import AccessToken
+from app.models.client_application import ClientApplication
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+# (token, expires_at) de access tokens revocados, para la deny-list de JWT
+RevokedAccessTokens = list[tuple[str, datetime]]
+# (versión, jti) del feed de revocaciones
+RevocationEvents = list[tuple[int, str]]
+
+
+class TokenStore(ABC):
+    """
+    Almacén de access y refresh tokens usado por TokenService.
+    La implementación SQL participa en la transacción de la sesión (unidad de
+    trabajo); las implementaciones en memoria y Redis aplican cada cambio de
+    inmediato y expiran los tokens por TTL, sin necesidad de limpieza.
+    """
+
+    @abstractmethod
+    def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        """Store a new refresh token."""
+
+    @abstractmethod
+    def add_access_token(self, at: AccessToken) -> AccessToken:
+        """Store a new access token."""
+
+    @abstractmethod
+    def get_access_token(self, token: str) -> AccessToken | None:
+        """Get an access token (active or not) by its value."""
+
+    @abstractmethod
+    def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        """Get several access tokens (active or not) in one round trip, by value.
+        Unknown tokens are left out."""
+
+    @abstractmethod
+    def get_refresh_token(self, token: str) -> RefreshToken | None:
+        """Get a refresh token (active or not) by its value."""
+
+    @abstractmethod
+    def claim_refresh_token(self, token: str, client_id: str) -> RefreshToken | None:
+        """Atomically revoke an active refresh token for rotation (compare-and-swap).
+        Only one of several concurrent callers gets the token back."""
+
+    @abstractmethod
+    def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        """Link a rotated refresh token to the one that replaced it."""
+
+    @abstractmethod
+    def revoke_access_token(self, at: AccessToken) -> None:
+        """Revoke a single access token."""
+
+    @abstractmethod
+    def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        """Revoke the access tokens issued with a refresh token."""
+
+    @abstractmethod
+    def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        """Revoke a refresh token lineage and its access tokens; with
+        `issued_after`, only the refresh tokens created after it (the rotations
+        that followed a token). Returns the revoked access tokens and the
+        number of refresh tokens."""
+
+    @abstractmethod
+    def revoke_by_user(self, user_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        """Revoke every token of a user."""
+
+    @abstractmethod
+    def revoke_access_by_user(self, user_id: UUID) -> RevokedAccessTokens:
+        """Revoke the access tokens of a user, keeping its refresh tokens."""
+
+    @abstractmethod
+    def clear_authz(self, user_id: UUID) -> list[str]:
+        """Drop the authz claim stored with a user's active access tokens.
+        Returns the tokens that had one."""
+
+    @abstractmethod
+    def revoke_by_client(self, client_id: str) -> tuple[RevokedAccessTokens, int]:
+        """Revoke every token issued to a client application."""
+
+    @abstractmethod
+    def revoke_by_tenant(self, tenant_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        """Revoke every token of the users and client applications of a tenant."""
+
+    @abstractmethod
+    def list_revoked_access_tokens(self) -> RevokedAccessTokens:
+        """List revoked access tokens that have not expired."""
+
+    @abstractmethod
+    def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        """Append revoked JWT access tokens (jti, expires_at) to the revocation
+        feed; each one gets the next version."""
+
+    @abstractmethod
+    def list_revocation_events(self, after: int, limit: int) -> RevocationEvents:
+        """List (version, jti) of unexpired revocations after a version, in order."""
+
+    @abstractmethod
+    def revocation_feed_version(self) -> int:
+        """Latest version of the revocation feed (0 if empty)."""
+
+
+def load_tenant_members(tenant_id: UUID) -> tuple[list[UUID], list[str]]:
+    """Get the user ids and client ids of a tenant (they always live in the DB).
+    Used by the stores that cannot join against the users and clients tables."""
+    with Session(engine) as session:
+        user_ids = session.exec(select(User.id).where(User.tenant_id == tenant_id))
+        client_ids = session.exec(
+            select(ClientApplication.client_id).where(
+                ClientApplication.tenant_id == str(tenant_id)
+            )
+        )
+        return list(user_ids), list(client_ids)
@@ -0,0 +1,246 @@
+import bisect
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable
+from uuid import UUID
+
+from app.core.token_store.base import (
+    RevocationEvents,
+    RevokedAccessTokens,
+    TokenStore,
+    load_tenant_members,
+)
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.utils.dates import to_naive_utc
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Tokens en la memoria del proceso, eliminados al expirar (heap por expires_at).
+    Las fechas se guardan como UTC sin zona horaria, igual que en la BD.
+    Pensado para despliegues de un solo nodo y pruebas: no se comparte entre
+    workers y se pierde al reiniciar.
+    """
+
+    def __init__(
+        self,
+        tenant_members: Callable[
+            [UUID], tuple[list[UUID], list[str]]
+        ] = load_tenant_members,
+    ):
+        self.tenant_members = tenant_members
+        self._lock = threading.RLock()
+        self._access: dict[str, AccessToken] = {}
+        self._refresh: dict[str, RefreshToken] = {}
+        self._refresh_by_id: dict[UUID, RefreshToken] = {}
+        # Índices para las revocaciones frecuentes (rotación y reuse)
+        self._access_by_refresh: dict[UUID, set[str]] = defaultdict(set)
+        self._family: dict[UUID, set[str]] = defaultdict(set)
+        # (expires_at, secuencia, tipo, token)
+        self._expiry: list[tuple[datetime, int, str, str]] = []
+        self._sequence = itertools.count()
+        # Feed de revocaciones: (versión, jti, expires_at) en orden de versión
+        self._events: list[tuple[int, str, datetime]] = []
+        self._version = 0
+
+    def _evict(self) -> None:
+        """Remove every token whose expiry has passed."""
+        now = datetime.utcnow()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, kind, token = heapq.heappop(self._expiry)
+            if kind == "access":
+                at = self._access.pop(token, None)
+                if at and at.refresh_token_id:
+                    self._discard(self._access_by_refresh, at.refresh_token_id, token)
+            else:
+                rt = self._refresh.pop(token, None)
+                if rt:
+                    self._refresh_by_id.pop(rt.id, None)
+                    self._discard(self._family, rt.family_id or rt.id, token)
+
+    @staticmethod
+    def _discard(index: dict, key, token: str) -> None:
+        tokens = index.get(key)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del index[key]
+
+    def _schedule(self, expires_at: datetime, kind: str, token: str) -> None:
+        heapq.heappush(self._expiry, (expires_at, next(self._sequence), kind, token))
+
+    def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        rt.expires_at = to_naive_utc(rt.expires_at)
+        with self._lock:
+            self._evict()
+            self._refresh[rt.token] = rt
+            self._refresh_by_id[rt.id] = rt
+            self._family[rt.family_id or rt.id].add(rt.token)
+            self._schedule(rt.expires_at, "refresh", rt.token)
+        return rt
+
+    def add_access_token(self, at: AccessToken) -> AccessToken:
+        at.expires_at = to_naive_utc(at.expires_at)
+        with self._lock:
+            self._evict()
+            self._access[at.token] = at
+            if at.refresh_token_id:
+                self._access_by_refresh[at.refresh_token_id].add(at.token)
+            self._schedule(at.expires_at, "access", at.token)
+        return at
+
+    def get_access_token(self, token: str) -> AccessToken | None:
+        with self._lock:
+            self._evict()
+            return self._access.get(token)
+
+    def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        with self._lock:
+            self._evict()
+            return {t: self._access[t] for t in tokens if t in self._access}
+
+    def get_refresh_token(self, token: str) -> RefreshToken | None:
+        with self._lock:
+            self._evict()
+            return self._refresh.get(token)
+
+    def claim_refresh_token(self, token: str, client_id: str) -> RefreshToken | None:
+        with self._lock:
+            self._evict()
+            rt = self._refresh.get(token)
+            if not rt or rt.revoked or rt.client_id != client_id:
+                return None
+            rt.revoked = True
+            rt.rotated_at = datetime.utcnow()
+            return rt
+
+    def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        with self._lock:
+            rt = self._refresh_by_id.get(old_id)
+            if rt:
+                rt.replaced_by = new_id
+
+    def revoke_access_token(self, at: AccessToken) -> None:
+        with self._lock:
+            self._revoke_access([at.token])
+
+    def _revoke_access(self, tokens) -> RevokedAccessTokens:
+        revoked = []
+        for token in tokens:
+            at = self._access.get(token)
+            if at and not at.revoked:
+                at.revoked = True
+                revoked.append((at.token, at.expires_at))
+        return revoked
+
+    def _revoke_refresh(self, tokens) -> int:
+        count = 0
+        for token in tokens:
+            rt = self._refresh.get(token)
+            if rt and not rt.revoked:
+                rt.revoked = True
+                count += 1
+        return count
+
+    def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        with self._lock:
+            self._evict()
+            return self._revoke_access(
+                list(self._access_by_refresh.get(refresh_id, ()))
+            )
+
+    def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        with self._lock:
+            self._evict()
+            family = [
+                token
+                for token in self._family.get(family_id, ())
+                if issued_after is None
+                or to_naive_utc(self._refresh[token].created_at) > issued_after
+            ]
+            access_tokens = [
+                token
+                for rt_token in family
+                for token in self._access_by_refresh.get(self._refresh[rt_token].id, ())
+            ]
+            return self._revoke_access(access_tokens), self._revoke_refresh(family)
+
+    # Revocaciones administrativas poco frecuentes: recorren todos los tokens
+    def revoke_by_user(self, user_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        return self._revoke_matching(lambda t: t.user_id == user_id)
+
+    def revoke_access_by_user(self, user_id: UUID) -> RevokedAccessTokens:
+        with self._lock:
+            self._evict()
+            return self._revoke_access(
+                [t.token for t in self._access.values() if t.user_id == user_id]
+            )
+
+    def clear_authz(self, user_id: UUID) -> list[str]:
+        with self._lock:
+            self._evict()
+            cleared = []
+            for at in self._access.values():
+                if at.user_id == user_id and not at.revoked and at.authz:
+                    at.authz = None
+                    cleared.append(at.token)
+            return cleared
+
+    def revoke_by_client(self, client_id: str) -> tuple[RevokedAccessTokens, int]:
+        return self._revoke_matching(lambda t: t.client_id == client_id)
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        user_ids, client_ids = self.tenant_members(tenant_id)
+        user_ids, client_ids = set(user_ids), set(client_ids)
+        return self._revoke_matching(
+            lambda t: t.user_id in user_ids or t.client_id in client_ids
+        )
+
+    def _revoke_matching(self, match) -> tuple[RevokedAccessTokens, int]:
+        with self._lock:
+            self._evict()
+            access_tokens = [t.token for t in self._access.values() if match(t)]
+            refresh_tokens = [t.token for t in self._refresh.values() if match(t)]
+            return (
+                self._revoke_access(access_tokens),
+                self._revoke_refresh(refresh_tokens),
+            )
+
+    def list_revoked_access_tokens(self) -> RevokedAccessTokens:
+        with self._lock:
+            self._evict()
+            return [(t.token, t.expires_at) for t in self._access.values() if t.revoked]
+
+    def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        with self._lock:
+            for jti, expires_at in access_tokens:
+                self._version += 1
+                self._events.append((self._version, jti, to_naive_utc(expires_at)))
+            # Descartar eventos de tokens ya expirados cuando son mayoría
+            now = datetime.utcnow()
+            active = [event for event in self._events if event[2] > now]
+            if len(active) * 2 < len(self._events):
+                self._events = active
+
+    def list_revocation_events(self, after: int, limit: int) -> RevocationEvents:
+        with self._lock:
+            now = datetime.utcnow()
+            start = bisect.bisect_right(self._events, after, key=lambda e: e[0])
+            return [
+                (version, jti)
+                for version, jti, expires_at in self._events[start:]
+                if expires_at > now
+            ][:limit]
+
+    def revocation_feed_version(self) -> int:
+        return self._version
+
+
+# Instancia global (en memoria)
+memory_token_store = MemoryTokenStore()
@@ -0,0 +1,336 @@
+import json
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.token_store.base import (
+    RevocationEvents,
+    RevokedAccessTokens,
+    TokenStore,
+    load_tenant_members,
+)
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.utils.dates import to_naive_utc
+
+
+def _to_ms(expires_at: datetime) -> int:
+    """Milliseconds until a (naive UTC) expiry; <= 0 if already expired."""
+    return int((expires_at - datetime.utcnow()).total_seconds() * 1000)
+
+
+def _to_score(expires_at: datetime) -> float:
+    return expires_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_score(score: float) -> datetime:
+    return datetime.fromtimestamp(score, timezone.utc).replace(tzinfo=None)
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model, name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+def _load(model, data):
+    """Build a token model from its JSON (table models skip validation)."""
+    values = json.loads(data)
+    return model(
+        **{
+            name: _field_adapter(model, name).validate_python(value)
+            for name, value in values.items()
+        }
+    )
+
+
+class RedisTokenStore(TokenStore):
+    """
+    Tokens en Redis (o cualquier servidor con el mismo protocolo), con
+    expiración nativa por clave. El cliente se inyecta (redis-py o compatible).
+
+    Claves (con `prefix`):
+        at:<token> / rt:<token>   JSON del token (fechas UTC sin zona), PX = tiempo
+                                  hasta expires_at
+        rt_id:<id>                valor del refresh token por id
+        revoked:<token>           marca de revocación; SET NX la hace atómica
+        refresh_at:<id>, family:<id>, user_at:<id>, user_rt:<id>,
+        client_at:<id>, client_rt:<id>   índices (sets) para revocar en bloque
+        revoked_at                sorted set token -> expires_at (deny-list JWT)
+        revocation_seq            versión del feed de revocaciones (INCRBY)
+        revocation_feed           sorted set jti -> versión
+        revocation_feed_exp       sorted set jti -> expires_at (para depurarlo)
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "idp:",
+        tenant_members: Callable[
+            [UUID], tuple[list[UUID], list[str]]
+        ] = load_tenant_members,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.tenant_members = tenant_members
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisTokenStore":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "TOKEN_STORE_BACKEND=redis requires the `redis` package"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, *parts) -> str:
+        return self.prefix + ":".join(str(part) for part in parts)
+
+    def _index(self, name: str, key, token: str, ttl_ms: int) -> None:
+        # Los tokens agregados después expiran después: el TTL del índice
+        # sigue al último token agregado
+        index = self._key(name, key)
+        self.client.sadd(index, token)
+        self.client.pexpire(index, ttl_ms)
+
+    def _members(self, name: str, key) -> list[str]:
+        return [_text(token) for token in self.client.smembers(self._key(name, key))]
+
+    def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        rt.expires_at = to_naive_utc(rt.expires_at)
+        ttl_ms = _to_ms(rt.expires_at)
+        if ttl_ms <= 0:
+            return rt
+        self.client.set(self._key("rt", rt.token), rt.model_dump_json(), px=ttl_ms)
+        self.client.set(self._key("rt_id", rt.id), rt.token, px=ttl_ms)
+        self._index("family", rt.family_id or rt.id, rt.token, ttl_ms)
+        self._index("user_rt", rt.user_id, rt.token, ttl_ms)
+        self._index("client_rt", rt.client_id, rt.token, ttl_ms)
+        return rt
+
+    def add_access_token(self, at: AccessToken) -> AccessToken:
+        at.expires_at = to_naive_utc(at.expires_at)
+        ttl_ms = _to_ms(at.expires_at)
+        if ttl_ms <= 0:
+            return at
+        self.client.set(self._key("at", at.token), at.model_dump_json(), px=ttl_ms)
+        if at.refresh_token_id:
+            self._index("refresh_at", at.refresh_token_id, at.token, ttl_ms)
+        self._index("user_at", at.user_id, at.token, ttl_ms)
+        self._index("client_at", at.client_id, at.token, ttl_ms)
+        return at
+
+    def _get(self, model, kind: str, token: str):
+        data, revoked = self.client.mget(
+            [self._key(kind, token), self._key("revoked", token)]
+        )
+        if data is None:
+            return None
+        obj = _load(model, data)
+        obj.revoked = obj.revoked or revoked is not None
+        return obj
+
+    def get_access_token(self, token: str) -> AccessToken | None:
+        return self._get(AccessToken, "at", token)
+
+    def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        tokens = list(dict.fromkeys(tokens))
+        if not tokens:
+            return {}
+        # Un solo MGET: primero los tokens, luego sus marcas de revocación
+        values = self.client.mget(
+            [self._key("at", t) for t in tokens]
+            + [self._key("revoked", t) for t in tokens]
+        )
+        found = {}
+        for token, data, revoked in zip(tokens, values, values[len(tokens) :]):
+            if data is None:
+                continue
+            at = _load(AccessToken, data)
+            at.revoked = at.revoked or revoked is not None
+            found[token] = at
+        return found
+
+    def get_refresh_token(self, token: str) -> RefreshToken | None:
+        data, revoked = self.client.mget(
+            [self._key("rt", token), self._key("revoked", token)]
+        )
+        if data is None:
+            return None
+        rt = _load(RefreshToken, data)
+        if revoked is not None:
+            rt.revoked = True
+            # La marca de una rotación guarda su momento (ver claim_refresh_token)
+            if _text(revoked) != "1":
+                rt.rotated_at = datetime.fromisoformat(_text(revoked))
+        return rt
+
+    def _mark_revoked(self, token: str, expires_at: datetime, value="1") -> bool:
+        """Set the revocation mark; only the first caller gets True."""
+        ttl_ms = _to_ms(expires_at)
+        if ttl_ms <= 0:
+            return False
+        return bool(
+            self.client.set(self._key("revoked", token), value, px=ttl_ms, nx=True)
+        )
+
+    def claim_refresh_token(self, token: str, client_id: str) -> RefreshToken | None:
+        rt = self.get_refresh_token(token)
+        if not rt or rt.revoked or rt.client_id != client_id:
+            return None
+        # La marca y el momento de la rotación se escriben juntos (SET NX)
+        rotated_at = datetime.utcnow()
+        if not self._mark_revoked(rt.token, rt.expires_at, rotated_at.isoformat()):
+            return None
+        rt.revoked = True
+        rt.rotated_at = rotated_at
+        return rt
+
+    def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        # Solo quien ganó el claim del token llega aquí: no hay escrituras concurrentes
+        token = self.client.get(self._key("rt_id", old_id))
+        rt = token and self.get_refresh_token(_text(token))
+        if rt:
+            rt.replaced_by = new_id
+            self.client.set(
+                self._key("rt", rt.token), rt.model_dump_json(), keepttl=True
+            )
+
+    def _revoke_access(self, tokens: list[str]) -> RevokedAccessTokens:
+        revoked = []
+        for token in tokens:
+            at = self.get_access_token(token)
+            if at and self._mark_revoked(at.token, at.expires_at):
+                self.client.zadd(
+                    self._key("revoked_at"), {at.token: _to_score(at.expires_at)}
+                )
+                revoked.append((at.token, at.expires_at))
+        return revoked
+
+    def _revoke_refresh(self, tokens: list[str]) -> int:
+        count = 0
+        for token in tokens:
+            rt = self.get_refresh_token(token)
+            if rt and self._mark_revoked(rt.token, rt.expires_at):
+                count += 1
+        return count
+
+    def revoke_access_token(self, at: AccessToken) -> None:
+        self._revoke_access([at.token])
+
+    def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        return self._revoke_access(self._members("refresh_at", refresh_id))
+
+    def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        family, access_tokens = [], []
+        for token in self._members("family", family_id):
+            rt = self.get_refresh_token(token)
+            if not rt:
+                continue
+            if issued_after is None or to_naive_utc(rt.created_at) > issued_after:
+                family.append(token)
+                access_tokens += self._members("refresh_at", rt.id)
+        return self._revoke_access(access_tokens), self._revoke_refresh(family)
+
+    def revoke_by_user(self, user_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        return (
+            self._revoke_access(self._members("user_at", user_id)),
+            self._revoke_refresh(self._members("user_rt", user_id)),
+        )
+
+    def revoke_access_by_user(self, user_id: UUID) -> RevokedAccessTokens:
+        return self._revoke_access(self._members("user_at", user_id))
+
+    def clear_authz(self, user_id: UUID) -> list[str]:
+        cleared = []
+        for token in self._members("user_at", user_id):
+            at = self.get_access_token(token)
+            if at and not at.revoked and at.authz:
+                at.authz = None
+                # El token ya existe: se reescribe sin tocar su expiración
+                self.client.set(
+                    self._key("at", token), at.model_dump_json(), keepttl=True, xx=True
+                )
+                cleared.append(token)
+        return cleared
+
+    def revoke_by_client(self, client_id: str) -> tuple[RevokedAccessTokens, int]:
+        return (
+            self._revoke_access(self._members("client_at", client_id)),
+            self._revoke_refresh(self._members("client_rt", client_id)),
+        )
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        # Un token ya revocado no se cuenta dos veces (la marca es SET NX)
+        user_ids, client_ids = self.tenant_members(tenant_id)
+        access_tokens, refresh_count = [], 0
+        for revoked, count in [self.revoke_by_user(u) for u in user_ids] + [
+            self.revoke_by_client(c) for c in client_ids
+        ]:
+            access_tokens += revoked
+            refresh_count += count
+        return access_tokens, refresh_count
+
+    def list_revoked_access_tokens(self) -> RevokedAccessTokens:
+        key = self._key("revoked_at")
+        now = _to_score(datetime.utcnow())
+        self.client.zremrangebyscore(key, "-inf", now)
+        return [
+            (_text(token), _from_score(score))
+            for token, score in self.client.zrangebyscore(
+                key, now, "+inf", withscores=True
+            )
+        ]
+
+    def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        if not access_tokens:
+            return
+        last = self.client.incrby(self._key("revocation_seq"), len(access_tokens))
+        first = last - len(access_tokens) + 1
+        self.client.zadd(
+            self._key("revocation_feed"),
+            {jti: first + i for i, (jti, _) in enumerate(access_tokens)},
+        )
+        self.client.zadd(
+            self._key("revocation_feed_exp"),
+            {jti: _to_score(to_naive_utc(exp)) for jti, exp in access_tokens},
+        )
+
+    def list_revocation_events(self, after: int, limit: int) -> RevocationEvents:
+        exp_key = self._key("revocation_feed_exp")
+        expired = self.client.zrangebyscore(
+            exp_key, "-inf", _to_score(datetime.utcnow())
+        )
+        if expired:
+            self.client.zrem(self._key("revocation_feed"), *expired)
+            self.client.zrem(exp_key, *expired)
+        return [
+            (int(score), _text(jti))
+            for jti, score in self.client.zrangebyscore(
+                self._key("revocation_feed"),
+                f"({after}",
+                "+inf",
+                start=0,
+                num=limit,
+                withscores=True,
+            )
+        ]
+
+    def revocation_feed_version(self) -> int:
+        return int(self.client.get(self._key("revocation_seq")) or 0)
+
+
+@lru_cache(maxsize=1)
+def redis_token_store() -> RedisTokenStore:
+    """Shared store built from REDIS_URL on first use."""
+    return RedisTokenStore.from_url(settings.REDIS_URL)
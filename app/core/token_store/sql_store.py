@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.token_store.base import (
+    RevocationEvents,
+    RevokedAccessTokens,
+    TokenStore,
+)
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.repositories.access_token_repository import AccessTokenRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revocation_event_repository import RevocationEventRepository
+
+
+class SqlTokenStore(TokenStore):
+    """Tokens en la base de datos, a través de los repositorios SQLModel."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.at_repo = AccessTokenRepository(session)
+        self.rt_repo = RefreshTokenRepository(session)
+        self.event_repo = RevocationEventRepository(session)
+
+    def add_refresh_token(self, rt: RefreshToken) -> RefreshToken:
+        return self.rt_repo.create(rt)
+
+    def add_access_token(self, at: AccessToken) -> AccessToken:
+        return self.at_repo.create(at)
+
+    def get_access_token(self, token: str) -> AccessToken | None:
+        return self.at_repo.get(token)
+
+    def get_access_tokens(self, tokens: list[str]) -> dict[str, AccessToken]:
+        return {at.token: at for at in self.at_repo.get_many(tokens)}
+
+    def get_refresh_token(self, token: str) -> RefreshToken | None:
+        return self.rt_repo.get(token)
+
+    def claim_refresh_token(self, token: str, client_id: str) -> RefreshToken | None:
+        return self.rt_repo.claim(token, client_id)
+
+    def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        self.rt_repo.set_replaced_by(old_id, new_id)
+
+    def revoke_access_token(self, at: AccessToken) -> None:
+        self.at_repo.revoke(at)
+
+    def revoke_by_refresh(self, refresh_id: UUID) -> RevokedAccessTokens:
+        return self.at_repo.revoke_by_refresh(refresh_id)
+
+    def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> tuple[RevokedAccessTokens, int]:
+        refresh_count = self.rt_repo.revoke_family(family_id, issued_after)
+        return self.at_repo.revoke_by_family(family_id, issued_after), refresh_count
+
+    def revoke_by_user(self, user_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        return (
+            self.at_repo.revoke_by_user(user_id),
+            self.rt_repo.revoke_by_user(user_id),
+        )
+
+    def revoke_access_by_user(self, user_id: UUID) -> RevokedAccessTokens:
+        return self.at_repo.revoke_by_user(user_id)
+
+    def clear_authz(self, user_id: UUID) -> list[str]:
+        return self.at_repo.clear_authz_by_user(user_id)
+
+    def revoke_by_client(self, client_id: str) -> tuple[RevokedAccessTokens, int]:
+        return (
+            self.at_repo.revoke_by_client(client_id),
+            self.rt_repo.revoke_by_client(client_id),
+        )
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> tuple[RevokedAccessTokens, int]:
+        return (
+            self.at_repo.revoke_by_tenant(tenant_id),
+            self.rt_repo.revoke_by_tenant(tenant_id),
+        )
+
+    def list_revoked_access_tokens(self) -> RevokedAccessTokens:
+        return self.at_repo.list_revoked_active()
+
+    def record_revocations(self, access_tokens: RevokedAccessTokens) -> None:
+        self.event_repo.add_many(access_tokens)
+
+    def _settled_before(self) -> datetime:
+        return datetime.utcnow() - timedelta(
+            seconds=settings.REVOCATION_FEED_SETTLE_SECONDS
+        )
+
+    def list_revocation_events(self, after: int, limit: int) -> RevocationEvents:
+        return self.event_repo.list_since(after, self._settled_before(), limit)
+
+    def revocation_feed_version(self) -> int:
+        return self.event_repo.current_version(self._settled_before())
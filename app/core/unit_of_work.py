@@ -0,0 +1,58 @@
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Agrupa los cambios de una operación en una sola transacción.
+    Los repositorios solo agregan cambios a la sesión; quien abre la unidad de
+    trabajo (servicio o endpoint) confirma una única vez al salir del bloque,
+    o hace rollback si ocurre una excepción.
+
+        with UnitOfWork(session):
+            token_service.issue_tokens(...)
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def commit(self) -> None:
+        self.session.commit()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+
+
+class AsyncUnitOfWork:
+    """UnitOfWork para AsyncSession:
+
+    async with AsyncUnitOfWork(session):
+        await token_service.issue_tokens(...)
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class AccessTokenClaims:
+    """Data class representing a verified access token."""
+
+    jti: str
+    user_id: UUID
+    client_id: str
+    scope: List[str]
+    expires_at: datetime
+    # Solo los access tokens JWT conservan su fecha de emisión
+    issued_at: Optional[datetime] = None
+    # Máscaras de roles y permisos del usuario al emitir el token
+    # (TOKEN_AUTHZ_CLAIMS), ver EffectivePermissions.to_claim
+    authz: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Converts the dataclass to a dictionary suitable for JWT encoding."""
+        data = {
+            "jti": self.jti,
+            "sub": str(self.user_id),
+            "client_id": self.client_id,
+            "scope": " ".join(self.scope or []),
+            "exp": int(self.expires_at.timestamp()),
+        }
+        if self.authz:
+            data["authz"] = self.authz
+        return data
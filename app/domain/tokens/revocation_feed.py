@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class RevocationSnapshot:
+    """Revoked JWT access tokens not yet expired, as of `version`."""
+
+    version: int
+    format: str
+    count: int
+    ids: Optional[List[str]] = None
+    bloom: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        data = {"version": self.version, "format": self.format, "count": self.count}
+        if self.ids is not None:
+            data["ids"] = self.ids
+        if self.bloom is not None:
+            data["bloom"] = self.bloom
+        return data
+
+
+@dataclass
+class RevocationDelta:
+    """Tokens revoked after a version; `version` is the cursor for the next call."""
+
+    version: int
+    ids: List[str] = field(default_factory=list)
+    has_more: bool = False
+
+    def to_dict(self) -> dict:
+        return {"version": self.version, "ids": self.ids, "has_more": self.has_more}
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 
 @dataclass(frozen=True)
@@ -48,6 +48,13 @@ class FormTokenRequest:
 @dataclass
 class InstrospectResponse:
     active: bool
-    # sub: str | None = None
     client_id: str | None = None
-    # type: str | None = None
+    sub: str | None = None
+    scope: str | None = None
+    exp: int | None = None
+    iat: int | None = None
+    token_type: str | None = None
+
+    def to_dict(self) -> dict:
+        """Claims of the response, leaving out the ones that are not set."""
+        return {k: v for k, v in asdict(self).items() if v is not None}
@@ -72,3 +72,25 @@ class RequiredPermissionException(AppException):
             http_status=status.HTTP_403_FORBIDDEN,
             details=details,
         )
+
+
+class PasswordHashingBusyException(AppException):
+    def __init__(self, message="Too many password checks in progress", details=None):
+        super().__init__(
+            message=message,
+            code=ExceptionCode.SERVICE_UNAVAILABLE,
+            http_status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details=details,
+        )
+
+
+class LoginThrottledException(AppException):
+    def __init__(self, retry_after: float, details=None):
+        # Segundos enteros, como en la cabecera Retry-After
+        self.retry_after = max(int(retry_after + 0.999), 1)
+        super().__init__(
+            message="Too many login attempts",
+            code=ExceptionCode.TOO_MANY_REQUESTS,
+            http_status=status.HTTP_429_TOO_MANY_REQUESTS,
+            details=details or {"retry_after": self.retry_after},
+        )
@@ -12,3 +12,5 @@ class ExceptionCode(str, Enum):
     FORBIDDEN = "FORBIDDEN"
     PERMISSION_REQUIRED = "PERMISSION_REQUIRED"
     ROLE_REQUIRED = "ROLE_REQUIRED"
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
@@ -8,9 +8,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 
 from app.api import api_router
+from app.core.async_db import get_async_engine
+from app.core.config import settings
 from app.core.db import init_db
 from app.core.exceptions_handler import register_exception_handlers
-from app.services.token_cleanup_service import TokenCleanupService
+from app.core.key_ring import key_ring
+from app.core.security.hashing_pool import password_hashing_pool
+from app.services.revocation_sync_service import RevocationSyncService
+from app.services.token_cleanup_service import token_cleanup_service
+from app.services.token_partition_service import token_partition_service
 
 pyproject_data = toml.load("pyproject.toml")
 __version__ = pyproject_data["tool"]["poetry"]["version"]
@@ -18,7 +24,9 @@ __name__ = pyproject_data["tool"]["poetry"]["name"]
 __description__ = pyproject_data["tool"]["poetry"]["description"]
 
 
-cleanup_service = TokenCleanupService(interval_seconds=300)
+revocation_sync_service = RevocationSyncService(
+    interval_seconds=settings.REVOCATION_LIST_SYNC_SECONDS
+)
 
 
 # -----------------------------
@@ -31,14 +39,43 @@ async def lifespan(app: FastAPI):
     # TODO: Falta agregar migraciones con Alembic
     init_db()
 
-    # TODO: Agregar forma de acoplar REDIs/cache en vez de guardar tokens en bd
-
-    # Init cleanup service to remove expired tokens periodically
-    asyncio.create_task(cleanup_service.start())
+    # Password hashing workers, started before serving any login
+    password_hashing_pool.start()
+
+    # Parse signing keys once; reload them on SIGHUP or when the files change
+    key_ring.reload()
+    key_ring.install_signal_handler()
+    asyncio.create_task(key_ring.watch(settings.KEY_RING_RELOAD_SECONDS))
+
+    # Remove expired tokens periodically: dropping whole daily partitions when
+    # the token tables are partitioned, batched DELETEs otherwise. The memory
+    # and Redis token stores expire tokens on their own (TOKEN_STORE_BACKEND).
+    if settings.TOKEN_STORE_BACKEND == "sql":
+        partitioned = (
+            settings.TOKEN_PARTITIONING_ENABLED
+            and token_partition_service.tables_partitioned()
+        )
+        if settings.TOKEN_PARTITIONING_ENABLED and not partitioned:
+            print(
+                "[TokenPartitionService] Las tablas de tokens no están "
+                "particionadas (`partition-token-tables`); se usa la limpieza "
+                "por lotes."
+            )
+        if partitioned:
+            asyncio.create_task(token_partition_service.start())
+        else:
+            asyncio.create_task(token_cleanup_service.start())
+
+    # Keep the deny-list of revoked JWT access tokens up to date
+    if settings.ACCESS_TOKEN_FORMAT == "jwt":
+        asyncio.create_task(revocation_sync_service.start())
 
     yield
     # Aquí podrías poner lógica de cierre (shutdown)
     print("Closing app...")
+    password_hashing_pool.shutdown()
+    if settings.DATABASE_ASYNC:
+        await get_async_engine().dispose()
 
 
 app = FastAPI(
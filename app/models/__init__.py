@@ -6,6 +6,8 @@ from .client_application import ClientApplication
 from .app_settings import AppSetting
 from .permission import Permission
 from .role import Role
+from .authorization_code import AuthorizationCodeRecord
+from .revocation_event import RevocationEvent
 
 # Association tables
 from .role_permission import RolePermission
@@ -1,11 +1,14 @@
 import uuid
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlmodel import JSON, Column, Field, SQLModel
+from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 
 from app.models.base import PKMixin
 
+if TYPE_CHECKING:
+    from app.models.refresh_token import RefreshToken
+
 
 class AccessToken(SQLModel, PKMixin, table=True):
     __tablename__ = "access_tokens"
@@ -13,6 +16,13 @@ class AccessToken(SQLModel, PKMixin, table=True):
     user_id: uuid.UUID = Field(foreign_key="users.id")
     client_id: str = Field(foreign_key="client_applications.client_id")
     scope: List[str] = Field(sa_column=Column(JSON))
-    expires_at: datetime
+    expires_at: datetime = Field(index=True)
     revoked: bool = False
-    refresh_token_id: uuid.UUID = Field(foreign_key="refresh_tokens.id", nullable=True)
+    refresh_token_id: uuid.UUID = Field(
+        foreign_key="refresh_tokens.id", nullable=True, index=True
+    )
+    # Claim de roles y permisos de los tokens opacos (TOKEN_AUTHZ_CLAIMS)
+    authz: Optional[str] = Field(default=None, nullable=True)
+
+    # relationships (orders the flush: refresh token INSERT before access token)
+    refresh_token: Optional["RefreshToken"] = Relationship()
@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlmodel import JSON, Column, Field, SQLModel
+
+
+class AuthorizationCodeRecord(SQLModel, table=True):
+    """Authorization code shared by every worker (AUTHORIZATION_CODE_STORE_BACKEND=sql)."""
+
+    __tablename__ = "authorization_codes"
+    code: str = Field(primary_key=True)
+    client_id: str
+    redirect_uri: str
+    code_challenge: str
+    user_id: uuid.UUID
+    scope: List[str] = Field(sa_column=Column(JSON))
+    expires_at: datetime = Field(index=True)
@@ -9,16 +9,20 @@ from app.models.base import PKMixin
 
 class RefreshToken(SQLModel, PKMixin, table=True):
     __tablename__ = "refresh_tokens"
-    token: str
+    token: str = Field(index=True, unique=True)
     user_id: uuid.UUID = Field(foreign_key="users.id")
     client_id: str = Field(foreign_key="client_applications.client_id")
     scope: List[str] = Field(sa_column=Column(JSON))
-    expires_at: datetime
+    expires_at: datetime = Field(index=True)
     revoked: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     parent_id: Optional[uuid.UUID] = Field(
-        default=None, foreign_key="refresh_tokens.id"
+        default=None, foreign_key="refresh_tokens.id", index=True
     )
     replaced_by: Optional[uuid.UUID] = Field(
-        default=None, foreign_key="refresh_tokens.id"
+        default=None, foreign_key="refresh_tokens.id", index=True
     )
+    # Momento en que se rotó (claim): distingue un reintento de un reuse
+    rotated_at: Optional[datetime] = None
+    # Raíz del linaje de rotaciones: permite revocar toda la familia de una vez
+    family_id: Optional[uuid.UUID] = Field(default=None, index=True)
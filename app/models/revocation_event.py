@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class RevocationEvent(SQLModel, table=True):
+    """Revoked JWT access token (jti) in the revocation feed; `id` is the version."""
+
+    __tablename__ = "revocation_events"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    jti: str
+    expires_at: datetime = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -1,9 +1,14 @@
 from datetime import datetime
+from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import or_
+from sqlmodel import Session, delete, select, update
 
-from app.domain.tokens.token_response import InstrospectResponse
 from app.models.access_token import AccessToken
+from app.models.client_application import ClientApplication
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.repositories.refresh_token_repository import family_criteria
 
 
 class AccessTokenRepository:
@@ -11,10 +16,8 @@ class AccessTokenRepository:
         self.session = session
 
     def create(self, token: AccessToken) -> AccessToken:
-        """Create access token from AccessToken model"""
+        """Stage access token from AccessToken model (committed by the unit of work)"""
         self.session.add(token)
-        self.session.commit()
-        self.session.refresh(token)
         return token
 
     def get(self, token: str) -> AccessToken | None:
@@ -22,28 +25,90 @@ class AccessTokenRepository:
         q = select(AccessToken).where(AccessToken.token == token)
         return self.session.exec(q).one_or_none()
 
-    def revoke_by_refresh(self, refresh_id):
+    def get_many(self, tokens: list[str]) -> list[AccessToken]:
+        """Get the access tokens among `tokens` in one `WHERE token IN (...)`"""
+        if not tokens:
+            return []
+        q = select(AccessToken).where(AccessToken.token.in_(tokens))
+        return list(self.session.exec(q).all())
+
+    def _revoke_where(self, *criteria) -> list[tuple[str, datetime]]:
+        """Revoke every active access token matching `criteria` in one UPDATE.
+        Returns (token, expires_at) of the revoked tokens."""
+        stmt = (
+            update(AccessToken)
+            .where(*criteria, AccessToken.revoked == False)  # noqa: E712
+            .values(revoked=True)
+            .returning(AccessToken.token, AccessToken.expires_at)
+        )
+        return list(self.session.exec(stmt).all())
+
+    def revoke_by_refresh(self, refresh_id) -> list[tuple[str, datetime]]:
         """Revoke all access tokens associated with a refresh token"""
-        q = select(AccessToken).where(AccessToken.refresh_token_id == refresh_id)
-        for at in self.session.exec(q).all():
-            at.revoked = True
-            self.session.add(at)
+        return self._revoke_where(AccessToken.refresh_token_id == refresh_id)
+
+    def revoke_by_family(
+        self, family_id, issued_after: datetime | None = None
+    ) -> list[tuple[str, datetime]]:
+        """Revoke the access tokens of every refresh token in a lineage
+        (created after `issued_after`, if given)"""
+        family = select(RefreshToken.id).where(
+            *family_criteria(family_id, issued_after)
+        )
+        return self._revoke_where(AccessToken.refresh_token_id.in_(family))
+
+    def revoke_by_user(self, user_id: UUID) -> list[tuple[str, datetime]]:
+        """Revoke all access tokens of a user ("logout everywhere")"""
+        return self._revoke_where(AccessToken.user_id == user_id)
+
+    def clear_authz_by_user(self, user_id: UUID) -> list[str]:
+        """Drop the authz claim of all active access tokens of a user"""
+        stmt = (
+            update(AccessToken)
+            .where(
+                AccessToken.user_id == user_id,
+                AccessToken.revoked == False,  # noqa: E712
+                AccessToken.authz.is_not(None),
+            )
+            .values(authz=None)
+            .returning(AccessToken.token)
+        )
+        return list(self.session.exec(stmt).scalars().all())
+
+    def revoke_by_client(self, client_id: str) -> list[tuple[str, datetime]]:
+        """Revoke all access tokens issued to a client application"""
+        return self._revoke_where(AccessToken.client_id == client_id)
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> list[tuple[str, datetime]]:
+        """Revoke all access tokens of the users or client applications of a tenant"""
+        users = select(User.id).where(User.tenant_id == tenant_id)
+        clients = select(ClientApplication.client_id).where(
+            ClientApplication.tenant_id == str(tenant_id)
+        )
+        return self._revoke_where(
+            or_(AccessToken.user_id.in_(users), AccessToken.client_id.in_(clients))
+        )
 
     def revoke(self, access_token: AccessToken):
         """Revoke access token"""
         access_token.revoked = True
         self.session.add(access_token)
-        self.session.commit()
-
-    def introspect(self, token: str) -> InstrospectResponse | None:
-        """Verify if access token is valid, if not revoke it and return inactive"""
-        at = self.get(token)
-        if at.revoked:
-            return InstrospectResponse(active=False, client_id=at.client_id)
-        if at.expires_at < datetime.utcnow():
-            self.revoke(at)
-            return InstrospectResponse(active=False, client_id=at.client_id)
-        return InstrospectResponse(
-            active=True,
-            client_id=at.client_id,
+
+    def list_revoked_active(self) -> list[tuple[str, datetime]]:
+        """List (token, expires_at) of revoked access tokens that have not expired"""
+        q = select(AccessToken.token, AccessToken.expires_at).where(
+            AccessToken.revoked == True,  # noqa: E712
+            AccessToken.expires_at > datetime.utcnow(),
+        )
+        return list(self.session.exec(q).all())
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to `limit` expired access tokens, oldest first"""
+        batch = (
+            select(AccessToken.id)
+            .where(AccessToken.expires_at < now)
+            .order_by(AccessToken.expires_at)
+            .limit(limit)
         )
+        stmt = delete(AccessToken).where(AccessToken.id.in_(batch))
+        return self.session.exec(stmt).rowcount
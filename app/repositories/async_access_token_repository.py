@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.repositories.refresh_token_repository import family_criteria
+
+
+class AsyncAccessTokenRepository:
+    """Versión async de AccessTokenRepository (rutas de token e introspección)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def create(self, token: AccessToken) -> AccessToken:
+        """Stage access token (committed by the unit of work)"""
+        self.session.add(token)
+        return token
+
+    async def get(self, token: str) -> AccessToken | None:
+        """Get access token by token"""
+        q = select(AccessToken).where(AccessToken.token == token)
+        return (await self.session.exec(q)).one_or_none()
+
+    async def get_many(self, tokens: list[str]) -> list[AccessToken]:
+        """Get the access tokens among `tokens` in one `WHERE token IN (...)`"""
+        if not tokens:
+            return []
+        q = select(AccessToken).where(AccessToken.token.in_(tokens))
+        return list((await self.session.exec(q)).all())
+
+    async def _revoke_where(self, *criteria) -> list[tuple[str, datetime]]:
+        """Revoke every active access token matching `criteria` in one UPDATE."""
+        stmt = (
+            update(AccessToken)
+            .where(*criteria, AccessToken.revoked == False)  # noqa: E712
+            .values(revoked=True)
+            .returning(AccessToken.token, AccessToken.expires_at)
+        )
+        return list((await self.session.exec(stmt)).all())
+
+    async def revoke_by_refresh(self, refresh_id) -> list[tuple[str, datetime]]:
+        """Revoke all access tokens associated with a refresh token"""
+        return await self._revoke_where(AccessToken.refresh_token_id == refresh_id)
+
+    async def revoke_by_family(
+        self, family_id, issued_after: datetime | None = None
+    ) -> list[tuple[str, datetime]]:
+        """Revoke the access tokens of every refresh token in a lineage
+        (created after `issued_after`, if given)"""
+        family = select(RefreshToken.id).where(
+            *family_criteria(family_id, issued_after)
+        )
+        return await self._revoke_where(AccessToken.refresh_token_id.in_(family))
+
+    def revoke(self, access_token: AccessToken):
+        """Revoke access token"""
+        access_token.revoked = True
+        self.session.add(access_token)
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.app_settings import AppSetting
+from app.repositories.app_settings_repository import AppSettingRepository, CacheEntry
+from app.utils.dates import generate_date_now
+
+
+class AsyncAppSettingRepository:
+    """Lectura async de la configuración; comparte la caché de AppSettingRepository."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the value of a configuration by its key."""
+        cache = AppSettingRepository._cache
+        cached = cache.get(key)
+        if (
+            cached
+            and (generate_date_now() - cached.time).total_seconds()
+            < AppSettingRepository._cache_ttl_seconds
+        ):
+            return cached.value
+
+        stmt = select(AppSetting).where(AppSetting.key == key)
+        setting = (await self.session.exec(stmt)).first()
+
+        if not setting:
+            return default
+
+        cache[key] = CacheEntry(value=setting.value, time=generate_date_now())
+        return setting.value
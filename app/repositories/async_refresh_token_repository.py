@@ -0,0 +1,62 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.refresh_token import RefreshToken
+from app.repositories.refresh_token_repository import family_criteria
+
+
+class AsyncRefreshTokenRepository:
+    """Versión async de RefreshTokenRepository (emisión y rotación)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def create(self, token: RefreshToken) -> RefreshToken:
+        self.session.add(token)
+        return token
+
+    async def get(self, token_str: str) -> RefreshToken | None:
+        q = select(RefreshToken).where(RefreshToken.token == token_str)
+        return (await self.session.exec(q)).first()
+
+    async def claim(self, token_str: str, client_id: str) -> RefreshToken | None:
+        """Atomically revoke an active refresh token for rotation (compare-and-swap)."""
+        now = datetime.utcnow()
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token == token_str,
+                RefreshToken.client_id == client_id,
+                RefreshToken.revoked == False,  # noqa: E712
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked=True, rotated_at=now)
+            .returning(RefreshToken)
+        )
+        return (await self.session.exec(stmt)).scalars().first()
+
+    async def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        """Link a rotated refresh token to the one that replaced it."""
+        await self.session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.id == old_id)
+            .values(replaced_by=new_id)
+        )
+
+    async def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> int:
+        """Revoke every refresh token of a rotation lineage (created after
+        `issued_after`, if given)."""
+        stmt = (
+            update(RefreshToken)
+            .where(
+                *family_criteria(family_id, issued_after),
+                RefreshToken.revoked == False,  # noqa: E712
+            )
+            .values(revoked=True)
+        )
+        return (await self.session.exec(stmt)).rowcount
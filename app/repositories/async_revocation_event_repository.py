@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.revocation_event import RevocationEvent
+
+
+class AsyncRevocationEventRepository:
+    """Versión async de RevocationEventRepository (solo el registro de eventos)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add_many(self, entries: list[tuple[str, datetime]]) -> None:
+        """Stage one event per revoked token (committed with the revocation)"""
+        self.session.add_all(
+            RevocationEvent(jti=jti, expires_at=expires_at)
+            for jti, expires_at in entries
+        )
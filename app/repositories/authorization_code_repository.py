@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlmodel import Session, delete, func, select
+
+from app.models.authorization_code import AuthorizationCodeRecord
+
+
+class AuthorizationCodeRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create(self, record: AuthorizationCodeRecord) -> AuthorizationCodeRecord:
+        self.session.add(record)
+        return record
+
+    def take(self, code: str) -> AuthorizationCodeRecord | None:
+        """Delete a code and return it in one statement (single use)."""
+        stmt = (
+            delete(AuthorizationCodeRecord)
+            .where(AuthorizationCodeRecord.code == code)
+            .returning(AuthorizationCodeRecord)
+        )
+        return self.session.exec(stmt).scalars().first()
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to `limit` expired codes, oldest first."""
+        batch = (
+            select(AuthorizationCodeRecord.code)
+            .where(AuthorizationCodeRecord.expires_at < now)
+            .order_by(AuthorizationCodeRecord.expires_at)
+            .limit(limit)
+        )
+        stmt = delete(AuthorizationCodeRecord).where(
+            AuthorizationCodeRecord.code.in_(batch)
+        )
+        return self.session.exec(stmt).rowcount
+
+    def count_active(self, now: datetime) -> int:
+        q = select(func.count()).where(AuthorizationCodeRecord.expires_at >= now)
+        return self.session.exec(q).one()
@@ -13,8 +13,6 @@ class ClientApplicationRepository:
     def create(self, client_data: ClientApplicationCreate) -> ClientApplication:
         client = ClientApplication(**client_data.model_dump())
         self.session.add(client)
-        self.session.commit()
-        self.session.refresh(client)
         return client
 
     def get_by_client_id(self, client_id: str) -> Optional[ClientApplication]:
@@ -1,5 +1,6 @@
 from sqlmodel import Session, select
 
+from app.core.auth.permission_cache import permission_cache
 from app.exceptions.http_exceptions import NotFoundException
 from app.models.permission import Permission
 from app.schemas.permission import PermissionCreate, PermissionUpdate
@@ -19,11 +20,14 @@ class PermissionRepository:
             raise NotFoundException(entity="Permission", entity_id=permission_id)
         return permission
 
+    def get_names_in_order(self) -> list[str]:
+        """Permission names in creation order (bit positions of the catalog)."""
+        query = select(Permission.name).order_by(Permission.created_at, Permission.id)
+        return self.session.exec(query).all()
+
     def create(self, permission: PermissionCreate):
         permission = Permission.model_validate(permission)
         self.session.add(permission)
-        self.session.commit()
-        self.session.refresh(permission)
         return permission
 
     def update(self, permission_id: str, permission_update: PermissionUpdate):
@@ -37,5 +41,6 @@ class PermissionRepository:
 
         self.session.add(permission)
         self.session.commit()
+        permission_cache.invalidate_catalog()
         self.session.refresh(permission)
         return permission
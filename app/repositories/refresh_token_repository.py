@@ -1,6 +1,22 @@
-from sqlmodel import Session, select
+from datetime import datetime
+from uuid import UUID
 
+from sqlalchemy import or_
+from sqlmodel import Session, delete, select, update
+
+from app.models.access_token import AccessToken
+from app.models.client_application import ClientApplication
 from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+def family_criteria(family_id: UUID, issued_after: datetime | None = None) -> list:
+    """WHERE criteria of the refresh tokens of a lineage, optionally only those
+    created after `issued_after`."""
+    criteria = [RefreshToken.family_id == family_id]
+    if issued_after is not None:
+        criteria.append(RefreshToken.created_at > issued_after)
+    return criteria
 
 
 class RefreshTokenRepository:
@@ -9,8 +25,6 @@ class RefreshTokenRepository:
 
     def create(self, token: RefreshToken) -> RefreshToken:
         self.session.add(token)
-        self.session.commit()
-        self.session.refresh(token)
         return token
 
     def get(self, token_str: str) -> RefreshToken | None:
@@ -23,27 +37,96 @@ class RefreshTokenRepository:
         if token:
             token.revoked = True
             self.session.add(token)
-            self.session.commit()
         return token
 
-    def mark_replaced(self, old: RefreshToken, new: RefreshToken) -> None:
-        old.revoked = True
-        old.replaced_by = new.id
-        new.parent_id = old.id
-        self.session.add_all([old, new])
-
-    def revoke_chain(self, refresh_token: RefreshToken) -> None:
-        """Revoke token and its descendants (recursivo / iterativo)."""
-        stack = [refresh_token]
-        while stack:
-            r = stack.pop()
-            r.revoked = True
-            self.session.add(r)
-            # buscar hijos directos (tokens que tienen parent_id == r.id)
-            q = (
-                select(RefreshToken)
-                .where(RefreshToken.parent_id == r.id)
-                .where(not RefreshToken.revoked)
+    def claim(self, token_str: str, client_id: str) -> RefreshToken | None:
+        """Atomically revoke an active refresh token for rotation (compare-and-swap).
+        Only one of several concurrent callers gets the row back; the rest get None.
+        """
+        now = datetime.utcnow()
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token == token_str,
+                RefreshToken.client_id == client_id,
+                RefreshToken.revoked == False,  # noqa: E712
+                RefreshToken.expires_at > now,
             )
-            children = self.session.exec(q).all()
-            stack.extend(children)
+            .values(revoked=True, rotated_at=now)
+            .returning(RefreshToken)
+        )
+        return self.session.exec(stmt).scalars().first()
+
+    def set_replaced_by(self, old_id: UUID, new_id: UUID) -> None:
+        """Link a rotated refresh token to the one that replaced it."""
+        self.session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.id == old_id)
+            .values(replaced_by=new_id)
+        )
+
+    def _revoke_where(self, *criteria) -> int:
+        """Revoke every active refresh token matching `criteria` in one UPDATE."""
+        stmt = (
+            update(RefreshToken)
+            .where(*criteria, RefreshToken.revoked == False)  # noqa: E712
+            .values(revoked=True)
+        )
+        return self.session.exec(stmt).rowcount
+
+    def revoke_family(
+        self, family_id: UUID, issued_after: datetime | None = None
+    ) -> int:
+        """Revoke every refresh token of a rotation lineage (created after
+        `issued_after`, if given)."""
+        return self._revoke_where(*family_criteria(family_id, issued_after))
+
+    def revoke_by_user(self, user_id: UUID) -> int:
+        """Revoke every refresh token of a user."""
+        return self._revoke_where(RefreshToken.user_id == user_id)
+
+    def revoke_by_client(self, client_id: str) -> int:
+        """Revoke every refresh token issued to a client application."""
+        return self._revoke_where(RefreshToken.client_id == client_id)
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> int:
+        """Revoke every refresh token of the users or client applications of a tenant."""
+        users = select(User.id).where(User.tenant_id == tenant_id)
+        clients = select(ClientApplication.client_id).where(
+            ClientApplication.tenant_id == str(tenant_id)
+        )
+        return self._revoke_where(
+            or_(RefreshToken.user_id.in_(users), RefreshToken.client_id.in_(clients))
+        )
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to `limit` expired refresh tokens, oldest first.
+        References to them (access tokens, parent_id, replaced_by) are set to
+        NULL first so the foreign keys stay valid; `family_id` keeps the lineage.
+        """
+        ids = self.session.exec(
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+        ).all()
+        if not ids:
+            return 0
+
+        self.session.exec(
+            update(AccessToken)
+            .where(AccessToken.refresh_token_id.in_(ids))
+            .values(refresh_token_id=None)
+        )
+        self.session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.parent_id.in_(ids))
+            .values(parent_id=None)
+        )
+        self.session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.replaced_by.in_(ids))
+            .values(replaced_by=None)
+        )
+        stmt = delete(RefreshToken).where(RefreshToken.id.in_(ids))
+        return self.session.exec(stmt).rowcount
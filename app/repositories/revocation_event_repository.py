@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlmodel import Session, delete, func, select
+
+from app.models.revocation_event import RevocationEvent
+
+
+class RevocationEventRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_many(self, entries: list[tuple[str, datetime]]) -> None:
+        """Stage one event per revoked token (committed with the revocation)"""
+        self.session.add_all(
+            RevocationEvent(jti=jti, expires_at=expires_at)
+            for jti, expires_at in entries
+        )
+
+    def list_since(
+        self, after: int, settled_before: datetime, limit: int
+    ) -> list[tuple[int, str]]:
+        """List (version, jti) of unexpired events after a version, in order.
+        Only events older than `settled_before` are listed, so a transaction
+        that commits late does not leave a gap behind the cursor."""
+        q = (
+            select(RevocationEvent.id, RevocationEvent.jti)
+            .where(
+                RevocationEvent.id > after,
+                RevocationEvent.created_at <= settled_before,
+                RevocationEvent.expires_at > datetime.utcnow(),
+            )
+            .order_by(RevocationEvent.id)
+            .limit(limit)
+        )
+        return list(self.session.exec(q).all())
+
+    def current_version(self, settled_before: datetime) -> int:
+        q = select(func.max(RevocationEvent.id)).where(
+            RevocationEvent.created_at <= settled_before
+        )
+        return self.session.exec(q).one() or 0
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to `limit` events of expired tokens, oldest first"""
+        batch = (
+            select(RevocationEvent.id)
+            .where(RevocationEvent.expires_at < now)
+            .order_by(RevocationEvent.expires_at)
+            .limit(limit)
+        )
+        stmt = delete(RevocationEvent).where(RevocationEvent.id.in_(batch))
+        return self.session.exec(stmt).rowcount
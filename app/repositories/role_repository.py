@@ -3,9 +3,11 @@ from uuid import UUID
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
+from app.core.auth.permission_cache import permission_cache
 from app.exceptions.http_exceptions import NotFoundException
 from app.models.permission import Permission
 from app.models.role import Role
+from app.models.role_permission import RolePermission
 from app.schemas.role import (
     RoleCreate,
     RoleSetPermission,
@@ -33,11 +35,20 @@ class RoleRepository:
 
         return self.session.exec(query).first()
 
+    def get_permission_names(self) -> list[tuple]:
+        """(role_id, role name, permission name or None) of every role, roles
+        in creation order."""
+        query = (
+            select(Role.id, Role.name, Permission.name)
+            .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+            .order_by(Role.created_at, Role.id)
+        )
+        return self.session.exec(query).all()
+
     def create(self, role: RoleCreate):
         db_role = Role.model_validate(role)
         self.session.add(db_role)
-        self.session.commit()
-        self.session.refresh(db_role)
         return db_role
 
     def update(self, role_id: UUID, role_update: RoleUpdate):
@@ -51,6 +62,7 @@ class RoleRepository:
 
         self.session.add(role)
         self.session.commit()
+        permission_cache.invalidate_catalog()
         self.session.refresh(role)
         return role
 
@@ -70,6 +82,7 @@ class RoleRepository:
 
         self.session.add(role)
         self.session.commit()
+        permission_cache.invalidate_catalog()
         self.session.refresh(role)
         return role
 
@@ -89,5 +102,6 @@ class RoleRepository:
 
         self.session.add(role)
         self.session.commit()
+        permission_cache.invalidate_catalog()
         self.session.refresh(role)
         return role
@@ -0,0 +1,149 @@
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session, text
+
+# Índices (nombre, columna, único en la tabla sin particionar) y llaves
+# foráneas de cada tabla de tokens, recreados al convertirla
+TOKEN_TABLE_SPECS = {
+    "access_tokens": {
+        "indexes": [
+            ("ix_access_tokens_token", "token", True),
+            ("ix_access_tokens_refresh_token_id", "refresh_token_id", False),
+            ("ix_access_tokens_expires_at", "expires_at", False),
+        ],
+        "foreign_keys": [
+            ("user_id", "users", "id"),
+            ("client_id", "client_applications", "client_id"),
+            ("refresh_token_id", "refresh_tokens", "id"),
+        ],
+    },
+    "refresh_tokens": {
+        "indexes": [
+            ("ix_refresh_tokens_token", "token", True),
+            ("ix_refresh_tokens_family_id", "family_id", False),
+            ("ix_refresh_tokens_expires_at", "expires_at", False),
+            ("ix_refresh_tokens_parent_id", "parent_id", False),
+            ("ix_refresh_tokens_replaced_by", "replaced_by", False),
+        ],
+        "foreign_keys": [
+            ("user_id", "users", "id"),
+            ("client_id", "client_applications", "client_id"),
+            ("parent_id", "refresh_tokens", "id"),
+            ("replaced_by", "refresh_tokens", "id"),
+        ],
+    },
+}
+
+
+class TokenPartitionRepository:
+    """Daily range partitions (`<table>_pYYYYMMDD`) of the token tables (PostgreSQL)."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def is_partitioned(self, table: str) -> bool:
+        """Whether `table` is a partitioned table (False on other databases)."""
+        if self.session.get_bind().dialect.name != "postgresql":
+            return False
+        q = text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"
+        ).bindparams(table=table)
+        return self.session.exec(q).first() is not None
+
+    def list_partitions(self, table: str) -> dict[date, str]:
+        """Get the partitions of a table by the day they cover."""
+        q = text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ).bindparams(table=table)
+        partitions = {}
+        for (name,) in self.session.exec(q).all():
+            suffix = name.removeprefix(f"{table}_p")
+            try:
+                partitions[datetime.strptime(suffix, "%Y%m%d").date()] = name
+            except ValueError:
+                # partición que no sigue la convención diaria: no se toca
+                continue
+        return partitions
+
+    def create_partition(self, table: str, day: date) -> str:
+        """Create the partition holding the tokens that expire on `day`."""
+        name = f"{table}_p{day:%Y%m%d}"
+        self.session.exec(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')"
+            )
+        )
+        return name
+
+    def drop_partition(self, name: str) -> None:
+        """Drop a partition with all its rows (no DELETE, no vacuum)."""
+        self.session.exec(text(f"DROP TABLE IF EXISTS {name}"))
+
+    def rebuild(
+        self,
+        table: str,
+        partitioned: bool,
+        first_day: date | None = None,
+        last_day: date | None = None,
+    ) -> None:
+        """
+        Copy `table` into a new partitioned (or plain) table and swap them.
+        Partitioned: one partition per day from `first_day` to `last_day`;
+        rows expiring before `first_day` are not copied. A partitioned table
+        only enforces unique constraints that include the partition key, so
+        the primary key becomes (id, expires_at), the token index is no longer
+        unique and the foreign keys to the token tables are not recreated.
+        """
+        spec = TOKEN_TABLE_SPECS[table]
+        new_table = f"{table}_new"
+
+        partition_by = " PARTITION BY RANGE (expires_at)" if partitioned else ""
+        self._execute(
+            f"CREATE TABLE {new_table} (LIKE {table} INCLUDING DEFAULTS){partition_by}"
+        )
+        if partitioned:
+            day = first_day
+            while day <= last_day:
+                self._execute(
+                    f"CREATE TABLE {table}_p{day:%Y%m%d} PARTITION OF {new_table} "
+                    f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')"
+                )
+                day += timedelta(days=1)
+            self._execute(
+                f"INSERT INTO {new_table} SELECT * FROM {table} "
+                f"WHERE expires_at >= '{first_day}'"
+            )
+        else:
+            self._execute(f"INSERT INTO {new_table} SELECT * FROM {table}")
+
+        self._execute(f"DROP TABLE {table} CASCADE")
+        self._execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+        primary_key = "id, expires_at" if partitioned else "id"
+        self._execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})"
+        )
+        for name, column, unique in spec["indexes"]:
+            unique_sql = "UNIQUE " if unique and not partitioned else ""
+            self._execute(f"CREATE {unique_sql}INDEX {name} ON {table} ({column})")
+        for column, referent, remote in spec["foreign_keys"]:
+            if referent in TOKEN_TABLE_SPECS:
+                if partitioned:
+                    continue
+                # Las particiones eliminadas pueden dejar referencias colgando
+                self._execute(
+                    f"UPDATE {table} SET {column} = NULL WHERE {column} NOT IN "
+                    f"(SELECT {remote} FROM {referent})"
+                )
+            self._execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey "
+                f"FOREIGN KEY ({column}) REFERENCES {referent} ({remote})"
+            )
+
+    def _execute(self, sql: str) -> None:
+        self.session.exec(text(sql))
@@ -1,8 +1,11 @@
+from uuid import UUID
+
 from sqlmodel import Session, select
 
 from app.exceptions.http_exceptions import NotFoundException
 from app.models.role import Role
 from app.models.user import User
+from app.models.user_role import UserRole
 from app.schemas.user import UserSetRole
 
 
@@ -16,13 +19,20 @@ class UserRepository:
     def get_by_email(self, email: str):
         return self.session.exec(select(User).where(User.email == email)).first()
 
+    def get_by_id(self, user_id: UUID):
+        return self.session.get(User, user_id)
+
+    def get_role_ids(self, user_id: UUID) -> list[UUID]:
+        query = select(UserRole.role_id).where(UserRole.user_id == user_id)
+        return self.session.exec(query).all()
+
     def create(self, user: User):
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
         return user
 
     def set_role(self, role: UserSetRole):
+        """Stage a role assignment (committed by the unit of work; the caller
+        then invalidates the user's cached permissions)."""
         user = self.session.get(User, role.id)
         if not user:
             raise NotFoundException(entity="User", entity_id=role.id)
@@ -36,11 +46,12 @@ class UserRepository:
 
         user.roles.append(role_instance)
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        self.session.flush()
         return user
 
     def remove_role(self, role: UserSetRole):
+        """Stage a role removal (committed by the unit of work; the caller
+        then invalidates the user's cached permissions)."""
         user = self.session.get(User, role.id)
         if not user:
             raise NotFoundException(entity="User", entity_id=role.id)
@@ -54,6 +65,5 @@ class UserRepository:
 
         user.roles.remove(role_instance)
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        self.session.flush()
         return user
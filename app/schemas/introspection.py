@@ -0,0 +1,11 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class IntrospectBatchRequest(BaseModel):
+    tokens: List[str] = Field(
+        min_length=1, max_length=settings.INTROSPECTION_BATCH_MAX_TOKENS
+    )
@@ -0,0 +1,246 @@
+import secrets
+from datetime import datetime, timedelta
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.security.introspection_cache import MISS, introspection_cache
+from app.core.security.jwt_access_token import is_jwt, jwt_access_token_codec
+from app.core.security.revocation_list import revocation_list
+from app.core.token_store import AsyncTokenStore, get_async_token_store
+from app.domain.tokens.access_token_claims import AccessTokenClaims
+from app.domain.tokens.token_response import InstrospectResponse
+from app.models.access_token import AccessToken
+from app.models.refresh_token import RefreshToken
+from app.repositories.async_app_settings_repository import AsyncAppSettingRepository
+from app.services.token_service import (
+    RefreshTokenReuseError,
+    TokenPair,
+    TokenService,
+)
+from app.utils.dates import generate_date_now, to_naive_utc
+
+
+class AsyncTokenService:
+    """
+    Versión async de TokenService para /token, la introspección y la
+    revocación de un token (DATABASE_ASYNC). Misma lógica y mismos helpers;
+    las revocaciones en bloque y el feed de revocaciones siguen en TokenService.
+    """
+
+    def __init__(self, session: AsyncSession, store: AsyncTokenStore | None = None):
+        self.session = session
+        self.store = store or get_async_token_store(session)
+        self.app_settings_repo = AsyncAppSettingRepository(session)
+
+    async def _ttls(self) -> tuple[int, int]:
+        ttl_access = int(await self.app_settings_repo.get("ttl_access_token", 1800))
+        ttl_refresh = int(await self.app_settings_repo.get("ttl_refresh_token", 604800))
+        return ttl_access, ttl_refresh
+
+    async def _authz_claim(self, user_id) -> str | None:
+        if not settings.TOKEN_AUTHZ_CLAIMS:
+            return None
+        # Catálogo y máscaras salen de la caché en memoria casi siempre; los
+        # repositorios de roles son sync, se usan sobre la misma conexión
+        return await self.session.run_sync(TokenService._authz_claim, user_id)
+
+    async def issue_tokens(self, user_id, client_id, scope) -> TokenPair:
+        now = generate_date_now()
+        refresh_token = secrets.token_urlsafe(48)
+        ttl_access, ttl_refresh = await self._ttls()
+
+        rt = RefreshToken(
+            token=refresh_token,
+            user_id=user_id,
+            client_id=client_id,
+            scope=scope,
+            expires_at=now + timedelta(seconds=ttl_refresh),
+            revoked=False,
+        )
+        # Primer token del linaje: es la raíz de su familia
+        rt.family_id = rt.id
+        new_rt = await self.store.add_refresh_token(rt)
+
+        at_expires_at = now + timedelta(seconds=ttl_access)
+        authz = await self._authz_claim(user_id)
+        access_token, stored_token = TokenService._generate_access_token(
+            user_id, client_id, scope, at_expires_at, authz
+        )
+        await self.store.add_access_token(
+            AccessToken(
+                token=stored_token,
+                user_id=user_id,
+                client_id=client_id,
+                scope=scope,
+                expires_at=at_expires_at,
+                revoked=False,
+                refresh_token_id=new_rt.id,
+                authz=TokenService._stored_authz(authz),
+            )
+        )
+        return TokenPair(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=ttl_access,
+        )
+
+    async def refresh_with_rotation(
+        self, refresh_token_str: str, client_id: str
+    ) -> TokenPair:
+        """Usa refresh token para emitir nuevo access + rotar refresh token
+        (compare-and-swap y reuse detection, como TokenService)."""
+        now = generate_date_now()
+        ttl_access, ttl_refresh = await self._ttls()
+
+        rt = await self.store.claim_refresh_token(refresh_token_str, client_id)
+        if not rt:
+            await self._reject_refresh(refresh_token_str, client_id)
+
+        new_refresh_token_str = secrets.token_urlsafe(48)
+        new_rt = RefreshToken(
+            token=new_refresh_token_str,
+            user_id=rt.user_id,
+            client_id=rt.client_id,
+            scope=rt.scope,
+            expires_at=now + timedelta(seconds=ttl_refresh),
+            revoked=False,
+            created_at=now,
+            parent_id=rt.id,
+            replaced_by=None,
+            family_id=rt.family_id or rt.id,
+        )
+
+        at_expires_at = now + timedelta(seconds=ttl_access)
+        authz = await self._authz_claim(rt.user_id)
+        new_access_token_str, stored_token = TokenService._generate_access_token(
+            rt.user_id, rt.client_id, rt.scope, at_expires_at, authz
+        )
+        new_at = AccessToken(
+            token=stored_token,
+            user_id=rt.user_id,
+            client_id=rt.client_id,
+            scope=rt.scope,
+            expires_at=at_expires_at,
+            refresh_token_id=new_rt.id,
+            revoked=False,
+            authz=TokenService._stored_authz(authz),
+        )
+
+        await self.store.add_refresh_token(new_rt)
+        await self.store.add_access_token(new_at)
+
+        # Autoflush: los INSERT van antes que los UPDATE siguientes
+        await self._deny(await self.store.revoke_by_refresh(rt.id))
+        await self.store.set_replaced_by(rt.id, new_rt.id)
+
+        return TokenPair(
+            access_token=new_access_token_str,
+            refresh_token=new_refresh_token_str,
+            expires_in=ttl_access,
+        )
+
+    async def _reject_refresh(self, refresh_token_str: str, client_id: str) -> None:
+        """Raise the reason why a refresh token could not be claimed for rotation."""
+        rt = await self.store.get_refresh_token(refresh_token_str)
+        if not rt:
+            raise ValueError("invalid_grant")
+        if TokenService._rotated_recently(rt):
+            await self._revoke_family(rt, issued_after=to_naive_utc(rt.created_at))
+            raise RefreshTokenReuseError("Token already rotated")
+        if rt.revoked:
+            await self._revoke_family(rt)
+            raise RefreshTokenReuseError("Token revoked")
+        if str(rt.client_id) != str(client_id):
+            raise ValueError("Invalid client")
+        raise ValueError("Your token has been expired")
+
+    async def _revoke_family(
+        self, rt: RefreshToken, issued_after: datetime | None = None
+    ) -> None:
+        access_tokens, _ = await self.store.revoke_family(
+            rt.family_id or rt.id, issued_after
+        )
+        await self._deny(access_tokens)
+
+    async def _deny(self, access_tokens) -> None:
+        TokenService._deny_locally(self.session.sync_session, access_tokens)
+        if access_tokens and settings.ACCESS_TOKEN_FORMAT == "jwt":
+            await self.store.record_revocations(list(access_tokens))
+
+    async def get_active_access_token(self, token_str: str) -> AccessTokenClaims | None:
+        """Return the claims of a valid access token, or None."""
+        if is_jwt(token_str):
+            claims = jwt_access_token_codec.decode(token_str)
+            if not claims or revocation_list.is_revoked(claims.jti):
+                return None
+            return claims
+
+        claims = introspection_cache.get(token_str)
+        if claims is MISS:
+            claims = TokenService._active_claims(
+                await self.store.get_access_token(token_str)
+            )
+            introspection_cache.put(token_str, claims)
+        if claims and claims.expires_at < datetime.utcnow():
+            return None
+        return claims
+
+    async def get_active_access_tokens(
+        self, tokens: list[str]
+    ) -> list[AccessTokenClaims | None]:
+        """Like `get_active_access_token` for several tokens, in input order."""
+        results: dict[str, AccessTokenClaims | None] = {}
+        missing = []
+        for token_str in dict.fromkeys(tokens):
+            if is_jwt(token_str):
+                results[token_str] = await self.get_active_access_token(token_str)
+                continue
+            claims = introspection_cache.get(token_str)
+            if claims is MISS:
+                missing.append(token_str)
+            else:
+                results[token_str] = claims
+
+        found = await self.store.get_access_tokens(missing) if missing else {}
+        for token_str in missing:
+            claims = TokenService._active_claims(found.get(token_str))
+            introspection_cache.put(token_str, claims)
+            results[token_str] = claims
+
+        now = datetime.utcnow()
+        return [
+            None if claims and to_naive_utc(claims.expires_at) < now else claims
+            for claims in (results[token_str] for token_str in tokens)
+        ]
+
+    async def introspect(self, token_str: str) -> InstrospectResponse:
+        """Introspect an access token (opaque or JWT)."""
+        return TokenService._introspect_response(
+            await self.get_active_access_token(token_str)
+        )
+
+    async def introspect_many(self, tokens: list[str]) -> list[InstrospectResponse]:
+        """Introspect several access tokens; results come back in input order."""
+        return [
+            TokenService._introspect_response(claims)
+            for claims in await self.get_active_access_tokens(tokens)
+        ]
+
+    async def revoke_token(self, token_str: str):
+        """Revoke token (access opaco o JWT, o refresh)."""
+        if is_jwt(token_str):
+            claims = jwt_access_token_codec.decode(token_str)
+            if not claims:
+                return
+            token_str = claims.jti
+
+        at = await self.store.get_access_token(token_str)
+        if at:
+            await self.store.revoke_access_token(at)
+            await self._deny([(at.token, at.expires_at)])
+            return
+
+        rt = await self.store.get_refresh_token(token_str)
+        if rt:
+            await self._revoke_family(rt)
@@ -1,39 +1,87 @@
+import asyncio
 import base64
 import hashlib
 
 from fastapi import HTTPException
 from jose import jwt
 
-from app.core.store import authorization_code_store
+from app.core.code_store import authorization_code_store
+from app.core.key_ring import key_ring
+from app.core.store import AuthorizationCode
 from app.domain.tokens.authorization_code_grant_request import (
     AuthorizationCodeGrantRequest,
 )
 from app.domain.tokens.id_token_payload import IDTokenPayload
 from app.domain.tokens.token_response import GrantTokenResponse
 from app.repositories.app_settings_repository import AppSettingRepository
-from app.services.grants.token_grant_handler import TokenGrantHandler
-from app.services.token_service import TokenService
+from app.repositories.async_app_settings_repository import AsyncAppSettingRepository
+from app.services.async_token_service import AsyncTokenService
+from app.services.grants.token_grant_handler import (
+    AsyncTokenGrantHandler,
+    TokenGrantHandler,
+)
+from app.services.token_service import TokenPair, TokenService
 from app.utils.dates import generate_date_now, generate_expiration
 
 
+def verify_authorization_code(
+    data: AuthorizationCode | None, form_data: AuthorizationCodeGrantRequest
+) -> AuthorizationCode:
+    """Check the redeemed code against the request (client, redirect_uri, PKCE)."""
+    if not data:
+        raise HTTPException(status_code=400, detail="Invalid or expired code")
+
+    if (
+        data.redirect_uri != form_data.redirect_uri
+        or data.client_id != form_data.client_id
+    ):
+        raise HTTPException(status_code=400, detail="Invalid client or redirect_uri")
+
+    hashed = hashlib.sha256(form_data.code_verifier.encode()).digest()
+    calc_challenge = base64.urlsafe_b64encode(hashed).rstrip(b"=").decode()
+    if calc_challenge != data.code_challenge:
+        raise HTTPException(status_code=400, detail="Invalid PKCE code_verifier")
+    return data
+
+
+def build_grant_response(
+    settings, data: AuthorizationCode, token_pair: TokenPair, ttl_access_token: int
+) -> GrantTokenResponse:
+    """Sign the ID token and build the token endpoint response."""
+    id_token_payload = IDTokenPayload(
+        iss=settings.BASE_URL,
+        sub=str(data.user_id),
+        aud=data.client_id,
+        exp=generate_expiration(ttl_access_token),
+        iat=generate_date_now(),
+    )
+
+    signing_key = key_ring.signing_key
+    id_token = jwt.encode(
+        id_token_payload.to_dict(),
+        signing_key.private_key,
+        algorithm=signing_key.alg,
+        headers={"kid": signing_key.kid},
+    )
+
+    # Create uniform response
+    return GrantTokenResponse(
+        access_token=token_pair.access_token,
+        token_type="bearer",
+        expires_in=token_pair.expires_in,
+        id_token=id_token,
+        refresh_token=token_pair.refresh_token,
+        scope=data.scope,
+        user_id=data.user_id,
+        client_id=data.client_id,
+    )
+
+
 class AuthorizationCodeGrantHandler(TokenGrantHandler):
     def handle(self, form_data: AuthorizationCodeGrantRequest) -> GrantTokenResponse:
-        data = authorization_code_store.validate(form_data.code)
-        if not data:
-            raise HTTPException(status_code=400, detail="Invalid or expired code")
-
-        if (
-            data.redirect_uri != form_data.redirect_uri
-            or data.client_id != form_data.client_id
-        ):
-            raise HTTPException(
-                status_code=400, detail="Invalid client or redirect_uri"
-            )
-
-        hashed = hashlib.sha256(form_data.code_verifier.encode()).digest()
-        calc_challenge = base64.urlsafe_b64encode(hashed).rstrip(b"=").decode()
-        if calc_challenge != data.code_challenge:
-            raise HTTPException(status_code=400, detail="Invalid PKCE code_verifier")
+        data = verify_authorization_code(
+            authorization_code_store.validate(form_data.code), form_data
+        )
 
         # Create tokens from TokenService
         token_service = TokenService(self.session)
@@ -44,28 +92,24 @@ class AuthorizationCodeGrantHandler(TokenGrantHandler):
         # Create ID Token
         app_settings = AppSettingRepository(self.session)
         ttl_access_token = int(app_settings.get("ttl_access_token", 30))
-        id_token_payload = IDTokenPayload(
-            iss=self.settings.BASE_URL,
-            sub=str(data.user_id),
-            aud=form_data.client_id,
-            exp=generate_expiration(ttl_access_token),
-            iat=generate_date_now(),
-        )
+        return build_grant_response(self.settings, data, token_pair, ttl_access_token)
 
-        id_token = jwt.encode(
-            id_token_payload.to_dict(),
-            open(self.settings.PRIVATE_KEY_PATH).read(),
-            algorithm="RS256",
+
+class AsyncAuthorizationCodeGrantHandler(AsyncTokenGrantHandler):
+    async def handle(
+        self, form_data: AuthorizationCodeGrantRequest
+    ) -> GrantTokenResponse:
+        # Los backends compartidos de códigos (sql, sqlite, redis) son sync
+        data = verify_authorization_code(
+            await asyncio.to_thread(authorization_code_store.validate, form_data.code),
+            form_data,
         )
 
-        # Create uniform response
-        return GrantTokenResponse(
-            access_token=token_pair.access_token,
-            token_type="bearer",
-            expires_in=token_pair.expires_in,
-            id_token=id_token,
-            refresh_token=token_pair.refresh_token,
-            scope=data.scope,
-            user_id=data.user_id,
-            client_id=form_data.client_id,
+        token_service = AsyncTokenService(self.session)
+        token_pair = await token_service.issue_tokens(
+            user_id=data.user_id, client_id=form_data.client_id, scope=data.scope
         )
+
+        app_settings = AsyncAppSettingRepository(self.session)
+        ttl_access_token = int(await app_settings.get("ttl_access_token", 30))
+        return build_grant_response(self.settings, data, token_pair, ttl_access_token)
@@ -1,7 +1,34 @@
 from app.domain.tokens.token_response import FormTokenRequest, GrantTokenResponse
 from app.exceptions.bussiness_exceptions import TokenExpiredException
-from app.services.grants.token_grant_handler import TokenGrantHandler
-from app.services.token_service import TokenService
+from app.services.async_token_service import AsyncTokenService
+from app.services.grants.token_grant_handler import (
+    AsyncTokenGrantHandler,
+    TokenGrantHandler,
+)
+from app.services.token_service import RefreshTokenReuseError, TokenPair, TokenService
+
+
+def invalid_grant(e: ValueError) -> TokenExpiredException:
+    return TokenExpiredException(
+        details={
+            "error": "invalid_grant",
+            "error_description": str(e.args[0]),
+        }
+    )
+
+
+def build_grant_response(client_id: str, token_pair: TokenPair) -> GrantTokenResponse:
+    # Aquí podrías regenerar el ID token (opcional)
+    return GrantTokenResponse(
+        access_token=token_pair.access_token,
+        token_type="bearer",
+        expires_in=token_pair.expires_in,
+        id_token="",  # opcional si no se requiere renovar
+        refresh_token=token_pair.refresh_token,
+        scope="",
+        user_id="",
+        client_id=client_id,
+    )
 
 
 class RefreshTokenGrantHandler(TokenGrantHandler):
@@ -13,21 +40,26 @@ class RefreshTokenGrantHandler(TokenGrantHandler):
                 refresh_token_str=form_data.refresh_token, client_id=form_data.client_id
             )
         except ValueError as e:
-            raise TokenExpiredException(
-                details={
-                    "error": "invalid_grant",
-                    "error_description": str(e.args[0]),
-                }
+            if isinstance(e, RefreshTokenReuseError):
+                # La revocación por reuse debe persistir aunque el grant falle
+                self.session.commit()
+            raise invalid_grant(e)
+
+        return build_grant_response(form_data.client_id, token_pair)
+
+
+class AsyncRefreshTokenGrantHandler(AsyncTokenGrantHandler):
+    async def handle(self, form_data: FormTokenRequest) -> GrantTokenResponse:
+        token_service = AsyncTokenService(self.session)
+
+        try:
+            token_pair = await token_service.refresh_with_rotation(
+                refresh_token_str=form_data.refresh_token, client_id=form_data.client_id
             )
+        except ValueError as e:
+            if isinstance(e, RefreshTokenReuseError):
+                # La revocación por reuse debe persistir aunque el grant falle
+                await self.session.commit()
+            raise invalid_grant(e)
 
-        # Aquí podrías regenerar el ID token (opcional)
-        return GrantTokenResponse(
-            access_token=token_pair.access_token,
-            token_type="bearer",
-            expires_in=token_pair.expires_in,
-            id_token="",  # opcional si no se requiere renovar
-            refresh_token=token_pair.refresh_token,
-            scope="",
-            user_id="",
-            client_id=form_data.client_id,
-        )
+        return build_grant_response(form_data.client_id, token_pair)
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict
 
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import Settings
 from app.domain.tokens.token_response import GrantTokenResponse
@@ -15,3 +16,13 @@ class TokenGrantHandler(ABC):
     @abstractmethod
     def handle(self, form_data: Dict[str, Any]) -> GrantTokenResponse:
         pass
+
+
+class AsyncTokenGrantHandler(ABC):
+    def __init__(self, settings: Settings, session: AsyncSession):
+        self.settings = settings
+        self.session = session
+
+    @abstractmethod
+    async def handle(self, form_data: Dict[str, Any]) -> GrantTokenResponse:
+        pass
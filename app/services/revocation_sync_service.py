@@ -0,0 +1,26 @@
+import asyncio
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.token_service import TokenService
+
+
+class RevocationSyncService:
+    def __init__(self, interval_seconds: int = 30):
+        """
+        interval_seconds: time interval between deny-list refreshes in seconds
+        """
+        self.interval_seconds = interval_seconds
+
+    async def start(self):
+        while True:
+            await asyncio.to_thread(self.sync_revocation_list)
+            await asyncio.sleep(self.interval_seconds)
+
+    def sync_revocation_list(self):
+        # Los JWT se verifican localmente; este refresco propaga revocaciones
+        # hechas por otros workers sin consultar la BD en cada request.
+        with Session(engine) as session:
+            size = TokenService(session).sync_revocation_list()
+        print(f"[RevocationSyncService] {size} tokens revocados vigentes.")
@@ -1,31 +1,129 @@
 import asyncio
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
-from sqlmodel import Session, delete
+from sqlmodel import Session
 
+from app.core.config import settings
 from app.core.db import engine
-from app.models.access_token import AccessToken
-from app.models.refresh_token import RefreshToken
+from app.repositories.access_token_repository import AccessTokenRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.revocation_event_repository import RevocationEventRepository
+
+
+@dataclass
+class CleanupMetrics:
+    runs: int = 0
+    last_run_at: datetime | None = None
+    last_duration_seconds: float = 0.0
+    last_access_tokens_deleted: int = 0
+    last_refresh_tokens_deleted: int = 0
+    last_revocation_events_deleted: int = 0
+    # True si la última corrida se detuvo por el presupuesto de tiempo
+    last_budget_exhausted: bool = False
+    total_access_tokens_deleted: int = 0
+    total_refresh_tokens_deleted: int = 0
+    last_error: str | None = None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        if self.last_run_at:
+            data["last_run_at"] = self.last_run_at.isoformat()
+        return data
 
 
 class TokenCleanupService:
-    def __init__(self, interval_seconds: int = 300):
+    def __init__(
+        self,
+        interval_seconds: int = 300,
+        batch_size: int = 1000,
+        time_budget_seconds: float = 5.0,
+    ):
         """
         interval_seconds: time interval between cleanup runs in seconds
+        batch_size: max rows deleted per statement (one transaction per batch)
+        time_budget_seconds: max time of a run; the rest waits for the next run
         """
         self.interval_seconds = interval_seconds
-        self._task = None
+        self.batch_size = batch_size
+        self.time_budget_seconds = time_budget_seconds
+        self.metrics = CleanupMetrics()
 
     async def start(self):
         while True:
-            self.cleanup_expired_tokens()
+            # Fuera del event loop: los DELETE no bloquean los requests
+            try:
+                await asyncio.to_thread(self.cleanup_expired_tokens)
+            except Exception as e:
+                self.metrics.last_error = repr(e)
+                print(f"[TokenCleanupService] Error limpiando tokens: {e!r}")
             await asyncio.sleep(self.interval_seconds)
 
-    def cleanup_expired_tokens(self):
+    def cleanup_expired_tokens(self) -> CleanupMetrics:
         print("[TokenCleanupService] Limpiando tokens expirados...")
-        with Session(engine) as session:
-            now = datetime.utcnow()
-            session.exec(delete(AccessToken).where(AccessToken.expires_at < now))
-            session.exec(delete(RefreshToken).where(RefreshToken.expires_at < now))
-            session.commit()
-        print("[TokenCleanupService] Tokens expirados eliminados.")
+        started = time.monotonic()
+        deadline = started + self.time_budget_seconds
+        now = datetime.utcnow()
+
+        # Orden de FKs: primero access tokens, luego refresh tokens
+        access_deleted, exhausted = self._delete_in_batches(
+            lambda session: AccessTokenRepository(session).delete_expired(
+                now, self.batch_size
+            ),
+            deadline,
+        )
+        refresh_deleted = 0
+        if not exhausted:
+            refresh_deleted, exhausted = self._delete_in_batches(
+                lambda session: RefreshTokenRepository(session).delete_expired(
+                    now, self.batch_size
+                ),
+                deadline,
+            )
+        events_deleted = 0
+        if not exhausted:
+            events_deleted, exhausted = self._delete_in_batches(
+                lambda session: RevocationEventRepository(session).delete_expired(
+                    now, self.batch_size
+                ),
+                deadline,
+            )
+
+        metrics = self.metrics
+        metrics.runs += 1
+        metrics.last_run_at = now
+        metrics.last_duration_seconds = round(time.monotonic() - started, 3)
+        metrics.last_access_tokens_deleted = access_deleted
+        metrics.last_refresh_tokens_deleted = refresh_deleted
+        metrics.last_revocation_events_deleted = events_deleted
+        metrics.last_budget_exhausted = exhausted
+        metrics.total_access_tokens_deleted += access_deleted
+        metrics.total_refresh_tokens_deleted += refresh_deleted
+        metrics.last_error = None
+        print(
+            f"[TokenCleanupService] {access_deleted} access y {refresh_deleted} "
+            f"refresh tokens eliminados en {metrics.last_duration_seconds}s."
+        )
+        return metrics
+
+    def _delete_in_batches(self, delete_batch, deadline: float) -> tuple[int, bool]:
+        """Run `delete_batch` in short transactions until it deletes less than a
+        full batch or the deadline passes. Returns (rows deleted, budget exhausted)."""
+        deleted = 0
+        while True:
+            with Session(engine) as session:
+                count = delete_batch(session)
+                session.commit()
+            deleted += count
+            if count < self.batch_size:
+                return deleted, False
+            if time.monotonic() >= deadline:
+                return deleted, True
+
+
+token_cleanup_service = TokenCleanupService(
+    interval_seconds=settings.TOKEN_CLEANUP_INTERVAL_SECONDS,
+    batch_size=settings.TOKEN_CLEANUP_BATCH_SIZE,
+    time_budget_seconds=settings.TOKEN_CLEANUP_TIME_BUDGET_SECONDS,
+)
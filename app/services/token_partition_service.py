@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.repositories.revocation_event_repository import RevocationEventRepository
+from app.repositories.token_partition_repository import TokenPartitionRepository
+
+TOKEN_TABLES = ("access_tokens", "refresh_tokens")
+
+
+class TokenPartitionService:
+    def __init__(
+        self,
+        interval_seconds: int = 3600,
+        premake_days: int = 14,
+        retention_days: int = 1,
+    ):
+        """
+        interval_seconds: time interval between maintenance runs in seconds
+        premake_days: days ahead with partitions already created; must cover the
+            longest token TTL or inserts fail with no partition for the row
+        retention_days: days an expired partition is kept before dropping it
+        """
+        self.interval_seconds = interval_seconds
+        self.premake_days = premake_days
+        self.retention_days = retention_days
+
+    async def start(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.maintain_partitions)
+            except Exception as e:
+                print(f"[TokenPartitionService] Error en mantenimiento: {e!r}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def tables_partitioned(self) -> bool:
+        """Whether every token table is partitioned (always False off PostgreSQL)."""
+        with Session(engine) as session:
+            repo = TokenPartitionRepository(session)
+            return all(repo.is_partitioned(table) for table in TOKEN_TABLES)
+
+    def convert_tables(
+        self, partitioned: bool = True, today: date | None = None
+    ) -> list[str]:
+        """
+        Rebuild the token tables as daily-partitioned tables (or back to plain
+        tables), in one transaction. Tables already in the requested form are
+        left alone. Returns the converted tables.
+        """
+        # expires_at se guarda en UTC sin zona: los días también son UTC
+        today = today or datetime.utcnow().date()
+        # access_tokens primero al particionar: su FK a refresh_tokens se
+        # elimina con la tabla; al revés para volver a tablas simples
+        tables = TOKEN_TABLES if partitioned else TOKEN_TABLES[::-1]
+        converted = []
+        with Session(engine) as session:
+            repo = TokenPartitionRepository(session)
+            if session.get_bind().dialect.name != "postgresql":
+                raise RuntimeError("Token table partitioning requires PostgreSQL")
+            for table in tables:
+                if repo.is_partitioned(table) == partitioned:
+                    continue
+                repo.rebuild(
+                    table,
+                    partitioned,
+                    first_day=today - timedelta(days=self.retention_days),
+                    last_day=today + timedelta(days=self.premake_days),
+                )
+                converted.append(table)
+            session.commit()
+        return converted
+
+    def maintain_partitions(self, today: date | None = None) -> dict:
+        """Create the partitions for the next days and drop the expired ones."""
+        # expires_at se guarda en UTC sin zona: los días también son UTC
+        today = today or datetime.utcnow().date()
+        cutoff = today - timedelta(days=self.retention_days)
+        created, dropped = [], []
+        with Session(engine) as session:
+            repo = TokenPartitionRepository(session)
+            for table in TOKEN_TABLES:
+                partitions = repo.list_partitions(table)
+                for offset in range(self.premake_days + 1):
+                    day = today + timedelta(days=offset)
+                    if day not in partitions:
+                        created.append(repo.create_partition(table, day))
+                # Una partición del día D solo tiene tokens que expiran antes de D+1
+                for day, name in sorted(partitions.items()):
+                    if day < cutoff:
+                        repo.drop_partition(name)
+                        dropped.append(name)
+            # El feed de revocaciones no está particionado: DELETE acotado
+            RevocationEventRepository(session).delete_expired(
+                datetime.utcnow(), settings.TOKEN_CLEANUP_BATCH_SIZE
+            )
+            session.commit()
+        print(
+            f"[TokenPartitionService] {len(created)} particiones creadas, "
+            f"{len(dropped)} eliminadas."
+        )
+        return {"created": created, "dropped": dropped}
+
+
+token_partition_service = TokenPartitionService(
+    interval_seconds=settings.TOKEN_PARTITION_MAINTENANCE_SECONDS,
+    premake_days=settings.TOKEN_PARTITION_PREMAKE_DAYS,
+    retention_days=settings.TOKEN_PARTITION_RETENTION_DAYS,
+)
@@ -1,15 +1,46 @@
 import secrets
 from dataclasses import dataclass
-from datetime import timedelta, timezone
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
 
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import Session
 
+from app.core.config import settings
+from app.core.security.bloom_filter import BloomFilter
+from app.core.security.introspection_cache import MISS, introspection_cache
+from app.core.security.jwt_access_token import is_jwt, jwt_access_token_codec
+from app.core.security.revocation_list import revocation_list
+from app.core.token_store import TokenStore, get_token_store
+from app.domain.tokens.access_token_claims import AccessTokenClaims
+from app.domain.tokens.revocation_feed import RevocationDelta, RevocationSnapshot
+from app.domain.tokens.token_response import InstrospectResponse
 from app.models.access_token import AccessToken
 from app.models.refresh_token import RefreshToken
-from app.repositories.access_token_repository import AccessTokenRepository
 from app.repositories.app_settings_repository import AppSettingRepository
-from app.repositories.refresh_token_repository import RefreshTokenRepository
-from app.utils.dates import generate_date_now, generate_expiration
+from app.services.user_service import UserService
+from app.utils.dates import generate_date_now, to_naive_utc
+
+# Clave de Session.info con los tokens revocados en la transacción en curso
+PENDING_INVALIDATIONS = "introspection_cache_invalidations"
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session: OrmSession) -> None:
+    """Drop the introspection cache entries of the tokens revoked in the
+    transaction just committed."""
+    for token in session.info.pop(PENDING_INVALIDATIONS, ()):
+        introspection_cache.invalidate(token)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending_invalidations(session: OrmSession) -> None:
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+class RefreshTokenReuseError(ValueError):
+    """A rotated or revoked refresh token was presented again."""
 
 
 @dataclass
@@ -26,11 +57,23 @@ class TokenPair:
         }
 
 
+@dataclass
+class RevocationCount:
+    access_tokens: int
+    refresh_tokens: int
+
+    def to_dict(self):
+        return {
+            "access_tokens": self.access_tokens,
+            "refresh_tokens": self.refresh_tokens,
+        }
+
+
 class TokenService:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, store: TokenStore | None = None):
         self.session = session
-        self.rt_repo = RefreshTokenRepository(session)
-        self.at_repo = AccessTokenRepository(session)
+        # Backend de tokens según TOKEN_STORE_BACKEND (SQL por defecto)
+        self.store = store or get_token_store(session)
         self.app_settings_repo = AppSettingRepository(session)
 
     def _now(self):
@@ -38,17 +81,49 @@ class TokenService:
 
     def create_refresh_token(self, rt: RefreshToken) -> RefreshToken:
         """Create and store a new refresh token."""
-        new_token = self.rt_repo.create(rt)
+        new_token = self.store.add_refresh_token(rt)
         return new_token
 
     def create_access_token(self, at: AccessToken) -> AccessToken:
         """Create and store a new access token."""
-        new_token = self.at_repo.create(at)
+        new_token = self.store.add_access_token(at)
         return new_token
 
+    @staticmethod
+    def _authz_claim(session: Session, user_id) -> str | None:
+        """Role and permission claim of a new access token (TOKEN_AUTHZ_CLAIMS),
+        None when disabled or longer than TOKEN_AUTHZ_CLAIMS_MAX_BYTES."""
+        if not settings.TOKEN_AUTHZ_CLAIMS:
+            return None
+        claim = UserService(session).get_effective_permissions(user_id).to_claim()
+        if len(claim) > settings.TOKEN_AUTHZ_CLAIMS_MAX_BYTES:
+            return None
+        return claim
+
+    @staticmethod
+    def _generate_access_token(
+        user_id, client_id, scope, expires_at: datetime, authz: str | None = None
+    ) -> tuple[str, str]:
+        """Generate the access token for the client and the value stored in DB.
+        Opaque tokens are stored as-is; JWT access tokens store only their jti.
+        """
+        if settings.ACCESS_TOKEN_FORMAT == "jwt":
+            jti = secrets.token_urlsafe(16)
+            claims = AccessTokenClaims(
+                jti=jti,
+                user_id=user_id,
+                client_id=client_id,
+                scope=scope,
+                expires_at=expires_at,
+                authz=authz,
+            )
+            return jwt_access_token_codec.encode(claims), jti
+
+        token = secrets.token_urlsafe(32)
+        return token, token
+
     def issue_tokens(self, user_id, client_id, scope) -> TokenPair:
         now = self._now()
-        access_token = secrets.token_urlsafe(32)
         refresh_token = secrets.token_urlsafe(48)
 
         ttl_access = int(self.app_settings_repo.get("ttl_access_token", 1800))
@@ -62,22 +137,30 @@ class TokenService:
             expires_at=now + timedelta(seconds=ttl_refresh),
             revoked=False,
         )
+        # Primer token del linaje: es la raíz de su familia
+        rt.family_id = rt.id
 
         # Refresh token
-        new_rt = self.rt_repo.create(rt)
+        new_rt = self.store.add_refresh_token(rt)
 
+        at_expires_at = now + timedelta(seconds=ttl_access)
+        authz = self._authz_claim(self.session, user_id)
+        access_token, stored_token = self._generate_access_token(
+            user_id, client_id, scope, at_expires_at, authz
+        )
         at_token = AccessToken(
-            token=access_token,
+            token=stored_token,
             user_id=user_id,
             client_id=client_id,
             scope=scope,
-            expires_at=now + timedelta(seconds=ttl_access),
+            expires_at=at_expires_at,
             revoked=False,
             refresh_token_id=new_rt.id,
+            authz=self._stored_authz(authz),
         )
 
         # Access token
-        self.at_repo.create(at_token)
+        self.store.add_access_token(at_token)
 
         # TODO: Return additional info (token type, scope, etc)
         return TokenPair(
@@ -90,71 +173,59 @@ class TokenService:
         self, refresh_token_str: str, client_id: str
     ) -> TokenPair:
         """Usa refresh token para emitir nuevo access + rotar refresh token.
+        El refresh token se reclama con un UPDATE condicional (compare-and-swap):
+        de varias rotaciones concurrentes con el mismo token solo una gana.
         Detecta reuse si refresh token ya fue revocado.
         """
         now = self._now()
-        rt = self.rt_repo.get(refresh_token_str)
-
         ttl_access = int(self.app_settings_repo.get("ttl_access_token", 1800))
         ttl_refresh = int(self.app_settings_repo.get("ttl_refresh_token", 604800))
 
+        rt = self.store.claim_refresh_token(refresh_token_str, client_id)
         if not rt:
-            # token desconocido -> posible reuse o ataque: no devolver detalle
-            raise ValueError("invalid_grant")
-
-        # Si el refresh token está revocado -> reuse detection
-        if rt.revoked:
-            # reutilización detectada: revocar cadena completa asociada a este lineage
-            self.rt_repo.revoke_chain(rt)
-            # revocar accesos derivados
-            self.at_repo.revoke_by_refresh(rt.id)
-            raise ValueError("Token revoked")
-
-        # Si expiró
-        # TODO: Fix `TypeError: can't compare offset-naive and offset-aware datetimes`
-        exp = rt.expires_at.replace(tzinfo=timezone.utc)
-        if exp < now:
-            raise ValueError("Your token has been expired")
+            self._reject_refresh(refresh_token_str, client_id)
 
-        # Validar que el client_id coincide
-        if str(rt.client_id) != str(client_id):
-            raise ValueError("Invalid client")
-
-        # ROTACIÓN: crear nuevo refresh token y marcar reemplazo
+        # ROTACIÓN: crear nuevo refresh token ligado al anterior
         new_refresh_token_str = secrets.token_urlsafe(48)
         new_rt = RefreshToken(
             token=new_refresh_token_str,
             user_id=rt.user_id,
             client_id=rt.client_id,
             scope=rt.scope,
-            expires_at=generate_expiration(ttl_refresh),
+            expires_at=now + timedelta(seconds=ttl_refresh),
             revoked=False,
             created_at=now,
             parent_id=rt.id,
             replaced_by=None,
+            family_id=rt.family_id or rt.id,
         )
 
-        rt_repsonse = self.rt_repo.create(new_rt)
-
-        # crear nuevo access token ligado al rt_repsonse
-        new_access_token_str = secrets.token_urlsafe(32)
+        # crear nuevo access token ligado al nuevo refresh token
+        # Roles y permisos actuales: la rotación recoge los cambios de roles
+        at_expires_at = now + timedelta(seconds=ttl_access)
+        authz = self._authz_claim(self.session, rt.user_id)
+        new_access_token_str, stored_token = self._generate_access_token(
+            rt.user_id, rt.client_id, rt.scope, at_expires_at, authz
+        )
 
         new_at = AccessToken(
-            token=new_access_token_str,
+            token=stored_token,
             user_id=rt.user_id,
             client_id=rt.client_id,
             scope=rt.scope,
-            expires_at=generate_expiration(ttl_access),
-            refresh_token_id=rt_repsonse.id,
+            expires_at=at_expires_at,
+            refresh_token_id=new_rt.id,
             revoked=False,
+            authz=self._stored_authz(authz),
         )
 
-        # Revoke old token and generate new one
-        self.at_repo.revoke_by_refresh(rt.id)
-        self.at_repo.create(new_at)
+        self.store.add_refresh_token(new_rt)
+        self.store.add_access_token(new_at)
 
-        # Marcar el antiguo como reemplazado (revocar)
-        self.rt_repo.mark_replaced(rt, new_rt)
+        # Los UPDATE siguientes hacen autoflush: los INSERT van primero, así
+        # `replaced_by` ya apunta a una fila existente.
+        self._deny(self.store.revoke_by_refresh(rt.id))
+        self.store.set_replaced_by(rt.id, new_rt.id)
 
         # TODO: Return additional info (token type, scope, etc)
         return TokenPair(
@@ -163,19 +234,261 @@ class TokenService:
             expires_in=ttl_access,
         )
 
+    def _reject_refresh(self, refresh_token_str: str, client_id: str) -> None:
+        """Raise the reason why a refresh token could not be claimed for rotation."""
+        rt = self.store.get_refresh_token(refresh_token_str)
+        if not rt:
+            # token desconocido -> posible reuse o ataque: no devolver detalle
+            raise ValueError("invalid_grant")
+
+        # Rotado hace instantes (REFRESH_TOKEN_REUSE_GRACE_SECONDS): puede ser
+        # una petición concurrente, pero también un token robado usado primero.
+        # Se revocan los tokens emitidos por esa rotación y las siguientes,
+        # sin tocar el resto de la familia
+        if self._rotated_recently(rt):
+            self._revoke_family(rt, issued_after=to_naive_utc(rt.created_at))
+            raise RefreshTokenReuseError("Token already rotated")
+
+        # Si el refresh token está revocado -> reuse detection
+        if rt.revoked:
+            # reutilización detectada: revocar la familia completa y sus accesos
+            self._revoke_family(rt)
+            raise RefreshTokenReuseError("Token revoked")
+
+        # Validar que el client_id coincide
+        if str(rt.client_id) != str(client_id):
+            raise ValueError("Invalid client")
+
+        raise ValueError("Your token has been expired")
+
+    @staticmethod
+    def _rotated_recently(rt: RefreshToken) -> bool:
+        """Whether the token was rotated less than REFRESH_TOKEN_REUSE_GRACE_SECONDS ago."""
+        if (
+            settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS <= 0
+            or not rt.revoked
+            or rt.rotated_at is None
+        ):
+            return False
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        return datetime.utcnow() - to_naive_utc(rt.rotated_at) <= grace
+
+    def _revoke_family(
+        self, rt: RefreshToken, issued_after: datetime | None = None
+    ) -> None:
+        """Revoke the rotation lineage of a refresh token and its access tokens
+        (only the tokens issued after `issued_after`, if given)."""
+        # Tokens previos a `family_id` forman su propia familia
+        access_tokens, _ = self.store.revoke_family(rt.family_id or rt.id, issued_after)
+        self._deny(access_tokens)
+
+    def _deny(self, access_tokens) -> None:
+        """Add revoked access tokens (token, expires_at) to the local deny-list
+        and drop their cached introspection results. JWT revocations are also
+        published in the revocation feed for the resource servers."""
+        self._deny_locally(self.session, access_tokens)
+        if access_tokens and settings.ACCESS_TOKEN_FORMAT == "jwt":
+            self.store.record_revocations(list(access_tokens))
+
+    @staticmethod
+    def _deny_locally(session: Session, access_tokens) -> None:
+        for token, expires_at in access_tokens:
+            revocation_list.add(token, expires_at)
+        TokenService._forget_cached(session, [token for token, _ in access_tokens])
+
+    @staticmethod
+    def _forget_cached(session: Session, tokens: list[str]) -> None:
+        """Drop the cached introspection results of `tokens`, now and after commit."""
+        for token in tokens:
+            introspection_cache.invalidate(token)
+        # Una introspección concurrente puede leer la fila aún sin cambios y
+        # volver a guardarla: se descarta de nuevo tras el commit
+        pending = session.info.setdefault(PENDING_INVALIDATIONS, set())
+        pending.update(tokens)
+
+    def get_active_access_token(self, token_str: str) -> AccessTokenClaims | None:
+        """Return the claims of a valid access token, or None.
+        JWT access tokens are verified locally (signature, exp and deny-list)
+        without a DB round trip; opaque tokens are looked up in the DB through
+        the introspection cache.
+        """
+        if is_jwt(token_str):
+            claims = jwt_access_token_codec.decode(token_str)
+            if not claims or revocation_list.is_revoked(claims.jti):
+                return None
+            return claims
+
+        claims = introspection_cache.get(token_str)
+        if claims is MISS:
+            claims = self._active_claims(self.store.get_access_token(token_str))
+            introspection_cache.put(token_str, claims)
+        if claims and claims.expires_at < datetime.utcnow():
+            return None
+        return claims
+
+    def get_active_access_tokens(
+        self, tokens: list[str]
+    ) -> list[AccessTokenClaims | None]:
+        """Like `get_active_access_token` for several tokens, in input order.
+        Opaque tokens missing from the introspection cache are fetched with a
+        single store lookup."""
+        results: dict[str, AccessTokenClaims | None] = {}
+        missing = []
+        for token_str in dict.fromkeys(tokens):
+            if is_jwt(token_str):
+                results[token_str] = self.get_active_access_token(token_str)
+                continue
+            claims = introspection_cache.get(token_str)
+            if claims is MISS:
+                missing.append(token_str)
+            else:
+                results[token_str] = claims
+
+        found = self.store.get_access_tokens(missing) if missing else {}
+        for token_str in missing:
+            claims = self._active_claims(found.get(token_str))
+            introspection_cache.put(token_str, claims)
+            results[token_str] = claims
+
+        now = datetime.utcnow()
+        return [
+            None if claims and to_naive_utc(claims.expires_at) < now else claims
+            for claims in (results[token_str] for token_str in tokens)
+        ]
+
+    @staticmethod
+    def _stored_authz(authz: str | None) -> str | None:
+        # Los JWT ya llevan el claim; solo el registro de los opacos lo guarda
+        return None if settings.ACCESS_TOKEN_FORMAT == "jwt" else authz
+
+    @staticmethod
+    def _active_claims(at: AccessToken | None) -> AccessTokenClaims | None:
+        if not at or at.revoked or at.expires_at < datetime.utcnow():
+            return None
+        return AccessTokenClaims(
+            jti=at.token,
+            user_id=at.user_id,
+            client_id=at.client_id,
+            scope=at.scope,
+            expires_at=at.expires_at,
+            authz=at.authz,
+        )
+
+    @staticmethod
+    def _introspect_response(claims: AccessTokenClaims | None) -> InstrospectResponse:
+        if not claims:
+            return InstrospectResponse(active=False)
+
+        def timestamp(value: datetime | None) -> int | None:
+            if value is None:
+                return None
+            return int(to_naive_utc(value).replace(tzinfo=timezone.utc).timestamp())
+
+        return InstrospectResponse(
+            active=True,
+            client_id=claims.client_id,
+            sub=str(claims.user_id),
+            scope=" ".join(claims.scope or []),
+            exp=timestamp(claims.expires_at),
+            iat=timestamp(claims.issued_at),
+            token_type="Bearer",
+        )
+
+    def introspect(self, token_str: str) -> InstrospectResponse:
+        """Introspect an access token (opaque or JWT)."""
+        return self._introspect_response(self.get_active_access_token(token_str))
+
+    def introspect_many(self, tokens: list[str]) -> list[InstrospectResponse]:
+        """Introspect several access tokens; results come back in input order."""
+        return [
+            self._introspect_response(claims)
+            for claims in self.get_active_access_tokens(tokens)
+        ]
+
+    def sync_revocation_list(self) -> int:
+        """Reload the deny-list of revoked JWT access tokens from the DB."""
+        revocation_list.replace(self.store.list_revoked_access_tokens())
+        return len(revocation_list)
+
+    def revocation_snapshot(self, format: str = "list") -> RevocationSnapshot:
+        """Revoked JWT access tokens not yet expired, as a sorted jti list or a
+        Bloom filter. The version is read first: deltas from it may repeat ids
+        already in the snapshot, but never miss one."""
+        version = self.store.revocation_feed_version()
+        ids = sorted({jti for jti, _ in self.store.list_revoked_access_tokens()})
+        if format == "bloom":
+            bloom = BloomFilter.for_capacity(
+                len(ids), settings.REVOCATION_FEED_BLOOM_FP_RATE
+            )
+            for jti in ids:
+                bloom.add(jti)
+            return RevocationSnapshot(
+                version=version, format=format, count=len(ids), bloom=bloom.to_dict()
+            )
+        return RevocationSnapshot(
+            version=version, format="list", count=len(ids), ids=ids
+        )
+
+    def revocation_deltas(self, after: int) -> RevocationDelta:
+        """JWT access tokens revoked after the `after` version."""
+        limit = settings.REVOCATION_FEED_MAX_EVENTS
+        events = self.store.list_revocation_events(after, limit)
+        return RevocationDelta(
+            version=events[-1][0] if events else after,
+            ids=[jti for _, jti in events],
+            has_more=len(events) == limit,
+        )
+
     def revoke_token(self, token_str: str):
-        """Revoke token opaco (access o refresh)."""
-        at = self.at_repo.get(token_str)
+        """Revoke token (access opaco o JWT, o refresh)."""
+        if is_jwt(token_str):
+            claims = jwt_access_token_codec.decode(token_str)
+            if not claims:
+                # firma inválida o expirado -> nada que revocar
+                return
+            token_str = claims.jti
+
+        at = self.store.get_access_token(token_str)
         if at:
-            self.at_repo.revoke(at)
+            self.store.revoke_access_token(at)
+            self._deny([(at.token, at.expires_at)])
             return
 
-        rt = self.rt_repo.get(token_str)
+        rt = self.store.get_refresh_token(token_str)
         if rt:
-            # revocar cadena (refresh y descendientes) y sus access tokens
-            self.rt_repo.revoke_chain(rt)
-            self.at_repo.revoke_by_refresh(rt.id)
+            # revocar la familia (refresh rotados) y sus access tokens
+            self._revoke_family(rt)
             return
 
         # token desconocido -> ok (es idempotente según RFC)
         return
+
+    def revoke_by_user(self, user_id: UUID) -> RevocationCount:
+        """Revoke every token of a user ("logout everywhere")."""
+        return self._bulk_revoke(*self.store.revoke_by_user(user_id))
+
+    def drop_authz_claims(self, user_id: UUID) -> None:
+        """Make a role change apply to the access tokens already issued to a
+        user (TOKEN_AUTHZ_CLAIMS). Opaque tokens lose their stored claim and
+        fall back to the current masks. A JWT cannot be changed, so the user's
+        access tokens are revoked and the refresh token gets a new one."""
+        if not settings.TOKEN_AUTHZ_CLAIMS:
+            return
+        if settings.ACCESS_TOKEN_FORMAT == "jwt":
+            self._deny(self.store.revoke_access_by_user(user_id))
+        else:
+            self._forget_cached(self.session, self.store.clear_authz(user_id))
+
+    def revoke_by_client(self, client_id: str) -> RevocationCount:
+        """Revoke every token issued to a client application."""
+        return self._bulk_revoke(*self.store.revoke_by_client(client_id))
+
+    def revoke_by_tenant(self, tenant_id: UUID) -> RevocationCount:
+        """Revoke every token of the users and client applications of a tenant."""
+        return self._bulk_revoke(*self.store.revoke_by_tenant(tenant_id))
+
+    def _bulk_revoke(self, access_tokens, refresh_count: int) -> RevocationCount:
+        self._deny(access_tokens)
+        return RevocationCount(
+            access_tokens=len(access_tokens), refresh_tokens=refresh_count
+        )
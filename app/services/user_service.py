@@ -1,9 +1,13 @@
-from passlib.hash import pbkdf2_sha256
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from app.components.user.user_manager import UserManager
+from app.core.auth.permission_cache import permission_cache
+from app.core.auth.permission_catalog import EffectivePermissions, PermissionCatalog
+from app.core.security.hashing_pool import password_hashing_pool
 from app.models.user import User
+from app.repositories.permission_repository import PermissionRepository
+from app.repositories.role_repository import RoleRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserSetRole
 
@@ -28,12 +32,22 @@ class UserService:
     def authenticate_user(self, username: str, password: str) -> User | None:
         statement = select(User).where(User.username == username)
         user = self.session.exec(statement).first()
-        if user and pbkdf2_sha256.verify(password, user.password):
-            return user
-        return None
+        if not user:
+            return None
+        valid, new_hash = password_hashing_pool.verify_and_update(
+            password, user.password
+        )
+        if not valid:
+            return None
+        if new_hash:
+            # Hash con esquema o costos anteriores: se reemplaza, quien llama
+            # confirma la transacción
+            user.password = new_hash
+            self.session.add(user)
+        return user
 
     def reset_password(self, user: User, new_password: str) -> None:
-        hashed_pw = pbkdf2_sha256.hash(new_password)
+        hashed_pw = password_hashing_pool.hash(new_password)
         user.password = hashed_pw
         self.session.add(user)
         self.session.commit()
@@ -43,6 +57,37 @@ class UserService:
         query = select(User).where(User.id == user_id).options(selectinload(User.roles))
         return self.session.exec(query).first()
 
+    def get_permission_catalog(self, refresh: bool = False) -> PermissionCatalog:
+        """Compiled permission catalog, cached per process."""
+        catalog = None if refresh else permission_cache.get_catalog()
+        if catalog is not None:
+            return catalog
+
+        generation = permission_cache.generation()
+        catalog = PermissionCatalog.compile(
+            PermissionRepository(self.session).get_names_in_order(),
+            RoleRepository(self.session).get_permission_names(),
+        )
+        permission_cache.put_catalog(catalog, generation)
+        return catalog
+
+    def get_effective_permissions(self, user_id) -> EffectivePermissions:
+        """Role and permission masks of a user, cached per process."""
+        catalog = self.get_permission_catalog()
+        effective = permission_cache.get(user_id, catalog.version)
+        if effective is not None:
+            return effective
+
+        generation = permission_cache.generation()
+        role_ids = UserRepository(self.session).get_role_ids(user_id)
+        if any(role_id not in catalog.roles for role_id in role_ids):
+            # Rol creado después de compilar el catálogo
+            catalog = self.get_permission_catalog(refresh=True)
+        role_mask, permission_mask = catalog.user_masks(role_ids)
+        effective = EffectivePermissions(catalog, role_mask, permission_mask)
+        permission_cache.put(user_id, effective, generation)
+        return effective
+
     def set_user_role(self, user_role: UserSetRole) -> User | None:
         user_repo = UserRepository(self.session)
         user_set_role = UserSetRole(id=user_role.id, role_id=user_role.role_id)
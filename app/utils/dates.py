@@ -10,3 +10,10 @@ def generate_expiration(ttl_minutes: int) -> datetime:
 def generate_date_now() -> datetime:
     """Get the current datetime in UTC."""
     return datetime.now(timezone.utc)
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, as the DB stores it."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -1,4 +1,7 @@
 import subprocess
+import threading
+import time
+from collections import Counter
 
 import typer
 
@@ -9,3 +12,181 @@ def run() -> None:
     """Levanta el servidor con fastapi en modo desarrollo."""
     subprocess.run(["fastapi", "dev", "app/main.py"])
 
+
+@app.command()
+def benchmark_signing(iterations: int = 1000) -> None:
+    """Compara el costo de firmar y verificar tokens con RS256, ES256 y EdDSA."""
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+    from jose import jwk, jwt
+
+    from app.core.security import eddsa  # noqa: F401  (registra EdDSA)
+
+    private_keys = {
+        "RS256": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ES256": ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+    }
+    now = int(time.time())
+    payload = {
+        "iss": "http://localhost:8000",
+        "sub": "6f1c2a8e-3b1d-4c59-9d2e-7a0b5c4d3e21",
+        "aud": "benchmark-client",
+        "exp": now + 3600,
+        "iat": now,
+    }
+
+    typer.echo(f"{'alg':<8}{'sign/s':>12}{'verify/s':>12}{'token bytes':>14}")
+    for alg, private_key in private_keys.items():
+        # Igual que el key ring: la llave se prepara una sola vez
+        signing_key = jwk.construct(private_key, alg)
+        verifying_key = signing_key.public_key()
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            token = jwt.encode(payload, signing_key, algorithm=alg)
+        sign_rate = iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            jwt.decode(token, verifying_key, algorithms=[alg], audience=payload["aud"])
+        verify_rate = iterations / (time.perf_counter() - start)
+
+        typer.echo(f"{alg:<8}{sign_rate:>12.0f}{verify_rate:>12.0f}{len(token):>14}")
+
+
+@app.command()
+def calibrate_password_hashing(
+    target_ms: float = 50,
+    memory_kib: int = 19456,
+    parallelism: int = 1,
+    samples: int = 5,
+) -> None:
+    """Busca los costos de argon2id cuya verificación tarda cerca de target_ms en este host."""
+    from statistics import median
+
+    from app.core.security.password_hasher import build_password_context
+
+    def verify_ms(time_cost: int, memory_cost: int) -> float:
+        context = build_password_context("argon2", time_cost, memory_cost, parallelism)
+        hashed = context.hash("calibration-password")
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            context.verify("calibration-password", hashed)
+            timings.append((time.perf_counter() - start) * 1000)
+        return median(timings)
+
+    # Con time_cost=1 ya pasa del objetivo: se reduce la memoria
+    elapsed = verify_ms(1, memory_kib)
+    while elapsed > target_ms and memory_kib // 2 >= 8 * parallelism:
+        memory_kib //= 2
+        elapsed = verify_ms(1, memory_kib)
+    typer.echo(f"time_cost=1 memory={memory_kib} KiB: {elapsed:.1f} ms")
+
+    # Se sube time_cost mientras se mantenga bajo el objetivo
+    time_cost = 1
+    while True:
+        candidate = verify_ms(time_cost + 1, memory_kib)
+        typer.echo(
+            f"time_cost={time_cost + 1} memory={memory_kib} KiB: {candidate:.1f} ms"
+        )
+        if candidate > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+
+    typer.echo(
+        f"\nVerify takes {elapsed:.1f} ms (target {target_ms:.0f} ms). Settings:"
+    )
+    typer.echo("PASSWORD_HASH_SCHEME=argon2")
+    typer.echo(f"ARGON2_TIME_COST={time_cost}")
+    typer.echo(f"ARGON2_MEMORY_COST_KIB={memory_kib}")
+    typer.echo(f"ARGON2_PARALLELISM={parallelism}")
+
+
+@app.command()
+def partition_token_tables() -> None:
+    """Convierte access_tokens y refresh_tokens en tablas particionadas por día (PostgreSQL)."""
+    from app.services.token_partition_service import token_partition_service
+
+    converted = token_partition_service.convert_tables(partitioned=True)
+    typer.echo(f"Tablas particionadas: {', '.join(converted) or 'ninguna'}")
+
+
+@app.command()
+def unpartition_token_tables() -> None:
+    """Vuelve a convertir las tablas de tokens particionadas en tablas simples."""
+    from app.services.token_partition_service import token_partition_service
+
+    converted = token_partition_service.convert_tables(partitioned=False)
+    typer.echo(f"Tablas convertidas: {', '.join(converted) or 'ninguna'}")
+
+
+@app.command()
+def stress_refresh(client_id: str, user_id: str, concurrency: int = 20) -> None:
+    """Lanza rotaciones concurrentes con el mismo refresh token; solo una debe
+    ganar y las demás deben revocar sus tokens (reuse)."""
+    from uuid import UUID
+
+    from sqlmodel import Session
+
+    from app.core.db import engine
+    from app.services.token_service import RefreshTokenReuseError, TokenService
+
+    with Session(engine) as session:
+        token_pair = TokenService(session).issue_tokens(
+            user_id=UUID(user_id), client_id=client_id, scope=["openid"]
+        )
+        session.commit()
+
+    barrier = threading.Barrier(concurrency)
+    outcomes = Counter()
+    winners = []
+    lock = threading.Lock()
+
+    def rotate() -> None:
+        with Session(engine) as session:
+            barrier.wait()
+            try:
+                rotated = TokenService(session).refresh_with_rotation(
+                    token_pair.refresh_token, client_id
+                )
+                session.commit()
+                outcome = "rotated"
+                with lock:
+                    winners.append(rotated)
+            except RefreshTokenReuseError as e:
+                # Igual que el grant handler: la revocación por reuse se persiste
+                session.commit()
+                outcome = f"rejected: {e}"
+            except ValueError as e:
+                session.rollback()
+                outcome = f"rejected: {e}"
+        with lock:
+            outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=rotate) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for outcome, count in outcomes.most_common():
+        typer.echo(f"{count:>5}  {outcome}")
+    if outcomes["rotated"] != 1:
+        typer.echo("ERROR: se esperaba exactamente una rotación exitosa")
+        raise typer.Exit(code=1)
+
+    # Las peticiones que perdieron la carrera cuentan como reuse: deben revocar
+    # los tokens emitidos por la rotación ganadora
+    with Session(engine) as session:
+        service = TokenService(session)
+        rt = service.store.get_refresh_token(winners[0].refresh_token)
+        refresh_active = rt is not None and not rt.revoked
+        access_active = (
+            service.get_active_access_token(winners[0].access_token) is not None
+        )
+    typer.echo(f"refresh token del ganador activo: {refresh_active}")
+    typer.echo(f"access token del ganador activo: {access_active}")
+    if refresh_active or access_active:
+        typer.echo("ERROR: el reuse no revocó los tokens de la rotación ganadora")
+        raise typer.Exit(code=1)
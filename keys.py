@@ -1,25 +1,45 @@
+import sys
 from pathlib import Path
 
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+# Uso: python keys.py [RS256|ES256|EdDSA] [ruta de la llave privada]
+algorithm = sys.argv[1] if len(sys.argv) > 1 else "RS256"
+private_path = Path(sys.argv[2] if len(sys.argv) > 2 else "keys/private.pem")
+public_path = private_path.with_name(
+    private_path.name.replace("private", "public")
+    if "private" in private_path.name
+    else f"{private_path.stem}.pub"
+)
 
 # Generar clave privada
-private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+if algorithm == "RS256":
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_format = serialization.PrivateFormat.TraditionalOpenSSL
+elif algorithm == "ES256":
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_format = serialization.PrivateFormat.PKCS8
+elif algorithm == "EdDSA":
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    private_format = serialization.PrivateFormat.PKCS8
+else:
+    sys.exit(f"Algoritmo no soportado: {algorithm} (RS256, ES256 o EdDSA)")
 
 # Guardar clave privada
-Path("keys").mkdir(exist_ok=True)
-with open("keys/private.pem", "wb") as f:
+private_path.parent.mkdir(parents=True, exist_ok=True)
+with open(private_path, "wb") as f:
     f.write(
         private_key.private_bytes(
             encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            format=private_format,
             encryption_algorithm=serialization.NoEncryption(),
         )
     )
 
 # Guardar clave pública
 public_key = private_key.public_key()
-with open("keys/public.pem", "wb") as f:
+with open(public_path, "wb") as f:
     f.write(
         public_key.public_bytes(
             encoding=serialization.Encoding.PEM,
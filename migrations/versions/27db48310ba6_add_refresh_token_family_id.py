@@ -0,0 +1,62 @@
+"""add refresh token family_id
+
+Revision ID: 27db48310ba6
+Revises: 400cde4d06aa
+Create Date: 2026-10-18 13:25:41.118203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "27db48310ba6"
+down_revision: Union[str, Sequence[str], None] = "400cde4d06aa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("refresh_tokens", sa.Column("family_id", sa.Uuid(), nullable=True))
+
+    # Backfill: la familia de cada token es la raíz de su cadena de parent_id
+    op.execute(
+        """
+        WITH RECURSIVE lineage (id, root_id) AS (
+            SELECT id, id FROM refresh_tokens WHERE parent_id IS NULL
+            UNION ALL
+            SELECT child.id, lineage.root_id
+            FROM refresh_tokens AS child
+            JOIN lineage ON child.parent_id = lineage.id
+        )
+        UPDATE refresh_tokens
+        SET family_id = lineage.root_id
+        FROM lineage
+        WHERE refresh_tokens.id = lineage.id
+        """
+    )
+    op.execute("UPDATE refresh_tokens SET family_id = id WHERE family_id IS NULL")
+
+    op.create_index(
+        op.f("ix_refresh_tokens_family_id"),
+        "refresh_tokens",
+        ["family_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_access_tokens_refresh_token_id"),
+        "access_tokens",
+        ["refresh_token_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_access_tokens_refresh_token_id"), table_name="access_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_family_id"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "family_id")
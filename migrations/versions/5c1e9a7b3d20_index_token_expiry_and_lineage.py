@@ -0,0 +1,56 @@
+"""index token expiry and lineage columns
+
+Revision ID: 5c1e9a7b3d20
+Revises: 27db48310ba6
+Create Date: 2026-10-18 14:02:10.481532
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e9a7b3d20"
+down_revision: Union[str, Sequence[str], None] = "27db48310ba6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La limpieza borra por lotes ordenados por expiración y, al borrar un
+    # refresh token, busca las filas que lo referencian (parent_id, replaced_by).
+    op.create_index(
+        op.f("ix_access_tokens_expires_at"),
+        "access_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_expires_at"),
+        "refresh_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_parent_id"),
+        "refresh_tokens",
+        ["parent_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_replaced_by"),
+        "refresh_tokens",
+        ["replaced_by"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_refresh_tokens_replaced_by"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_parent_id"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_expires_at"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_access_tokens_expires_at"), table_name="access_tokens")
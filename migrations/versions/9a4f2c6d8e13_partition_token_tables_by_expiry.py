@@ -0,0 +1,45 @@
+"""partition token tables by expires_at
+
+Revision ID: 9a4f2c6d8e13
+Revises: 5c1e9a7b3d20
+Create Date: 2026-10-18 14:40:37.902114
+
+No schema change: converting access_tokens and refresh_tokens to tables
+partitioned by day on `expires_at` is optional and is done explicitly with
+`typer cli.py run partition-token-tables` (PostgreSQL), whatever revision the
+database is at. Downgrading turns partitioned token tables back into plain
+tables, so the earlier revisions find the schema they expect.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlmodel import Session
+
+from app.repositories.token_partition_repository import TokenPartitionRepository
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f2c6d8e13"
+down_revision: Union[str, Sequence[str], None] = "5c1e9a7b3d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La conversión no depende de la configuración al migrar: ver el CLI
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    repo = TokenPartitionRepository(Session(bind=op.get_bind()))
+    # refresh_tokens primero: access_tokens vuelve a referenciarla
+    for table in ("refresh_tokens", "access_tokens"):
+        if repo.is_partitioned(table):
+            repo.rebuild(table, partitioned=False)
@@ -0,0 +1,31 @@
+"""add rotated_at to refresh_tokens
+
+Revision ID: a7e3c9d2b5f1
+Revises: f5c2a8d31e67
+Create Date: 2026-10-18 21:05:12.447190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e3c9d2b5f1"
+down_revision: Union[str, Sequence[str], None] = "f5c2a8d31e67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_tokens", sa.Column("rotated_at", sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("refresh_tokens", "rotated_at")
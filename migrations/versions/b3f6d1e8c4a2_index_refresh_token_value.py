@@ -0,0 +1,45 @@
+"""index refresh_tokens.token
+
+Revision ID: b3f6d1e8c4a2
+Revises: a7e3c9d2b5f1
+Create Date: 2026-10-18 23:12:40.318562
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlmodel import Session
+
+from app.repositories.token_partition_repository import TokenPartitionRepository
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f6d1e8c4a2"
+down_revision: Union[str, Sequence[str], None] = "a7e3c9d2b5f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La rotación reclama el refresh token con UPDATE ... WHERE token = :t.
+    # Una tabla particionada solo admite índices únicos con la llave de
+    # partición (expires_at): ahí el índice no es único, y ya existe si la
+    # tabla se convirtió después de esta revisión
+    repo = TokenPartitionRepository(Session(bind=op.get_bind()))
+    partitioned = repo.is_partitioned("refresh_tokens")
+    op.create_index(
+        op.f("ix_refresh_tokens_token"),
+        "refresh_tokens",
+        ["token"],
+        unique=not partitioned,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_refresh_tokens_token"), table_name="refresh_tokens", if_exists=True
+    )
@@ -0,0 +1,49 @@
+"""create authorization_codes table
+
+Revision ID: c3d8e1f5a7b4
+Revises: 9a4f2c6d8e13
+Create Date: 2026-10-18 15:31:09.655470
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d8e1f5a7b4"
+down_revision: Union[str, Sequence[str], None] = "9a4f2c6d8e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "authorization_codes",
+        sa.Column("code", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("client_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("redirect_uri", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("code_challenge", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("scope", sa.JSON(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("code"),
+    )
+    op.create_index(
+        op.f("ix_authorization_codes_expires_at"),
+        "authorization_codes",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_authorization_codes_expires_at"), table_name="authorization_codes"
+    )
+    op.drop_table("authorization_codes")
@@ -0,0 +1,55 @@
+"""create revocation_events table
+
+Revision ID: d41b7f0c9e52
+Revises: c3d8e1f5a7b4
+Create Date: 2026-10-18 16:52:14.306218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41b7f0c9e52"
+down_revision: Union[str, Sequence[str], None] = "c3d8e1f5a7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "revocation_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("jti", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_revocation_events_expires_at"),
+        "revocation_events",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_revocation_events_created_at"),
+        "revocation_events",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_revocation_events_created_at"), table_name="revocation_events"
+    )
+    op.drop_index(
+        op.f("ix_revocation_events_expires_at"), table_name="revocation_events"
+    )
+    op.drop_table("revocation_events")
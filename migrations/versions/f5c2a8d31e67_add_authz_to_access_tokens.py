@@ -0,0 +1,33 @@
+"""add authz to access_tokens
+
+Revision ID: f5c2a8d31e67
+Revises: d41b7f0c9e52
+Create Date: 2026-10-18 19:24:51.618034
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f5c2a8d31e67"
+down_revision: Union[str, Sequence[str], None] = "d41b7f0c9e52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "access_tokens",
+        sa.Column("authz", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("access_tokens", "authz")